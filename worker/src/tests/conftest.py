@@ -0,0 +1,36 @@
+import fakeredis
+import pytest
+
+from worker.core.bridge import RedisBridge
+from worker.models.redis.redis_config_schema import RedisConfiguration
+
+BRIDGE_CONFIGURATION = RedisConfiguration.model_validate(
+    {
+        "url": "redis://redis:6379",
+        "streams": {"control": "stream:control", "data": "stream:data"},
+        "channels": {
+            "progress": "channel:progress",
+            "status": "channel:status",
+            "data": "channel:data",
+        },
+        "jobs": {"ttl": 43200},
+    }
+)
+
+
+@pytest.fixture
+def make_bridge(monkeypatch):
+    """Connect bridges to an in-memory Redis server shared within the test."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        RedisBridge,
+        "_create_client",
+        lambda self, name, size: fakeredis.FakeAsyncRedis(server=server),
+    )
+
+    async def make(**options) -> RedisBridge:
+        bridge = RedisBridge(BRIDGE_CONFIGURATION, "workers", **options)
+        await bridge.connect()
+        return bridge
+
+    return make
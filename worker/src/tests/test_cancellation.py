@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from worker.utils.cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    cancellation_scope,
+    check_cancelled,
+)
+
+
+def test_cancelling_a_parent_cancels_its_children():
+    job = CancellationToken()
+    node = job.child()
+
+    job.cancel("user")
+
+    assert node.cancelled
+    assert node.cancel_reason() == "user"
+    with pytest.raises(OperationCancelled, match="user"):
+        node.raise_if_cancelled()
+
+
+def test_cancelling_a_child_leaves_the_parent_running():
+    job = CancellationToken()
+    node = job.child()
+
+    node.cancel("timeout")
+
+    assert not job.cancelled
+    assert not job.child().cancelled
+    job.cancel("user")
+    assert node.cancel_reason() == "timeout"
+
+
+def test_first_reason_wins():
+    token = CancellationToken()
+    token.cancel("timeout")
+    token.cancel("user")
+
+    assert token.cancel_reason() == "timeout"
+
+
+def test_checkpoint_sees_the_scope_token_in_worker_threads():
+    token = CancellationToken()
+
+    async def run():
+        with cancellation_scope(token):
+            await asyncio.to_thread(check_cancelled)
+            token.cancel()
+            await asyncio.to_thread(check_cancelled)
+
+    check_cancelled()  # outside a scope: no-op
+    with pytest.raises(OperationCancelled):
+        asyncio.run(run())
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import sys
+import types
+
+import pytest
+
+from worker.core.executor import Executor
+from worker.models.worker.config_schema import CheckpointConfig
+from worker.services.checkpoints import CheckpointStore, clear_job
+from worker.services.registry import TaskRegistry
+
+
+class _Storage:
+    """Object storage as seen by the checkpoint store."""
+
+    def __init__(self):
+        self.objects = {}
+        self.failing = False
+        self.lookups = 0
+        self.downloads = 0
+
+    def upload_file(self, bucket, name, file_path):
+        self._check()
+        with open(file_path, "rb") as source:
+            self.objects[(bucket, name)] = source.read()
+
+    def download_file(self, bucket, name, file_path):
+        self._check()
+        self.downloads += 1
+        data = self.objects.get((bucket, name))
+        if data is None:
+            return False
+        with open(file_path, "wb") as target:
+            target.write(data)
+        return True
+
+    def has_prefix(self, bucket, prefix):
+        self._check()
+        self.lookups += 1
+        return any(key[1].startswith(prefix) for key in self.objects)
+
+    def remove_prefix(self, bucket, prefix):
+        self._check()
+        for key in [key for key in self.objects if key[1].startswith(prefix)]:
+            del self.objects[key]
+
+    def _check(self):
+        if self.failing:
+            raise ConnectionError("storage is down")
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = _Storage()
+    module = types.ModuleType("worker.services.storage")
+    module.upload_file = storage.upload_file
+    module.download_file = storage.download_file
+    module.has_prefix = storage.has_prefix
+    module.remove_prefix = storage.remove_prefix
+    monkeypatch.setitem(sys.modules, "worker.services.storage", module)
+    return storage
+
+
+def _store(tmp_path, scratch="scratch"):
+    return CheckpointStore(
+        "job-1", "n1", CheckpointConfig(scratch_dir=str(tmp_path / scratch))
+    )
+
+
+def _unit(tmp_path, content=b"chunk"):
+    source = tmp_path / "chunk.wav"
+    source.write_bytes(content)
+    return str(source)
+
+
+def test_saved_units_are_restored_locally(tmp_path, storage):
+    store = _store(tmp_path)
+
+    local_path = store.save("0.wav", _unit(tmp_path))
+
+    assert store.restore("0.wav") == local_path
+    assert store.restore("1.wav") is None
+    assert ("staged", "checkpoints/job-1/n1/0.wav") in storage.objects
+
+
+def test_units_are_restored_from_storage_on_another_worker(tmp_path, storage):
+    _store(tmp_path, "worker-a").save("0.wav", _unit(tmp_path))
+
+    restored = _store(tmp_path, "worker-b").restore("0.wav")
+
+    with open(restored, "rb") as unit:
+        assert unit.read() == b"chunk"
+
+
+def test_storage_outages_only_cost_resuming(tmp_path, storage):
+    storage.failing = True
+    store = _store(tmp_path)
+
+    local_path = store.save("0.wav", _unit(tmp_path))
+
+    assert store.restore("0.wav") == local_path
+    assert _store(tmp_path, "other").restore("0.wav") is None
+    store.clear()
+
+
+def test_clear_drops_local_and_mirrored_units(tmp_path, storage):
+    store = _store(tmp_path)
+    store.save("0.wav", _unit(tmp_path))
+
+    store.clear()
+
+    assert store.restore("0.wav") is None
+    assert storage.objects == {}
+
+
+def test_a_first_run_looks_storage_up_once(tmp_path, storage):
+    store = _store(tmp_path)
+
+    restored = [store.restore(f"{index}.wav") for index in range(5)]
+
+    assert restored == [None] * 5
+    assert (storage.lookups, storage.downloads) == (1, 0)
+
+
+def test_clear_job_drops_every_node(tmp_path, storage):
+    config = CheckpointConfig(scratch_dir=str(tmp_path / "scratch"))
+    for node in ("n1", "n2"):
+        CheckpointStore("job-1", node, config).save("0.wav", _unit(tmp_path))
+    CheckpointStore("job-2", "n1", config).save("0.wav", _unit(tmp_path))
+
+    clear_job("job-1", config)
+
+    assert not (tmp_path / "scratch" / "job-1").exists()
+    assert list(storage.objects) == [("staged", "checkpoints/job-2/n1/0.wav")]
+
+
+def test_failed_jobs_leave_no_checkpoints_behind(tmp_path, storage, make_bridge):
+    config = CheckpointConfig(scratch_dir=str(tmp_path / "scratch"))
+
+    async def broken(params, node_input):
+        CheckpointStore("job-1", "n1", config).save("0.wav", _unit(tmp_path))
+        raise ValueError("bad input")
+
+    async def run():
+        bridge = await make_bridge()
+        registry = TaskRegistry([])
+        registry.handlers["x.broken"] = broken
+        executor = Executor(bridge, registry, block_ms=50, checkpoints=config)
+        graph = {
+            "schema": "langgraph.v1",
+            "workflowId": "job-1",
+            "nodes": [
+                {
+                    "id": "n1",
+                    "service": "x.broken",
+                    "plane": "python",
+                    "status": "pending",
+                    "retries": {"attempt": 0, "maxAttempts": 1},
+                }
+            ],
+            "edges": [],
+        }
+        await bridge.redis.xadd(
+            "stream:data", {"jobId": "job-1", "graph": json.dumps(graph)}
+        )
+        await executor.start()
+        for _ in range(100):
+            if await bridge.redis.xlen(bridge.dead_letter_stream):
+                break
+            await asyncio.sleep(0.02)
+        await executor.drain(1)
+        await bridge.close()
+
+    asyncio.run(run())
+
+    assert not (tmp_path / "scratch" / "job-1").exists()
+    assert storage.objects == {}
@@ -0,0 +1,57 @@
+import asyncio
+
+
+async def _submit(bridge, *job_ids):
+    for job_id in job_ids:
+        await bridge.redis.xadd("stream:data", {"jobId": job_id})
+
+
+def _job_id(entry):
+    return entry["fields"]["jobId"] if entry else None
+
+
+def test_a_poll_claims_a_batch_and_buffers_the_rest(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        await _submit(bridge, "j1", "j2", "j3")
+
+        first = await bridge.poll_job(count=3)
+        buffered = len(bridge.local_queue)
+        summary = await bridge.redis.xpending("stream:data", "workers")
+        # Buffered entries are handed out before anything newer is read.
+        await _submit(bridge, "j4")
+        rest = [_job_id(await bridge.poll_job(count=3)) for _ in range(3)]
+        await bridge.close()
+        return _job_id(first), buffered, summary["pending"], rest
+
+    assert asyncio.run(run()) == ("j1", 2, 3, ["j2", "j3", "j4"])
+
+
+def test_an_idle_poll_returns_nothing_after_its_timeout(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        entry = await bridge.poll_job(timeout=20, count=2)
+        await bridge.close()
+        return entry
+
+    assert asyncio.run(run()) is None
+
+
+def test_acknowledged_entries_leave_the_pending_list(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        await _submit(bridge, "j1", "j2")
+        entries = [await bridge.poll_job(count=2) for _ in range(2)]
+
+        acked = await bridge.ack_job(entries[0]["stream"], entries[0]["xid"])
+        pending = await bridge.redis.xpending_range(
+            "stream:data", "workers", "-", "+", 10
+        )
+        owned = set(bridge.claimed)
+        await bridge.close()
+        return acked, [item["message_id"].decode() for item in pending], owned
+
+    acked, pending, owned = asyncio.run(run())
+    assert acked
+    assert len(pending) == 1
+    assert owned == {("stream:data", pending[0])}
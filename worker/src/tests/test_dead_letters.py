@@ -0,0 +1,116 @@
+import asyncio
+import json
+import time
+
+from worker.core.executor import Executor
+from worker.models.worker.config_schema import ReclaimConfig
+from worker.services.registry import TaskRegistry
+
+
+def _graph(job_id: str, service: str) -> str:
+    return json.dumps(
+        {
+            "schema": "langgraph.v1",
+            "workflowId": job_id,
+            "nodes": [
+                {
+                    "id": "n1",
+                    "service": service,
+                    "plane": "python",
+                    "status": "pending",
+                    "retries": {"attempt": 0, "maxAttempts": 1},
+                }
+            ],
+            "edges": [],
+        }
+    )
+
+
+async def _dead_letters(bridge, count):
+    for _ in range(100):
+        entries = await bridge.redis.xrange(bridge.dead_letter_stream)
+        if len(entries) >= count:
+            break
+        await asyncio.sleep(0.02)
+    return {
+        fields[b"jobId"].decode(): fields[b"reason"].decode() for _, fields in entries
+    }
+
+
+def test_failed_jobs_are_dead_lettered_with_their_failure_code(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+
+        async def slow(params, node_input):
+            await asyncio.sleep(5)
+
+        async def broken(params, node_input):
+            raise ValueError("bad input")
+
+        registry = TaskRegistry([])
+        registry.handlers.update({"x.slow": slow, "x.broken": broken})
+        executor = Executor(
+            bridge,
+            registry,
+            block_ms=50,
+            slots={"cpu": 3},
+            timeouts={"x.slow": 0.05},
+        )
+        for job_id, service in (
+            ("slow", "x.slow"),
+            ("broken", "x.broken"),
+            ("unknown", "x.unknown"),
+        ):
+            await bridge.redis.xadd(
+                "stream:data", {"jobId": job_id, "graph": _graph(job_id, service)}
+            )
+        await executor.start()
+        reasons = await _dead_letters(bridge, 3)
+        await executor.drain(1)
+        await bridge.close()
+        return reasons
+
+    assert asyncio.run(run()) == {
+        "slow": "timeout",
+        "broken": "exhausted",
+        "unknown": "missing_handler",
+    }
+
+
+def test_entries_past_max_deliveries_are_dropped_as_poison(make_bridge):
+    async def run():
+        reclaim = ReclaimConfig(min_idle_ms=1, max_deliveries=1)
+        crashed = await make_bridge(reclaim=reclaim)
+        await crashed.redis.xadd("stream:data", {"jobId": "job-1"})
+        await crashed.poll_job(count=1)
+        await asyncio.sleep(0.01)
+
+        survivor = await make_bridge(reclaim=reclaim)
+        reclaimed = await survivor.reclaim_pending("stream:data", 1)
+        pending = await survivor.redis.xpending("stream:data", "workers")
+        reasons = await _dead_letters(survivor, 1)
+        await crashed.close()
+        await survivor.close()
+        return reclaimed, pending["pending"], reasons
+
+    assert asyncio.run(run()) == (0, 0, {"job-1": "poison"})
+
+
+def test_due_retries_go_back_to_their_stream(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        await bridge.schedule_retry("due", _graph("due", "x.task"), 0, 2)
+        await bridge.schedule_retry("later", _graph("later", "x.task"), 60, 2)
+        moved = await bridge.retry_script(
+            keys=[bridge.retry_key, *bridge.managed_streams],
+            args=[int(time.time() * 1000) + 1, 100],
+        )
+        entries = await bridge.redis.xrange("stream:data")
+        scheduled = await bridge.redis.zcard(bridge.retry_key)
+        await bridge.close()
+        return moved, entries, scheduled
+
+    moved, entries, scheduled = asyncio.run(run())
+    assert moved == 1 and scheduled == 1
+    [(_, fields)] = entries
+    assert fields[b"jobId"] == b"due" and fields[b"attempt"] == b"2"
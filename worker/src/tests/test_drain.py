@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+from worker.core.executor import Executor
+from worker.services.registry import TaskRegistry
+
+
+async def _submit(bridge, job_id: str) -> None:
+    graph = {
+        "schema": "langgraph.v1",
+        "workflowId": job_id,
+        "nodes": [
+            {"id": "n1", "service": "x.task", "plane": "python", "status": "pending"}
+        ],
+        "edges": [],
+    }
+    await bridge.redis.xadd(
+        "stream:data", {"jobId": job_id, "graph": json.dumps(graph)}
+    )
+
+
+async def _pending(bridge):
+    pending = await bridge.redis.xpending_range("stream:data", "workers", "-", "+", 10)
+    return len(pending)
+
+
+def _executor(bridge, handler):
+    registry = TaskRegistry([])
+    registry.handlers["x.task"] = handler
+    # The free io slot keeps claiming going, so a second gpu job waits.
+    return Executor(
+        bridge,
+        registry,
+        block_ms=50,
+        slots={"gpu": 1, "io": 1},
+        service_classes={"x.task": "gpu"},
+    )
+
+
+def test_drain_finishes_running_jobs_and_gives_back_the_rest(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def handler(params, node_input):
+            started.set()
+            await release.wait()
+
+        executor = _executor(bridge, handler)
+        await _submit(bridge, "j1")
+        await _submit(bridge, "j2")
+        await executor.start()
+        await asyncio.wait_for(started.wait(), 2)
+
+        for _ in range(100):
+            if executor.waiting:
+                break
+            await asyncio.sleep(0.01)
+        drain = executor.begin_drain(5)
+        await asyncio.sleep(0.05)
+        during = executor.drain_state()
+        await _submit(bridge, "j3")
+        release.set()
+        drained = await drain
+        after = executor.drain_state()
+        # j1 was acknowledged, waiting j2 was given back, j3 never claimed.
+        pending, owned = await _pending(bridge), set(bridge.claimed)
+        await bridge.close()
+        return drained, during, after, pending, owned
+
+    drained, during, after, pending, owned = asyncio.run(run())
+    assert drained
+    assert (during["state"], during["in_flight_jobs"]) == ("draining", ["j1"])
+    assert (after["state"], after["in_flight"]) == ("drained", 0)
+    assert pending == 1
+    assert owned == set()
+
+
+def test_jobs_past_the_deadline_are_interrupted_and_left_pending(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        started = asyncio.Event()
+
+        async def handler(params, node_input):
+            started.set()
+            await asyncio.sleep(10)
+
+        executor = _executor(bridge, handler)
+        await _submit(bridge, "j1")
+        await executor.start()
+        await asyncio.wait_for(started.wait(), 2)
+
+        drained = await executor.drain(0.05)
+        pending = await _pending(bridge)
+        await bridge.close()
+        return drained, pending
+
+    assert asyncio.run(run()) == (False, 1)
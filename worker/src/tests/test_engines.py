@@ -0,0 +1,91 @@
+import pytest
+
+from worker.models.worker.config_schema import EnginePoolConfig
+from worker.services import engines
+from worker.services.engines import EnginePool
+from worker.utils.cancellation import OperationCancelled
+
+
+class _Engine:
+    pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(engines.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _pool(**config) -> EnginePool:
+    return EnginePool(EnginePoolConfig(**config))
+
+
+def _lease(pool, kind, config):
+    with pool.lease(kind, config, _Engine) as engine:
+        return engine
+
+
+def test_released_engines_are_reused_per_kind_and_config():
+    pool = _pool()
+
+    engine = _lease(pool, "tts", "final")
+
+    assert _lease(pool, "tts", "final") is engine
+    assert _lease(pool, "tts", "draft") is not engine
+
+
+def test_least_recently_used_engines_are_evicted_beyond_max_idle():
+    pool = _pool(max_idle=2)
+    for config in ("a", "b", "c"):
+        _lease(pool, "tts", config)
+
+    assert list(pool.idle) == [("tts", "b"), ("tts", "c")]
+
+
+def test_engines_idle_past_their_ttl_are_evicted(clock):
+    pool = _pool(idle_ttl_seconds=60)
+    _lease(pool, "tts", "a")
+    clock[0] += 30
+    _lease(pool, "tts", "b")
+
+    clock[0] += 31
+    pool.evict_expired()
+
+    assert list(pool.idle) == [("tts", "b")]
+
+
+def test_failed_runs_drop_the_engine_but_cancelled_ones_keep_it():
+    pool = _pool()
+
+    with pytest.raises(RuntimeError):
+        with pool.lease("tts", "a", _Engine):
+            raise RuntimeError("boom")
+    assert not pool.idle
+
+    with pytest.raises(OperationCancelled):
+        with pool.lease("tts", "a", _Engine):
+            raise OperationCancelled("user")
+    assert list(pool.idle) == [("tts", "a")]
+
+
+def test_garbage_is_collected_once_per_sweep(clock, monkeypatch):
+    collections = []
+    monkeypatch.setattr(engines.gc, "collect", lambda: collections.append(1))
+    pool = _pool(max_idle=5, idle_ttl_seconds=60)
+    for config in ("a", "b", "c"):
+        _lease(pool, "tts", config)
+
+    clock[0] += 61
+    pool.evict_expired()
+
+    assert not pool.idle
+    assert len(collections) == 1
+
+
+def test_disabled_pool_keeps_nothing():
+    pool = _pool(enabled=False)
+
+    _lease(pool, "tts", "a")
+
+    assert not pool.idle
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+from worker.core.executor import Executor
+from worker.services.registry import TaskRegistry
+
+
+def _graph(job_id: str) -> str:
+    return json.dumps(
+        {
+            "schema": "langgraph.v1",
+            "workflowId": job_id,
+            "nodes": [
+                {
+                    "id": "a",
+                    "service": "x.first",
+                    "plane": "python",
+                    "status": "pending",
+                },
+                {
+                    "id": "b",
+                    "service": "x.second",
+                    "plane": "python",
+                    "status": "pending",
+                },
+            ],
+            "edges": [{"from": "a", "to": "b"}],
+        }
+    )
+
+
+async def _stored_states(bridge, job_id):
+    graph = await bridge.redis.hget(f"job:{job_id}", "graph")
+    if graph is None:
+        return {}
+    return {node["id"]: node["status"] for node in json.loads(graph)["nodes"]}
+
+
+def test_node_states_reach_the_job_hash_while_the_job_runs(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        second_running, release = asyncio.Event(), asyncio.Event()
+
+        async def first(params, node_input):
+            return {"value": 1}
+
+        async def second(params, node_input):
+            second_running.set()
+            await release.wait()
+
+        registry = TaskRegistry([])
+        registry.handlers.update({"x.first": first, "x.second": second})
+        executor = Executor(bridge, registry, block_ms=50, graph_sync_seconds=0.05)
+        await bridge.redis.xadd(
+            "stream:data", {"jobId": "job-1", "graph": _graph("job-1")}
+        )
+
+        await executor.start()
+        await asyncio.wait_for(second_running.wait(), 2)
+        await asyncio.sleep(0.1)
+        during = await _stored_states(bridge, "job-1")
+        release.set()
+        await executor.drain(1)
+        after = await _stored_states(bridge, "job-1")
+        await bridge.close()
+        return during, after
+
+    during, after = asyncio.run(run())
+    assert during["a"] == "completed"
+    assert after == {"a": "completed", "b": "completed"}
+
+
+def test_full_graph_writes_are_rate_limited(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        writes = []
+        persist = bridge.set_job_payload
+
+        async def set_job_payload(job_id, payload):
+            writes.append(job_id)
+            await persist(job_id, payload)
+
+        bridge.set_job_payload = set_job_payload
+        executor = Executor(bridge, TaskRegistry([]), graph_sync_seconds=60)
+        graph = json.loads(_graph("job-1"))
+        executor._schedule_graph_sync(graph)
+        await asyncio.sleep(0.01)
+        for _ in range(5):
+            executor._schedule_graph_sync(graph)
+        await asyncio.sleep(0.01)
+        executor._cancel_graph_sync("job-1")
+        await bridge.close()
+        return writes
+
+    assert asyncio.run(run()) == ["job-1"]
@@ -0,0 +1,130 @@
+import asyncio
+from collections import Counter
+
+from worker.core.lanes import LaneScheduler
+from worker.models.worker.config_schema import LaneConfig, LanesConfig
+
+
+def _fill(scheduler, stream, count):
+    for index in range(count):
+        scheduler.push({"stream": stream, "xid": f"{stream}-{index}"})
+
+
+def test_weighted_policy_shares_dispatches_by_weight():
+    scheduler = LaneScheduler({"high": 3, "low": 1})
+    _fill(scheduler, "high", 30)
+    _fill(scheduler, "low", 30)
+
+    window = [scheduler.pop()["stream"] for _ in range(8)]
+
+    assert Counter(window) == {"high": 6, "low": 2}
+    # Smooth round-robin: the light lane is never starved for long.
+    assert "low" in window[:4]
+
+
+def test_strict_policy_drains_the_heaviest_lane_first():
+    scheduler = LaneScheduler({"low": 1, "high": 5}, policy="strict")
+    _fill(scheduler, "low", 2)
+    _fill(scheduler, "high", 2)
+
+    order = [scheduler.pop()["xid"] for _ in range(4)]
+
+    assert order == ["high-0", "high-1", "low-0", "low-1"]
+    assert scheduler.pop() is None
+
+
+def test_front_push_and_drain():
+    scheduler = LaneScheduler({"data": 1})
+    _fill(scheduler, "data", 2)
+    scheduler.push({"stream": "data", "xid": "reclaimed"}, front=True)
+
+    assert len(scheduler) == 3
+    assert scheduler.pop()["xid"] == "reclaimed"
+    assert [entry["xid"] for entry in scheduler.drain()] == ["data-0", "data-1"]
+    assert len(scheduler) == 0
+
+
+def _lanes(policy="weighted"):
+    return LanesConfig(policy=policy, lanes=[LaneConfig(name="fast", weight=3)])
+
+
+async def _enqueue(bridge, stream, count):
+    for index in range(count):
+        await bridge.redis.xadd(stream, {"jobId": f"{stream}-{index}"})
+
+
+def test_claims_follow_lane_weights_across_rounds(make_bridge):
+    async def run():
+        bridge = await make_bridge(lanes=_lanes())
+        await _enqueue(bridge, "stream:data", 20)
+        await _enqueue(bridge, "stream:data:fast", 20)
+        # One free slot: every round claims a single entry.
+        streams = [(await bridge.poll_job(count=1))["stream"] for _ in range(8)]
+        await bridge.close()
+        return streams
+
+    assert Counter(asyncio.run(run())) == {"stream:data:fast": 6, "stream:data": 2}
+
+
+def test_strict_claims_drain_the_heaviest_lane_first(make_bridge):
+    async def run():
+        bridge = await make_bridge(lanes=_lanes("strict"))
+        await _enqueue(bridge, "stream:data", 2)
+        await _enqueue(bridge, "stream:data:fast", 2)
+        streams = [(await bridge.poll_job(count=1))["stream"] for _ in range(4)]
+        await bridge.close()
+        return streams
+
+    assert asyncio.run(run()) == ["stream:data:fast"] * 2 + ["stream:data"] * 2
+
+
+def test_a_round_claims_no_more_than_the_free_slots(make_bridge):
+    async def run():
+        bridge = await make_bridge(lanes=_lanes())
+        await _enqueue(bridge, "stream:data", 5)
+        await _enqueue(bridge, "stream:data:fast", 5)
+        await bridge.poll_job(count=3)
+        pending = [
+            (await bridge.redis.xpending(stream, "workers"))["pending"]
+            for stream in ("stream:data", "stream:data:fast")
+        ]
+        await bridge.close()
+        return pending
+
+    assert sum(asyncio.run(run())) == 3
+
+
+def test_idle_polls_wait_for_new_entries_without_claiming_them(make_bridge):
+    async def run():
+        bridge = await make_bridge(lanes=_lanes())
+        poll = asyncio.create_task(bridge.poll_job(timeout=1000, count=1))
+        await asyncio.sleep(0.05)
+        await _enqueue(bridge, "stream:data", 3)
+        entry = await poll
+        pending = (await bridge.redis.xpending("stream:data", "workers"))["pending"]
+        await bridge.close()
+        return entry, pending
+
+    entry, pending = asyncio.run(run())
+    assert entry["fields"]["jobId"] == "stream:data-0"
+    assert pending == 1
+
+
+def test_entries_with_the_same_id_on_two_lanes_are_owned_separately(make_bridge):
+    async def run():
+        bridge = await make_bridge(lanes=_lanes())
+        for stream in ("stream:data", "stream:data:fast"):
+            await bridge.redis.xadd(stream, {"jobId": stream}, id="1-1")
+        first = await bridge.poll_job(count=2)
+        second = await bridge.poll_job(count=2)
+        assert await bridge.start_job(first["stream"], "1-1")
+        assert await bridge.start_job(second["stream"], "1-1")
+        await bridge.ack_job(first["stream"], "1-1")
+        pending = await bridge.redis.xpending(second["stream"], "workers")
+        held = set(bridge.started)
+        await bridge.close()
+        return second["stream"], pending["pending"], held
+
+    stream, pending, held = asyncio.run(run())
+    assert pending == 1
+    assert held == {(stream, "1-1")}
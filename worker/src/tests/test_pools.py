@@ -0,0 +1,45 @@
+import asyncio
+
+import fakeredis
+import pytest
+import redis.asyncio as redis
+from fakeredis.aioredis import FakeAsyncRedisConnection
+
+from worker.core.pools import InstrumentedConnectionPool, PoolExhaustedError
+from worker.core.resilience import CircuitState
+
+
+def test_waiting_past_the_pool_timeout_is_reported_as_exhaustion():
+    async def run():
+        pool = InstrumentedConnectionPool(
+            max_connections=1,
+            timeout=0.05,
+            connection_class=FakeAsyncRedisConnection,
+            server=fakeredis.FakeServer(),
+        ).instrument("test")
+        client = redis.Redis.from_pool(pool)
+        await pool.get_connection()
+        try:
+            await client.ping()
+        finally:
+            await pool.disconnect()
+
+    with pytest.raises(PoolExhaustedError):
+        asyncio.run(run())
+
+
+def test_an_exhausted_pool_is_not_treated_as_an_outage(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+
+        async def saturated():
+            raise PoolExhaustedError("No writer connection available")
+
+        for _ in range(bridge.connection.failure_threshold):
+            with pytest.raises(PoolExhaustedError):
+                await bridge._call(saturated)
+        outage = bridge.reconnector, bridge.breaker.state, bridge.available.is_set()
+        await bridge.close()
+        return outage
+
+    assert asyncio.run(run()) == (None, CircuitState.closed, True)
@@ -0,0 +1,86 @@
+import pytest
+from pydantic import ValidationError
+
+from worker.models.worker.config_schema import PresetsConfiguration
+from worker.services.presets import PresetCatalog
+
+_SERVICE = "generate.f5_to_tts"
+
+
+def _catalog(**workflow) -> PresetCatalog:
+    return PresetCatalog(
+        PresetsConfiguration.model_validate(
+            {
+                "workflows": {
+                    _SERVICE: {
+                        "model": "TextToSpeechParams",
+                        "default": "final",
+                        "base": {
+                            "model": "F5TTS_v1_Base",
+                            "device": "cuda",
+                            "temperature": 0.8,
+                            "speed": 1,
+                            "target_rms": 0.1,
+                            "cross_fade_duration": 0.15,
+                            "nfe_step": 32,
+                            "cfg_strength": 2,
+                            "seed": 1,
+                        },
+                        "overridable": ["narrator_voice", "nfe_step", "seed"],
+                        "presets": {"draft": {"nfe_step": 16}, "final": {}},
+                        **workflow,
+                    }
+                }
+            }
+        )
+    )
+
+
+def test_default_preset_is_shared_when_nothing_is_overridden():
+    catalog = _catalog()
+    name, params = catalog.resolve(_SERVICE, overrides={"unrelated": 1})
+    assert name == "final"
+    assert params is catalog.presets[_SERVICE]["final"]
+
+
+def test_named_preset_applies_overrides_on_a_copy():
+    catalog = _catalog()
+    name, params = catalog.resolve(
+        _SERVICE, "draft", {"seed": 7, "narrator_voice": "voices/a.wav"}
+    )
+    assert name == "draft"
+    assert (params.nfe_step, params.seed, params.narrator_voice) == (
+        16,
+        7,
+        "voices/a.wav",
+    )
+    assert catalog.presets[_SERVICE]["draft"].seed == 1
+
+
+def test_load_affecting_fields_are_not_overridable():
+    _, params = _catalog().resolve(
+        _SERVICE, overrides={"model": "other", "device": "cpu", "seed": None}
+    )
+    assert (params.model, params.device, params.seed) == ("F5TTS_v1_Base", "cuda", 1)
+
+
+def test_overrides_are_validated():
+    with pytest.raises(ValidationError):
+        _catalog().resolve(_SERVICE, overrides={"nfe_step": 0})
+
+
+def test_unknown_preset_and_service_are_rejected():
+    catalog = _catalog()
+    with pytest.raises(ValueError, match="Unknown preset"):
+        catalog.resolve(_SERVICE, "missing")
+    with pytest.raises(ValueError, match="No presets"):
+        catalog.resolve("generate.unknown")
+
+
+def test_invalid_configuration_fails_when_the_catalog_is_built():
+    with pytest.raises(ValueError, match="not defined"):
+        _catalog(default="missing")
+    with pytest.raises(ValueError, match="not fields"):
+        _catalog(overridable=["voice"])
+    with pytest.raises(ValidationError):
+        _catalog(presets={"final": {"temperature": 2}})
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from worker.core.bridge import PendingPublish
+from worker.services.progress import ProgressReporter
+
+
+async def _run_node(start, weight):
+    """Run one reporter over four units and return what it published."""
+    published = []
+
+    async def publish(share):
+        published.append(share)
+
+    reporter = ProgressReporter(
+        publish, start=start, weight=weight, total_units=4, min_interval=0
+    )
+    for _ in range(4):
+        reporter.advance()
+        await asyncio.sleep(0.01)
+    await reporter.finish()
+    return published
+
+
+def test_reports_are_the_node_share_so_far():
+    published = asyncio.run(_run_node(0.2, 0.5))
+
+    assert published == sorted(published)
+    assert published[-1] == pytest.approx(0.5)
+
+
+def test_finish_publishes_nothing_once_reported():
+    async def main():
+        published = []
+
+        async def publish(share):
+            published.append(share)
+
+        reporter = ProgressReporter(publish, start=0.0, weight=0.4, min_interval=0)
+        assert await reporter.finish() == pytest.approx(0.4)
+        assert await reporter.finish() == pytest.approx(0.4)
+        return published
+
+    assert asyncio.run(main()) == [pytest.approx(0.4)]
+
+
+async def _progress(bridge, job_id="job-1"):
+    await bridge.flush_publishes()
+    return float(await bridge.redis.get(f"job:{job_id}:progress"))
+
+
+def test_concurrent_node_shares_add_up(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        await bridge.publish_progress("job-1", 0.2, node="a")
+        await bridge.publish_progress("job-1", 0.3, node="b")
+        first = await _progress(bridge)
+        await bridge.publish_progress("job-1", 0.4, node="a")
+        second = await _progress(bridge)
+        await bridge.close()
+        return first, second
+
+    assert asyncio.run(run()) == (pytest.approx(0.5), pytest.approx(0.7))
+
+
+def test_replayed_and_restarted_shares_never_count_twice(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        await bridge.publish_progress("job-1", 0.4, node="a")
+        await _progress(bridge)
+        # Replayed after a failed flush.
+        await bridge.publish_progress("job-1", 0.4, node="a")
+        replayed = await _progress(bridge)
+        # The node is retried and reports from the start of its slice again.
+        await bridge.publish_progress("job-1", 0.1, node="a")
+        restarted = await _progress(bridge)
+        await bridge.close()
+        return replayed, restarted
+
+    assert asyncio.run(run()) == (pytest.approx(0.4), pytest.approx(0.1))
+
+
+def test_undelivered_progress_is_kept_for_replay(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        channel = "channel:progress:job-1"
+        bridge._stash_outbox(
+            [
+                ("job-1", PendingPublish("progress", channel, progress=0.2, node="a")),
+                ("job-1", PendingPublish("progress", channel, progress=0.3, node="a")),
+            ]
+        )
+        held = len(bridge.outbox)
+        progress = await _progress(bridge)
+        await bridge.close()
+        return held, progress
+
+    assert asyncio.run(run()) == (1, pytest.approx(0.3))
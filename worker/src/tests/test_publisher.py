@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+from worker.core.bridge import PendingPublish
+from worker.models.worker.config_schema import ConnectionConfig
+
+
+async def _subscribe(bridge, job_id="job-1"):
+    pubsub = bridge.redis.pubsub()
+    await pubsub.psubscribe(f"channel:*:{job_id}")
+    await pubsub.get_message(timeout=0.1)
+    return pubsub
+
+
+async def _received(pubsub):
+    messages = []
+    while True:
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
+        if message is None:
+            return messages
+        payload = json.loads(message["data"])
+        messages.append(
+            (message["channel"].decode().split(":")[1], payload.get("status"))
+        )
+
+
+def test_messages_keep_their_order_and_progress_is_coalesced(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        pubsub = await _subscribe(bridge)
+        await bridge.publish_status("job-1", "running")
+        for share in (0.1, 0.2, 0.3):
+            await bridge.publish_progress("job-1", share, node="a")
+        await bridge.publish_data("job-1", "preview.png")
+        await bridge.publish_status("job-1", "completed")
+        buffered = [item.kind for item in bridge.publish_buffers["job-1"]]
+
+        await bridge.flush_publishes()
+        received = await _received(pubsub)
+        await pubsub.aclose()
+        await bridge.close()
+        return buffered, received
+
+    buffered, received = asyncio.run(run())
+    assert buffered == ["status", "progress", "data", "status"]
+    assert received == [
+        ("status", "running"),
+        ("progress", None),
+        ("data", None),
+        ("status", "completed"),
+    ]
+
+
+def test_a_failed_flush_is_replayed_first(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        pubsub = await _subscribe(bridge)
+        pipeline = bridge.redis.pipeline
+
+        class _Unreachable:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: None
+
+            async def execute(self, **kwargs):
+                raise OSError("connection reset")
+
+        bridge.redis.pipeline = lambda transaction: _Unreachable()
+        await bridge.publish_status("job-1", "running")
+        await bridge.flush_publishes()
+        held = len(bridge.outbox)
+
+        bridge.redis.pipeline = pipeline
+        bridge._on_reconnected()
+        await bridge.publish_status("job-1", "completed")
+        await bridge.flush_publishes()
+        received = await _received(pubsub)
+        await pubsub.aclose()
+        await bridge.close()
+        return held, received
+
+    held, received = asyncio.run(run())
+    assert held == 1
+    assert received == [("status", "running"), ("status", "completed")]
+
+
+def test_a_full_outbox_drops_progress_before_status(make_bridge):
+    async def run():
+        bridge = await make_bridge(connection=ConnectionConfig(outbox_size=2))
+        channel = "channel:status:job-1"
+        bridge._stash_outbox(
+            [
+                ("job-1", PendingPublish("status", channel)),
+                ("job-1", PendingPublish("progress", channel, progress=0.5)),
+                ("job-1", PendingPublish("data", channel)),
+                ("job-1", PendingPublish("status", channel)),
+            ]
+        )
+        kept = [item.kind for _, item in bridge.outbox]
+        bridge.outbox.clear()
+        await bridge.close()
+        return kept
+
+    assert asyncio.run(run()) == ["status", "status"]
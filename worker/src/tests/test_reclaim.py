@@ -0,0 +1,73 @@
+import asyncio
+
+from worker.models.worker.config_schema import ReclaimConfig
+
+RECLAIM = ReclaimConfig(min_idle_ms=50)
+
+
+async def _abandon(bridge, *job_ids):
+    """Claim entries on ``bridge`` and let them age past the reclaim threshold."""
+    for job_id in job_ids:
+        await bridge.redis.xadd("stream:data", {"jobId": job_id})
+    entries = [await bridge.poll_job(count=len(job_ids)) for _ in job_ids]
+    await asyncio.sleep(0.06)
+    return entries
+
+
+def test_abandoned_entries_are_reclaimed_ahead_of_new_work(make_bridge):
+    async def run():
+        crashed = await make_bridge(reclaim=RECLAIM)
+        await _abandon(crashed, "stuck")
+        survivor = await make_bridge(reclaim=RECLAIM)
+        await survivor.redis.xadd("stream:data", {"jobId": "new"})
+
+        first = await survivor.poll_job(count=2)
+        second = await survivor.poll_job(count=2)
+        await crashed.close()
+        await survivor.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["fields"]["jobId"] == "stuck"
+    assert first["deliveries"] == 2
+    assert second["fields"]["jobId"] == "new"
+
+
+def test_running_entries_are_refreshed_and_kept(make_bridge):
+    async def run():
+        owner = await make_bridge(reclaim=RECLAIM)
+        [entry] = await _abandon(owner, "long-render")
+        await owner.start_job(entry["stream"], entry["xid"])
+        await asyncio.sleep(0.06)
+        await owner._refresh_claimed("stream:data")
+
+        other = await make_bridge(reclaim=RECLAIM)
+        reclaimed = await other.reclaim_pending("stream:data", 5)
+        await owner.close()
+        await other.close()
+        return reclaimed
+
+    assert asyncio.run(run()) == 0
+
+
+async def _consumer_names(bridge):
+    consumers = await bridge.redis.xinfo_consumers("stream:data", "workers")
+    return {consumer["name"].decode() for consumer in consumers}
+
+
+def test_consumers_of_stopped_replicas_are_pruned(make_bridge):
+    async def run():
+        stopped = await make_bridge(reclaim=RECLAIM, consumer="stopped")
+        await stopped.poll_job(timeout=1)
+        await stopped.close()
+        await asyncio.sleep(0.06)
+
+        survivor = await make_bridge(reclaim=RECLAIM, consumer="survivor")
+        await survivor.poll_job(timeout=1)
+        before = await _consumer_names(survivor)
+        await survivor._prune_consumers("stream:data")
+        after = await _consumer_names(survivor)
+        await survivor.close()
+        return before, after
+
+    assert asyncio.run(run()) == ({"stopped", "survivor"}, {"survivor"})
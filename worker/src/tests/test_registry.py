@@ -0,0 +1,129 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from worker.core.executor import Executor
+from worker.models.capabilities.capability_schema import Capability
+from worker.services.registry import TaskRegistry
+
+
+def _capability(service: str, module: str, method: str) -> Capability:
+    return Capability.model_validate(
+        {
+            "id": service,
+            "label": service,
+            "description": service,
+            "version": "1.0.0",
+            "plane": "python",
+            "runtime": {"kind": "cpu", "concurrency": 1},
+            "handler": {"module": module, "method": method},
+            "io": {
+                "input": {"type": "object"},
+                "output": {"type": "object"},
+            },
+        }
+    )
+
+
+class _NodeStateBridge:
+    """Records node states; the only bridge call a failing node makes."""
+
+    def __init__(self):
+        self.node_states = []
+
+    async def set_node_state(self, job_id, node_id, state):
+        self.node_states.append((job_id, node_id, state))
+
+
+def test_handlers_are_imported_on_first_lookup():
+    registry = TaskRegistry([_capability("x.dumps", "json", "dumps")])
+
+    assert list(registry) == ["x.dumps"]
+    assert registry.handlers == {}
+    import json
+
+    assert registry["x.dumps"] is json.dumps
+    assert "x.dumps" in registry.import_seconds
+
+
+def test_unknown_service_is_a_missing_key():
+    registry = TaskRegistry([])
+
+    assert registry.get("x.unknown") is None
+
+
+def test_import_failure_raises_runtime_error():
+    registry = TaskRegistry([_capability("x.broken", "worker.does_not_exist", "run")])
+
+    with pytest.raises(RuntimeError, match="Cannot import handler"):
+        registry.get("x.broken")
+
+
+def test_import_failure_fails_the_node_as_missing_handler():
+    async def run():
+        bridge = _NodeStateBridge()
+        executor = Executor(
+            bridge,
+            TaskRegistry([_capability("x.broken", "worker.does_not_exist", "run")]),
+        )
+        node = {"id": "n1", "service": "x.broken", "plane": "python"}
+        await executor._execute_node({"workflowId": "job-1"}, node)
+        return bridge, node
+
+    bridge, node = asyncio.run(run())
+
+    assert node["status"] == "failed"
+    assert node["error"]["code"] == "missing_handler"
+    assert "worker.does_not_exist" in node["error"]["message"]
+    assert bridge.node_states[-1][:2] == ("job-1", "n1")
+
+
+@pytest.fixture
+def slow_module(tmp_path, monkeypatch):
+    """A handler module that takes a while to import, like a model workflow."""
+    (tmp_path / "slow_handler.py").write_text(
+        "import time\n"
+        "time.sleep(0.3)\n"
+        "async def run(params, node_input):\n"
+        "    return 'done'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "slow_handler"
+    sys.modules.pop("slow_handler", None)
+
+
+def test_loading_a_handler_keeps_the_event_loop_responsive(slow_module):
+    registry = TaskRegistry([_capability("x.slow", slow_module, "run")])
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        prewarm = asyncio.create_task(registry.prewarm())
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        handler = await registry.load("x.slow")
+        waited = time.perf_counter() - started
+        await prewarm
+        ticker.cancel()
+        return handler, ticks, waited
+
+    handler, ticks, waited = asyncio.run(run())
+
+    assert handler is sys.modules[slow_module].run
+    assert ticks >= 10
+    # The lookup waited for the prewarm import instead of repeating it.
+    assert waited < 0.3
+    assert list(registry.import_seconds) == ["x.slow"]
+
+
+def test_loading_an_unknown_service_returns_none():
+    assert asyncio.run(TaskRegistry([]).load("x.unknown")) is None
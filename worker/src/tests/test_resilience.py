@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from worker.core.resilience import CircuitBreaker, CircuitState
+
+
+def _half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    return breaker
+
+
+def test_half_open_lets_a_single_probe_through():
+    breaker = _half_open_breaker()
+
+    assert breaker.allow()
+    assert breaker.state is CircuitState.half_open
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_a_failed_probe_reopens_the_circuit():
+    breaker = _half_open_breaker()
+
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.open
+    assert not breaker.allow()
+
+
+def test_a_probe_without_a_verdict_is_released():
+    breaker = _half_open_breaker()
+
+    assert breaker.allow()
+    breaker.release()
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_unacked_entries_are_replayed_before_closing(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        await bridge.redis.xadd("stream:data", {"jobId": "job-1"})
+        entry = await bridge.poll_job(count=1)
+        bridge.unacked.add((entry["stream"], entry["xid"]))
+        bridge.outage_started = time.monotonic()
+
+        bridge._on_reconnected()
+        replayer = bridge.ack_replayer
+        await bridge.close()
+        pending = await bridge.redis.xpending("stream:data", "workers")
+        return replayer, bridge.unacked, pending["pending"]
+
+    replayer, unacked, pending = asyncio.run(run())
+    assert replayer is not None and replayer.done()
+    assert unacked == set()
+    assert pending == 0
@@ -0,0 +1,59 @@
+import asyncio
+
+from worker.models.worker.config_schema import RetentionConfig
+
+
+def _record_trims(bridge):
+    """Record XTRIM calls: approximate trims of tiny streams remove nothing."""
+    trims = []
+    xtrim = bridge.redis.xtrim
+
+    async def record(stream, **options):
+        trims.append(
+            {key: options[key] for key in ("minid", "maxlen") if key in options}
+        )
+        return await xtrim(stream, **options)
+
+    bridge.redis.xtrim = record
+    return trims
+
+
+def test_old_entries_are_trimmed_up_to_the_oldest_pending_one(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        trims = _record_trims(bridge)
+        for ms in (1000, 2000, 3000):
+            await bridge.redis.xadd("stream:data", {"jobId": str(ms)}, id=f"{ms}-0")
+        first = await bridge.poll_job(count=2)
+        await bridge.ack_job(first["stream"], first["xid"])
+
+        await bridge.trim_stream("stream:data")
+        await bridge.close()
+        return trims, bridge.trim_minid["stream:data"]
+
+    trims, minid = asyncio.run(run())
+    # 2000-0 is still pending, so nothing from it onwards may go.
+    assert trims == [{"minid": "2000-0"}]
+    assert minid == "2000-0"
+
+
+def test_the_length_cap_waits_until_everything_is_acknowledged(make_bridge):
+    async def run():
+        retention = RetentionConfig(max_age_seconds=0, max_len=1)
+        bridge = await make_bridge(retention=retention)
+        trims = _record_trims(bridge)
+        for index in range(3):
+            await bridge.redis.xadd("stream:data", {"jobId": f"j{index}"})
+
+        await bridge.trim_stream("stream:data")
+        unread = list(trims)
+        for _ in range(3):
+            entry = await bridge.poll_job(count=3)
+            await bridge.ack_job(entry["stream"], entry["xid"])
+        await bridge.trim_stream("stream:data")
+        await bridge.close()
+        return unread, trims
+
+    unread, trims = asyncio.run(run())
+    assert unread == []
+    assert trims == [{"maxlen": 1}]
@@ -0,0 +1,64 @@
+from worker.core.scheduler import GraphPlan
+
+
+def _node(node_id, plane="python", status="pending", **fields):
+    return {"id": node_id, "plane": plane, "status": status, **fields}
+
+
+def _ids(nodes):
+    return [node["id"] for node in nodes]
+
+
+def test_nodes_become_ready_once_their_dependencies_complete():
+    a, b, c, d = _node("a"), _node("b"), _node("c"), _node("d")
+    plan = GraphPlan(
+        {
+            "nodes": [a, b, c, d],
+            "edges": [
+                {"from": "a", "to": "b"},
+                {"from": "a", "to": "c"},
+                {"from": "b", "to": "d"},
+                {"from": "c", "to": "d"},
+            ],
+        }
+    )
+
+    assert _ids(plan.pop_ready()) == ["a"]
+    assert plan.pop_ready() == []
+    plan.complete(a)
+    assert _ids(plan.pop_ready()) == ["b", "c"]
+    plan.complete(b)
+    assert plan.pop_ready() == []
+    plan.complete(c)
+    assert _ids(plan.pop_ready()) == ["d"]
+
+
+def test_completed_dependencies_and_settled_nodes_are_accounted_for():
+    plan = GraphPlan(
+        {
+            "nodes": [
+                _node("done", status="completed"),
+                _node("next"),
+                _node("failed", status="failed"),
+                _node("remote", plane="node"),
+            ],
+            "edges": [{"from_": "done", "to": "next"}, {"from": "x"}],
+        }
+    )
+
+    assert _ids(plan.pop_ready()) == ["next"]
+
+
+def test_inputs_layer_dependency_outputs_over_the_node_input():
+    a = _node("a", output={"shared": "a", "only_a": 1})
+    b = _node("b", output={"shared": "b"})
+    c = _node("c", input={"shared": "own", "own": True})
+    plan = GraphPlan(
+        {
+            "nodes": [a, b, c],
+            "edges": [{"from": "a", "to": "c"}, {"from": "b", "to": "c"}],
+        }
+    )
+
+    assert dict(plan.inputs(c)) == {"shared": "b", "only_a": 1, "own": True}
+    assert dict(plan.inputs(a)) == {}
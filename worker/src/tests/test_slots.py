@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+from worker.core.executor import Executor
+from worker.models.worker.config_schema import ReclaimConfig
+from worker.services.registry import TaskRegistry
+
+
+def _graph(job_id: str, service: str) -> str:
+    return json.dumps(
+        {
+            "schema": "langgraph.v1",
+            "workflowId": job_id,
+            "nodes": [
+                {"id": "n1", "service": service, "plane": "python", "status": "pending"}
+            ],
+            "edges": [],
+        }
+    )
+
+
+async def _submit(bridge, job_id: str, service: str) -> None:
+    await bridge.redis.xadd(
+        "stream:data", {"jobId": job_id, "graph": _graph(job_id, service)}
+    )
+
+
+async def _job_ids(bridge):
+    entries = await bridge.redis.xrange("stream:data")
+    return [fields[b"jobId"].decode() for _, fields in entries]
+
+
+def test_a_busy_class_does_not_block_claiming_for_the_others(make_bridge):
+    async def run():
+        bridge = await make_bridge()
+        gpu_free, io_done = asyncio.Event(), asyncio.Event()
+
+        async def render(params, node_input):
+            await gpu_free.wait()
+
+        async def upload(params, node_input):
+            io_done.set()
+
+        registry = TaskRegistry([])
+        registry.handlers.update({"gpu.task": render, "io.task": upload})
+        executor = Executor(
+            bridge,
+            registry,
+            block_ms=50,
+            backoff_initial=0.05,
+            slots={"gpu": 1, "io": 2},
+            service_classes={"gpu.task": "gpu", "io.task": "io"},
+        )
+        for job_id in ("g1", "g2", "g3"):
+            await _submit(bridge, job_id, "gpu.task")
+        await _submit(bridge, "i1", "io.task")
+
+        await executor.start()
+        await asyncio.wait_for(io_done.wait(), 2)
+        waiting = [job["fields"]["jobId"] for job, _ in executor.waiting]
+        # g3 found no slot and no room to wait: it went back to the stream.
+        requeued = (await _job_ids(bridge)).count("g3")
+        gpu_free.set()
+        await executor.drain(1)
+        await bridge.close()
+        return waiting, requeued
+
+    waiting, requeued = asyncio.run(run())
+    assert waiting == ["g2"]
+    assert requeued >= 2
+
+
+def test_reclaim_takes_no_more_than_the_free_slots(make_bridge):
+    async def run():
+        reclaim = ReclaimConfig(min_idle_ms=1)
+        crashed = await make_bridge(reclaim=reclaim)
+        for index in range(3):
+            await _submit(crashed, f"j{index}", "io.task")
+        await crashed.poll_job(count=3)
+        await asyncio.sleep(0.01)
+
+        survivor = await make_bridge(reclaim=reclaim)
+        entry = await survivor.poll_job(count=1)
+        pending = await survivor.redis.xpending_range(
+            "stream:data", "workers", "-", "+", 10
+        )
+        owners = [item["consumer"].decode() for item in pending]
+        await crashed.close()
+        await survivor.close()
+        return entry, owners, survivor.consumer
+
+    entry, owners, survivor = asyncio.run(run())
+    assert entry["fields"]["jobId"] == "j0"
+    assert owners.count(survivor) == 1
+
+
+def test_entries_held_locally_are_not_reclaimed_by_their_holder(make_bridge):
+    async def run():
+        bridge = await make_bridge(reclaim=ReclaimConfig(min_idle_ms=1))
+        for index in range(2):
+            await _submit(bridge, f"j{index}", "io.task")
+        await bridge.poll_job(count=2)
+        await asyncio.sleep(0.01)
+
+        reclaimed = await bridge.reclaim_pending("stream:data", 5)
+        pending = await bridge.redis.xpending_range(
+            "stream:data", "workers", "-", "+", 10
+        )
+        await bridge.close()
+        return reclaimed, [item["times_delivered"] for item in pending]
+
+    reclaimed, deliveries = asyncio.run(run())
+    assert reclaimed == 0
+    assert deliveries == [1, 1]
@@ -0,0 +1,60 @@
+import asyncio
+
+from worker.core.executor import Executor
+from worker.services.registry import TaskRegistry
+
+
+class _NodeStateBridge:
+    async def set_node_state(self, job_id, node_id, state):
+        pass
+
+
+def _run_node(handler, timeout=None):
+    registry = TaskRegistry([])
+    registry.handlers["x.task"] = handler
+
+    async def run():
+        executor = Executor(
+            _NodeStateBridge(),
+            registry,
+            timeouts={"x.task": timeout} if timeout else None,
+        )
+        node = {"id": "n1", "service": "x.task", "plane": "python"}
+        await executor._execute_node({"workflowId": "job-1"}, node)
+        return node
+
+    return asyncio.run(run())
+
+
+def test_node_exceeding_its_deadline_times_out():
+    async def slow(params, node_input):
+        await asyncio.sleep(1)
+
+    node = _run_node(slow, timeout=0.05)
+
+    assert node["status"] == "failed"
+    assert node["error"]["code"] == "timeout"
+
+
+def test_timeout_error_raised_by_the_handler_is_a_task_error():
+    async def failing(params, node_input):
+        raise TimeoutError("upstream service timed out")
+
+    for timeout in (None, 5):
+        node = _run_node(failing, timeout=timeout)
+
+        assert node["status"] == "failed"
+        assert node["error"] == {
+            "message": "upstream service timed out",
+            "code": "task_error",
+        }
+
+
+def test_completed_node_keeps_its_output():
+    async def echo(params, node_input):
+        return {"value": 1}
+
+    node = _run_node(echo, timeout=5)
+
+    assert node["status"] == "completed"
+    assert node["output"] == {"value": 1}
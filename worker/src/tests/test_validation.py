@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from worker.core import executor as executor_module
+from worker.core.executor import Executor
+from worker.services.registry import TaskRegistry
+
+
+def _payload(job_id: str = "job-1") -> str:
+    return json.dumps(
+        {
+            "schema": "langgraph.v1",
+            "workflowId": job_id,
+            "nodes": [
+                {
+                    "id": "n1",
+                    "service": "x.task",
+                    "plane": "python",
+                    "status": "pending",
+                }
+            ],
+            "edges": [],
+        }
+    )
+
+
+@pytest.fixture
+def validations(monkeypatch):
+    """Count schema validations performed by executors."""
+    adapter = executor_module._GRAPH_ADAPTER
+    calls = []
+
+    class _Counting:
+        def validate_json(self, payload):
+            calls.append(payload)
+            return adapter.validate_json(payload)
+
+    monkeypatch.setattr(executor_module, "_GRAPH_ADAPTER", _Counting())
+    return calls
+
+
+def test_a_payload_is_validated_once(validations):
+    executor = Executor(None, TaskRegistry([]))
+
+    graphs = [executor._load_graph(_payload(), None) for _ in range(3)]
+
+    assert len(validations) == 1
+    assert graphs[0] == graphs[2]
+    assert graphs[0]["nodes"][0]["status"] == "pending"
+
+
+def test_invalid_payloads_are_never_cached(validations):
+    executor = Executor(None, TaskRegistry([]))
+    invalid = json.dumps({"schema": "langgraph.v1", "workflowId": "job-1"})
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            executor._load_graph(invalid, None)
+
+    assert len(validations) == 2
+    assert not executor.validated_graphs
+
+
+def test_graphs_written_by_the_worker_skip_validation(validations):
+    executor = Executor(None, TaskRegistry([]))
+    graph = json.loads(_payload())
+    graph["nodes"][0]["status"] = "completed"
+
+    executor._load_graph(executor._serialize_graph(graph), None)
+
+    assert validations == []
@@ -0,0 +1,95 @@
+import pytest
+
+from worker.models.worker.config_schema import ModelRegistryConfig
+from worker.services import weights
+from worker.services.weights import ModelKey, ModelRegistry
+
+_GIB = 1024**3
+
+
+class _Weights:
+    def __init__(self, host_gb=0.0, device_gb=0.0):
+        self.host_bytes = int(host_gb * _GIB)
+        self.device_bytes = int(device_gb * _GIB)
+
+
+@pytest.fixture(autouse=True)
+def _sized_weights(monkeypatch):
+    # Sizes come from the test objects instead of walking torch tensors.
+    monkeypatch.setattr(
+        weights,
+        "_footprint",
+        lambda value: (value.host_bytes, value.device_bytes),
+    )
+
+
+def _registry(**config) -> ModelRegistry:
+    return ModelRegistry(
+        ModelRegistryConfig(host_budget_gb=4, device_budget_gb=2, **config)
+    )
+
+
+def _key(name: str) -> ModelKey:
+    return ModelKey(name, "fp16", "cuda")
+
+
+def test_weights_are_loaded_once_and_shared():
+    registry = _registry()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return _Weights(1)
+
+    first = registry.acquire(_key("a"), load)
+    second = registry.acquire(_key("a"), load)
+
+    assert first is second
+    assert len(loads) == 1
+    assert registry.entries[_key("a")].refs == 2
+
+
+def test_unused_weights_stay_resident_within_budget():
+    registry = _registry()
+    with registry.session("tts") as session:
+        session.load("a", "fp16", "cuda", lambda: _Weights(1, 1))
+
+    assert list(registry.entries) == [_key("a")]
+    assert registry.entries[_key("a")].refs == 0
+    assert registry.resident_bytes() == (_GIB, _GIB)
+    assert set(registry.resident_owners()) == {"tts"}
+
+
+def test_least_recently_used_weights_are_evicted_over_budget():
+    registry = _registry()
+    for name in ("a", "b"):
+        registry.acquire(_key(name), lambda: _Weights(device_gb=1))
+        registry.release(_key(name))
+    # Touch "a" so that "b" is the least recently used.
+    registry.acquire(_key("a"), lambda: _Weights(device_gb=1))
+    registry.release(_key("a"))
+
+    registry.acquire(_key("c"), lambda: _Weights(device_gb=1))
+
+    assert list(registry.entries) == [_key("a"), _key("c")]
+
+
+def test_weights_in_use_are_never_evicted():
+    registry = _registry()
+    registry.acquire(_key("a"), lambda: _Weights(device_gb=2))
+
+    registry.acquire(_key("b"), lambda: _Weights(device_gb=2))
+
+    assert set(registry.entries) == {_key("a"), _key("b")}
+    registry.release(_key("a"))
+    assert list(registry.entries) == [_key("b")]
+
+
+def test_disabled_registry_releases_weights_after_use():
+    registry = _registry(enabled=False)
+    with registry.session() as session:
+        session.load("a", "fp16", "cuda", lambda: _Weights(1))
+        assert list(registry.entries) == [_key("a")]
+
+    assert not registry.entries
+    assert registry.resident_owners() == {}
@@ -1,13 +1,38 @@
-from fastapi import APIRouter, Response
+from typing import Optional
+
+from fastapi import APIRouter, Request, Response
 from .endpoints.metrics import get_metrics
+from ..config import get_config
 
 router = APIRouter()
 
 
 @router.get("/health")
-async def health():
-    """Simple health endpoint."""
-    return {"status": "ok"}
+async def health(request: Request):
+    """Health endpoint; reports drain progress while the worker drains."""
+    executor = getattr(request.app.state, "executor", None)
+    if not executor:
+        return {"status": "ok"}
+    drain = executor.drain_state()
+    status = "ok" if drain["state"] == "running" else drain["state"]
+    return {"status": status, "drain": drain}
+
+
+@router.post("/admin/drain")
+async def drain(request: Request, timeout: Optional[float] = None):
+    """Stop claiming new jobs and let in-flight ones finish (for rolling deploys)."""
+    executor = request.app.state.executor
+    executor.begin_drain(
+        get_config().executor.drain_timeout_seconds if timeout is None else timeout
+    )
+    return executor.drain_state()
+
+
+@router.post("/admin/cancel/{job_id}")
+async def cancel(request: Request, job_id: str, reason: str = "cancelled"):
+    """Cancel a job on whichever worker runs or holds it."""
+    await request.app.state.bridge.request_cancel(job_id, reason)
+    return {"jobId": job_id, "reason": reason, "status": "requested"}
 
 
 @router.get("/metrics")
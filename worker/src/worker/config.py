@@ -5,11 +5,12 @@ import json
 from pathlib import Path
 from copy import deepcopy
 from .models.capabilities.plane_manifest_schema import PlaneCapabilityManifest
-from .models.worker.config_schema import WorkerConfiguration
+from .models.worker.config_schema import PresetsConfiguration, WorkerConfiguration
 
 _CONFIG_ROOT_DIR = os.getenv("WORKER_HOME", "/opt/app") + "/config"
 _cached_configuration = None
 _cached_capabilities = None
+_cached_presets = None
 
 
 def _deep_merge(cfga, cfgb):
@@ -44,6 +45,11 @@ def get_config() -> WorkerConfiguration:
                 "secret_key": os.getenv("MINIO_SECRET_KEY", "password"),
             }
         }
+        consumer_id = os.getenv("WORKER_CONSUMER_ID")
+        if consumer_id:
+            app_config = _deep_merge(
+                app_config, {"presence": {"consumer": consumer_id}}
+            )
         bridge_config = {
             "bridge": json.loads(
                 Path(_CONFIG_ROOT_DIR + "/redis.bridge.json").read_text(
@@ -68,3 +74,13 @@ def get_capabilities() -> PlaneCapabilityManifest:
             )
         )
     return _cached_capabilities
+
+
+def get_presets() -> PresetsConfiguration:
+    global _cached_presets
+    if _cached_presets is None:
+        path = Path(_CONFIG_ROOT_DIR + "/presets.json")
+        _cached_presets = PresetsConfiguration.model_validate(
+            json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        )
+    return _cached_presets
@@ -1,25 +1,162 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeAlias
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeAlias,
+    TypeVar,
+)
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import NoScriptError
 from redis.exceptions import ResponseError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
-from ..models.jobs.job_messaging_schema import DataUpdate, ProgressUpdate, StatusUpdate
+from ..models.jobs.job_messaging_schema import (
+    DataUpdate,
+    JobStatus,
+    ProgressUpdate,
+    StatusUpdate,
+)
 from ..models.redis.redis_config_schema import RedisConfiguration
+from ..models.worker.config_schema import (
+    AffinityConfig,
+    ConnectionConfig,
+    LanesConfig,
+    ReclaimConfig,
+    RetentionConfig,
+    RetryConfig,
+)
+from .lanes import LaneScheduler
+from .pools import InstrumentedConnectionPool, PoolExhaustedError
+from .resilience import CircuitBreaker, CircuitOpenError, CircuitState, backoff_delay
+from ..infra.metrics import MetricType, get_or_create_metric
 from ..utils.misc import json_dumps_safe
 
 PublishHook: TypeAlias = Callable[
     [ProgressUpdate | StatusUpdate | DataUpdate], Awaitable[None]
 ]
 
+T = TypeVar("T")
+
+# A stream entry as ``(stream, xid)``.
+EntryKey: TypeAlias = Tuple[str, str]
+
+_CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
 
 def _current_timestamp_ms() -> str:
     """Return the current time in milliseconds as a string."""
     return str(int(datetime.now(timezone.utc).timestamp() * 1000))
 
 
+def default_consumer_name() -> str:
+    """Unique consumer name for this process: ``<host>-<pid>-<instance>``."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _parse_stream_id(value: Any) -> Tuple[int, int]:
+    """Split a ``<ms>-<seq>`` stream ID into a comparable tuple."""
+    raw = value.decode() if isinstance(value, bytes) else str(value)
+    ms, _, seq = raw.partition("-")
+    return int(ms), int(seq or 0)
+
+
+# Atomically accumulate/clamp a job's progress, snapshot its state and
+# publish the update, so progress reporting is a single round trip that
+# stays consistent when several nodes of a job report concurrently.
+# A node reports its absolute share; the job progress moves by the change
+# since that node's last report, so replays and restarts never add twice.
+#   KEYS: job:<id>:progress, job:<id>:status, job:<id>:state,
+#         job:<id>:progress:nodes (node id -> last reported share)
+#   ARGV: value, stepping ("1"/"0"), ttl, channel, jobId, created (ISO-8601),
+#         node id ("" for job-level values)
+_PROGRESS_SCRIPT = """
+local value = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[3])
+if ARGV[7] ~= '' then
+    local previous = tonumber(redis.call('HGET', KEYS[4], ARGV[7])) or 0
+    redis.call('HSET', KEYS[4], ARGV[7], ARGV[1])
+    redis.call('EXPIRE', KEYS[4], ttl)
+    value = value - previous + (tonumber(redis.call('GET', KEYS[1])) or 0)
+elseif ARGV[2] == '1' then
+    value = value + (tonumber(redis.call('GET', KEYS[1])) or 0)
+end
+if value < 0 then value = 0 elseif value > 1 then value = 1 end
+redis.call('SET', KEYS[1], tostring(value), 'EX', ttl)
+local status = redis.call('GET', KEYS[2]) or 'running'
+redis.call('SET', KEYS[3], cjson.encode(
+    {jobId = ARGV[5], status = status, progress = value}), 'EX', ttl)
+redis.call('PUBLISH', ARGV[4], cjson.encode(
+    {jobId = ARGV[5], progress = value, created = ARGV[6]}))
+return tostring(value)
+"""
+
+
+# Move delayed retries that are due back onto the data stream. Doing the
+# ZRANGEBYSCORE/XADD/ZREM in one script keeps a retry from being enqueued
+# twice when several workers poll the schedule at the same time.
+#   KEYS: retry schedule (zset), data stream, lane streams...
+#   ARGV: now (ms), max entries to move
+# Only declared streams are written to; a retry naming any other stream
+# (e.g. a lane removed since) goes back to the data stream.
+_RETRY_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1],
+    'LIMIT', 0, tonumber(ARGV[2]))
+local streams = {}
+for i = 2, #KEYS do streams[KEYS[i]] = true end
+for _, member in ipairs(due) do
+    local entry = cjson.decode(member)
+    local stream = KEYS[2]
+    if entry.stream and streams[entry.stream] then stream = entry.stream end
+    redis.call('XADD', stream, '*', 'jobId', entry.jobId, 'created', ARGV[1],
+        'graph', entry.graph, 'attempt', tostring(entry.attempt))
+    redis.call('ZREM', KEYS[1], member)
+end
+return #due
+"""
+
+
+# Sorted set of live workers (score: last heartbeat in ms); each member has
+# a ``<set>:<consumer>`` hash with its advertised state.
+_PRESENCE_SET = "workers:presence"
+
+
+@dataclass(slots=True)
+class PendingPublish:
+    """
+    A buffered pub/sub message awaiting the next pipelined flush.
+
+    Status and data updates carry their message model; progress updates
+    carry the raw value (and the reporting node, if any), applied
+    server-side by the progress script.
+    """
+
+    kind: str
+    channel: str
+    message: Optional[StatusUpdate | DataUpdate] = None
+    progress: float = 0.0
+    stepping: bool = False
+    node: Optional[str] = None
+
+
 class RedisBridge:
     """
     Async Redis helper that wraps stream consumption and pub/sub publishing.
@@ -29,19 +166,218 @@ class RedisBridge:
     emitting progress updates.
     """
 
-    def __init__(self, configuration: RedisConfiguration, group: str):
+    def __init__(
+        self,
+        configuration: RedisConfiguration,
+        group: str,
+        *,
+        publish_window_ms: int = 250,
+        reclaim: Optional[ReclaimConfig] = None,
+        connection: Optional[ConnectionConfig] = None,
+        retention: Optional[RetentionConfig] = None,
+        retry: Optional[RetryConfig] = None,
+        lanes: Optional[LanesConfig] = None,
+        affinity: Optional[AffinityConfig] = None,
+        consumer: Optional[str] = None,
+    ):
         self.redis_url = configuration.url
         self.channels = configuration.channels
         self.group = group
         self.job_ttl = configuration.jobs.ttl
         self.data_stream = f"{configuration.streams.data}"
         self.control_stream = f"{configuration.streams.control}"
-        self.managed_streams = [self.data_stream]
-        current_task = asyncio.current_task()
-        self.consumer = (
-            f"consumer-{current_task.get_name() if current_task else 'default'}"
-        )
+        # Cancel commands are broadcast (plain XREAD, no group) on a sibling
+        # stream, so every replica sees them and the control group is untouched.
+        self.cancel_stream = f"{self.control_stream}:cancel"
+        # Priority lanes: the base data stream plus one stream per lane.
+        self.lanes = lanes or LanesConfig()
+        lane_weights = {self.data_stream: self.lanes.default_weight}
+        for lane in self.lanes.lanes:
+            lane_weights[lane.stream or f"{self.data_stream}:{lane.name}"] = lane.weight
+        # Model affinity: one stream per model-backed service, read only
+        # after a wait unless the service's models are warm here.
+        self.affinity = affinity or AffinityConfig()
+        self.affinity_streams = {
+            service: f"{self.data_stream}:cap:{service}"
+            for service in self.affinity.services
+        }
+        for stream in self.affinity_streams.values():
+            lane_weights.setdefault(stream, self.lanes.default_weight)
+        self.cold_deadline: Optional[float] = None
+        self.managed_streams = list(lane_weights)
+        # Every replica needs its own name so PEL ownership stays unambiguous.
+        self.consumer = consumer or default_consumer_name()
+        self.presence_key = f"{_PRESENCE_SET}:{self.consumer}"
+        # Fast-path client (publish/ack/persist) and a separate client for
+        # blocking reads, so a parked XREADGROUP never holds up a publish.
         self.redis: Optional[redis.Redis] = None
+        self.reader: Optional[redis.Redis] = None
+        self.progress_script: Optional[Any] = None
+        # Entries claimed by a batched XREADGROUP but not yet handed out,
+        # buffered per lane and dispatched by the lane policy.
+        self.local_queue = LaneScheduler(lane_weights, self.lanes.policy)
+        # Entries owned by this consumer (buffered or in flight). Entry IDs
+        # are only unique within a stream, so entries are keyed by both.
+        self.claimed: Set[EntryKey] = set()
+        # Owned entries a job is running for; only these are kept from
+        # being reclaimed, so entries waiting for a slot can move elsewhere.
+        self.started: Set[EntryKey] = set()
+        # Cleared while draining: no new reads and no reclaiming.
+        self.claiming = True
+        self.reclaim = reclaim or ReclaimConfig()
+        self.reclaimer: Optional[asyncio.Task] = None
+        # Abandoned entries are reclaimed by polls, within their free slots.
+        self.next_reclaim = 0.0
+        # Stream retention: last safe MINID per stream, reused on XADD.
+        self.retention = retention or RetentionConfig()
+        self.retained_streams = [*self.managed_streams, self.control_stream]
+        self.trim_minid: Dict[str, str] = {}
+        self.trimmer: Optional[asyncio.Task] = None
+        # Delayed retries wait in a sorted set; dead letters go to a stream.
+        self.retry = retry or RetryConfig()
+        self.retry_key = f"{self.data_stream}:retry"
+        self.dead_letter_stream = f"{self.data_stream}:dead"
+        self.retry_script: Optional[Any] = None
+        self.retrier: Optional[asyncio.Task] = None
+        # Per-job ordered publish buffers, flushed through a single pipeline.
+        self.publish_window = publish_window_ms / 1000
+        self.publish_buffers: Dict[str, List[PendingPublish]] = {}
+        self.publish_pending = asyncio.Event()
+        self.publish_urgent = asyncio.Event()
+        self.publish_lock = asyncio.Lock()
+        self.publisher: Optional[asyncio.Task] = None
+        # Connection health: circuit breaker, reconnect loop and replay outbox.
+        self.connection = connection or ConnectionConfig()
+        self.breaker = CircuitBreaker(
+            self.connection.failure_threshold, self.connection.reset_timeout_seconds
+        )
+        self.available = asyncio.Event()
+        self.outage_started: Optional[float] = None
+        self.reconnector: Optional[asyncio.Task] = None
+        self.outbox: Deque[Tuple[str, PendingPublish]] = deque()
+        self.unacked: Set[EntryKey] = set()
+        self.ack_replayer: Optional[asyncio.Task] = None
+        self.metrics = {
+            "worker_publish_messages_total": get_or_create_metric(
+                "worker_publish_messages_total",
+                MetricType.COUNTER,
+                "Pub/sub messages sent to Redis",
+                labelnames=["kind"],
+            ),
+            "worker_publish_coalesced_total": get_or_create_metric(
+                "worker_publish_coalesced_total",
+                MetricType.COUNTER,
+                "Progress updates superseded before reaching Redis",
+            ),
+            "worker_publish_flushes_total": get_or_create_metric(
+                "worker_publish_flushes_total",
+                MetricType.COUNTER,
+                "Pipelined publish flushes",
+            ),
+            "worker_reclaimed_entries_total": get_or_create_metric(
+                "worker_reclaimed_entries_total",
+                MetricType.COUNTER,
+                "Pending entries reclaimed from idle consumers",
+                labelnames=["stream"],
+            ),
+            "worker_reclaim_poison_total": get_or_create_metric(
+                "worker_reclaim_poison_total",
+                MetricType.COUNTER,
+                "Reclaimed entries dropped after exceeding the delivery limit",
+                labelnames=["stream"],
+            ),
+            "worker_stream_pending_entries": get_or_create_metric(
+                "worker_stream_pending_entries",
+                MetricType.GAUGE,
+                "Entries in the consumer group pending list",
+                labelnames=["stream"],
+            ),
+            "worker_dead_letter_total": get_or_create_metric(
+                "worker_dead_letter_total",
+                MetricType.COUNTER,
+                "Entries moved to the dead-letter stream",
+                labelnames=["reason"],
+            ),
+            "worker_affinity_cold_polls_total": get_or_create_metric(
+                "worker_affinity_cold_polls_total",
+                MetricType.COUNTER,
+                "Polls that fell back to cold capability streams",
+            ),
+            "worker_lane_dispatched_total": get_or_create_metric(
+                "worker_lane_dispatched_total",
+                MetricType.COUNTER,
+                "Entries handed to the executor, by data stream lane",
+                labelnames=["stream"],
+            ),
+            "worker_retry_scheduled_total": get_or_create_metric(
+                "worker_retry_scheduled_total",
+                MetricType.COUNTER,
+                "Jobs scheduled for a delayed retry",
+            ),
+            "worker_stream_length": get_or_create_metric(
+                "worker_stream_length",
+                MetricType.GAUGE,
+                "Number of entries held in the stream",
+                labelnames=["stream"],
+            ),
+            "worker_stream_memory_bytes": get_or_create_metric(
+                "worker_stream_memory_bytes",
+                MetricType.GAUGE,
+                "Approximate memory used by the stream key (MEMORY USAGE)",
+                labelnames=["stream"],
+            ),
+            "worker_stream_trimmed_entries_total": get_or_create_metric(
+                "worker_stream_trimmed_entries_total",
+                MetricType.COUNTER,
+                "Entries removed from the stream by retention trimming",
+                labelnames=["stream"],
+            ),
+            "worker_redis_connected": get_or_create_metric(
+                "worker_redis_connected",
+                MetricType.GAUGE,
+                "Whether the bridge currently considers Redis reachable (1/0)",
+            ),
+            "worker_redis_circuit_open": get_or_create_metric(
+                "worker_redis_circuit_open",
+                MetricType.GAUGE,
+                "Whether the Redis circuit breaker is open (1/0)",
+            ),
+            "worker_redis_outage_seconds": get_or_create_metric(
+                "worker_redis_outage_seconds",
+                MetricType.GAUGE,
+                "Duration of the ongoing Redis outage (0 when connected)",
+            ),
+            "worker_redis_reconnects_total": get_or_create_metric(
+                "worker_redis_reconnects_total",
+                MetricType.COUNTER,
+                "Successful reconnections after an outage",
+            ),
+            "worker_publish_outbox_size": get_or_create_metric(
+                "worker_publish_outbox_size",
+                MetricType.GAUGE,
+                "Messages waiting for replay",
+            ),
+            "worker_publish_outbox_dropped_total": get_or_create_metric(
+                "worker_publish_outbox_dropped_total",
+                MetricType.COUNTER,
+                "Messages discarded because the replay outbox was full",
+                labelnames=["kind"],
+            ),
+        }
+        self.metrics["worker_redis_connected"].set_function(
+            lambda: 1 if self.redis and self.outage_started is None else 0
+        )
+        self.metrics["worker_redis_circuit_open"].set_function(
+            lambda: 1 if self.breaker.state is CircuitState.open else 0
+        )
+        self.metrics["worker_redis_outage_seconds"].set_function(
+            lambda: (
+                time.monotonic() - self.outage_started if self.outage_started else 0
+            )
+        )
+        self.metrics["worker_publish_outbox_size"].set_function(
+            lambda: len(self.outbox)
+        )
 
     # ------------------------------------------------------------------
     # Connection & group management
@@ -65,89 +401,808 @@ class RedisBridge:
                     continue
                 raise
 
-    async def connect(self) -> None:
-        """Create the Redis connection pool and ensure groups exist."""
-        self.redis = redis.from_url(
+    async def _load_scripts(self) -> None:
+        """
+        Load the Lua scripts into the script cache.
+
+        Flushes call the progress script with EVALSHA; loading it up front
+        keeps the first flush after a (re)connect from hitting NOSCRIPT,
+        whose fallback sends that update after the rest of the batch.
+        """
+        for script in (self.progress_script, self.retry_script):
+            await self.redis.script_load(script.script)
+
+    def _create_client(self, name: str, size: int) -> redis.Redis:
+        pool = InstrumentedConnectionPool.from_url(
             self.redis_url,
+            max_connections=size,
+            timeout=self.connection.pool_timeout_seconds,
             decode_responses=False,
             encoding="utf-8",
         )
+        return redis.Redis.from_pool(pool.instrument(name))
+
+    async def connect(self) -> None:
+        """Create the reader/writer connection pools and ensure groups exist."""
+        self.redis = self._create_client("writer", self.connection.writer_pool_size)
+        self.reader = self._create_client("reader", self.connection.reader_pool_size)
+        self.progress_script = self.redis.register_script(_PROGRESS_SCRIPT)
+        self.retry_script = self.redis.register_script(_RETRY_SCRIPT)
         print(f"[RedisBridge] ✅ Connected to {self.redis_url}")
         await self._create_group()
+        await self._load_scripts()
         print(f"[RedisBridge] ✅ Group {self.group} is ready.")
+        self.available.set()
+        if not self.publisher:
+            self.publisher = asyncio.create_task(
+                self._publish_loop(), name="bridge-publisher"
+            )
+        if self.reclaim.enabled and not self.reclaimer:
+            self.reclaimer = asyncio.create_task(
+                self._reclaim_loop(), name="bridge-reclaimer"
+            )
+        if not self.retrier:
+            self.retrier = asyncio.create_task(
+                self._retry_loop(), name="bridge-retrier"
+            )
+        if self.retention.enabled and not self.trimmer:
+            self.trimmer = asyncio.create_task(self._trim_loop(), name="bridge-trimmer")
 
     async def close(self) -> None:
-        """Close the Redis connection."""
+        """Flush buffered publishes and close the Redis connection."""
+        if self.ack_replayer:
+            # Acks never raise; let the replay finish so entries are not re-run.
+            await self.ack_replayer
+            self.ack_replayer = None
+        if self.reconnector:
+            self.reconnector.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.reconnector
+            self.reconnector = None
+        if self.reclaimer:
+            self.reclaimer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.reclaimer
+            self.reclaimer = None
+        if self.retrier:
+            self.retrier.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.retrier
+            self.retrier = None
+        if self.trimmer:
+            self.trimmer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.trimmer
+            self.trimmer = None
+        if self.publisher:
+            self.publisher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.publisher
+            self.publisher = None
+        if self.reader:
+            await self.reader.aclose()
+            self.reader = None
         if self.redis:
-            await self.redis.close()
-            await self.redis.connection_pool.disconnect()
+            await self.flush_publishes()
+            await self.redis.aclose()
             print("[RedisBridge] 🔌 Connection closed.")
 
+    # ------------------------------------------------------------------
+    # Connection health
+    # ------------------------------------------------------------------
+
+    async def _call(self, command: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a Redis command through the circuit breaker.
+
+        Connection-level failures are recorded (and start the reconnect
+        loop); while the circuit is open calls fail fast with
+        ``CircuitOpenError`` instead of piling up on a dead socket. An
+        exhausted pool is backpressure, not an outage: the call fails, but
+        the breaker and the pooled connections are left alone.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        if not self.breaker.allow():
+            raise CircuitOpenError("Redis circuit breaker is open")
+        try:
+            result = await command()
+        except PoolExhaustedError as exc:
+            self.breaker.release()
+            print(f"[RedisBridge] ⚠️ Connection pool saturated: {exc}")
+            raise
+        except _CONNECTION_ERRORS as exc:
+            self._on_connection_failure(exc)
+            raise
+        except BaseException:
+            # Command errors and cancellation say nothing about the link.
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _on_connection_failure(self, exc: BaseException) -> None:
+        self.breaker.record_failure()
+        if self.outage_started is None:
+            self.outage_started = time.monotonic()
+            self.available.clear()
+            print(f"[RedisBridge] 🚨 Redis connection lost: {exc}")
+        if not self.reconnector or self.reconnector.done():
+            self.reconnector = asyncio.create_task(
+                self._reconnect_loop(), name="bridge-reconnector"
+            )
+
+    async def _reconnect_loop(self) -> None:
+        """Re-establish connectivity with jittered exponential back-off."""
+        attempt = 0
+        while self.outage_started is not None:
+            await asyncio.sleep(
+                backoff_delay(
+                    attempt,
+                    self.connection.backoff_initial,
+                    self.connection.backoff_max,
+                    self.connection.jitter,
+                )
+            )
+            attempt += 1
+            try:
+                # Drop sockets that may still point at the failed server.
+                await self.redis.connection_pool.disconnect()
+                if self.reader:
+                    await self.reader.connection_pool.disconnect()
+                await self.redis.ping()
+                await self._create_group()
+                await self._load_scripts()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.breaker.record_failure()
+                print(f"[RedisBridge] ⏳ Reconnect attempt {attempt} failed: {exc}")
+                continue
+            self._on_reconnected()
+
+    def _on_reconnected(self) -> None:
+        outage = time.monotonic() - (self.outage_started or time.monotonic())
+        self.outage_started = None
+        self.breaker.record_success()
+        self.available.set()
+        self._metrics_inc("worker_redis_reconnects_total")
+        print(f"[RedisBridge] ✅ Reconnected after {outage:.1f}s outage.")
+        # Replay buffered status/data messages and acknowledgements.
+        self.publish_pending.set()
+        self.publish_urgent.set()
+        if self.unacked and (not self.ack_replayer or self.ack_replayer.done()):
+            self.ack_replayer = asyncio.create_task(
+                self._retry_unacked(), name="bridge-ack-replay"
+            )
+
+    async def _retry_unacked(self) -> None:
+        for stream, xid in list(self.unacked):
+            await self.ack_job(stream, xid)
+
     # ------------------------------------------------------------------
     # Stream helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _decode_entry(stream: Any, xid: Any, fields: Dict[Any, Any]) -> Dict[str, Any]:
+        """Normalize a raw stream entry into the ``{stream, xid, fields}`` shape."""
+        return {
+            "stream": stream.decode() if isinstance(stream, bytes) else stream,
+            "xid": xid.decode() if isinstance(xid, bytes) else xid,
+            "fields": {
+                (k.decode() if isinstance(k, bytes) else k): (
+                    v.decode() if isinstance(v, bytes) else v
+                )
+                for k, v in fields.items()
+            },
+        }
+
     async def _read_streams(
-        self, streams: Dict[Any, Any], count: int, block: int
+        self, streams: Dict[Any, Any], count: int, block: Optional[int]
     ) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
-        if not self.redis or not streams:
+        if not self.reader or not streams:
             return results
 
         try:
-            entries = await self.redis.xreadgroup(
-                groupname=self.group,
-                consumername=self.consumer,
-                streams=streams,
-                count=count,
-                block=block,
+            entries = await self._call(
+                lambda: self.reader.xreadgroup(
+                    groupname=self.group,
+                    consumername=self.consumer,
+                    streams=streams,
+                    count=count,
+                    block=block,
+                )
             )
 
             for stream_name, messages in entries or []:
-                stream_str = (
-                    stream_name.decode()
-                    if isinstance(stream_name, bytes)
-                    else stream_name
-                )
                 for xid, fields in messages:
-                    xid_str = xid.decode() if isinstance(xid, bytes) else xid
-                    decoded_fields = {
-                        (k.decode() if isinstance(k, bytes) else k): (
-                            v.decode() if isinstance(v, bytes) else v
-                        )
-                        for k, v in fields.items()
-                    }
-                    results.append(
-                        {"stream": stream_str, "xid": xid_str, "fields": decoded_fields}
-                    )
+                    results.append(self._decode_entry(stream_name, xid, fields))
+        except ResponseError as exc:
+            # A failover to a replica without persistence loses the groups.
+            if "NOGROUP" in str(exc):
+                await self._create_group()
+            print(f"[RedisBridge] ⚠️ Poll error: {exc}")
+            raise
         except Exception as exc:
+            # Surface read failures so the caller can back off; an idle
+            # stream is reported as an empty result, never as an error.
             print(f"[RedisBridge] ⚠️ Poll error: {exc}")
-            await asyncio.sleep(0.5)
+            raise
 
         return results
 
-    async def poll_job(self, timeout: int = 200) -> Dict[str, Any] | None:
-        """Poll the process:data stream for workflow graphs."""
-        entries = await self._read_streams({self.data_stream: ">"}, 1, timeout)
-        if len(entries) > 0:
-            return entries[0]
-        return None
+    async def poll_job(
+        self, timeout: int = 200, count: int = 1, warm: Sequence[str] = ()
+    ) -> Dict[str, Any] | None:
+        """
+        Poll the data stream lanes for workflow graphs.
+
+        Up to ``count`` entries in total are claimed per round, lane by lane
+        as the lane policy picks them, and buffered locally; subsequent
+        calls drain the local buffer before touching Redis again. Callers
+        pass the number of jobs they can start as ``count``; abandoned
+        entries, reclaimed once per ``interval_seconds``, count against it.
+        Capability streams of services not in ``warm`` are only read once
+        no other work turned up within ``cold_wait_ms``.
+        """
+        if not self.claiming:
+            return None
+        count = max(1, count)
+        if (
+            not self.local_queue
+            and self.reclaim.enabled
+            and time.monotonic() >= self.next_reclaim
+        ):
+            await self._reclaim_streams(count)
+        if not self.local_queue:
+            entries = await self._claim_entries(count, timeout, warm)
+            for entry in entries:
+                self.claimed.add((entry["stream"], entry["xid"]))
+                self.local_queue.push(entry)
+        entry = self.local_queue.pop()
+        if entry:
+            self._metrics_inc_counter(
+                "worker_lane_dispatched_total", entry["stream"], label="stream"
+            )
+        return entry
+
+    async def _claim_entries(
+        self, count: int, timeout: int, warm: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        streams = self.managed_streams
+        cold = {
+            stream
+            for service, stream in self.affinity_streams.items()
+            if service not in warm
+        }
+        if cold:
+            # Affinity first: while idle, give workers that have these models
+            # loaded a head start before this one pays for loading them.
+            now = time.monotonic()
+            if self.cold_deadline is None:
+                self.cold_deadline = now + self.affinity.cold_wait_ms / 1000
+            remaining_ms = int((self.cold_deadline - now) * 1000)
+            if remaining_ms > 0:
+                streams = [s for s in streams if s not in cold]
+                timeout = max(1, min(timeout, remaining_ms))
+            else:
+                self._metrics_inc("worker_affinity_cold_polls_total")
+        entries = await self._claim_lanes(streams, count)
+        if not entries:
+            # Nothing queued: block on a plain XREAD from the current tails,
+            # which wakes up on new entries without claiming any of them. The
+            # second pass covers entries added before the tails were taken.
+            tails = await self._stream_tails(streams)
+            entries = await self._claim_lanes(streams, count)
+            if not entries:
+                await self._call(
+                    lambda: self.reader.xread(tails, count=1, block=timeout)
+                )
+                entries = await self._claim_lanes(streams, count)
+        if entries:
+            self.cold_deadline = None
+        return entries
 
-    async def ack_job(self, xid: str) -> bool:
+    async def _claim_lanes(
+        self, streams: Sequence[str], count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Claim up to ``count`` new entries, reading one lane at a time.
+
+        COUNT applies per stream, so one XREADGROUP over every lane would
+        take up to ``count`` entries from each of them and flatten the lane
+        weights; instead the lane policy picks the lane for every read. A
+        lane that comes back short is skipped for the rest of the round.
+        """
+        entries: List[Dict[str, Any]] = []
+        candidates = set(streams)
+        while len(entries) < count and candidates:
+            lane = self.local_queue.next_lane(candidates)
+            # Strict order takes all it can from the top lane; the weighted
+            # policy claims one entry per pick so each lane gets its share.
+            wanted = count - len(entries) if self.local_queue.strict else 1
+            batch = await self._read_streams({lane: ">"}, wanted, None)
+            if len(batch) < wanted:
+                candidates.discard(lane)
+            entries.extend(batch)
+        return entries
+
+    async def _stream_tails(self, streams: Sequence[str]) -> Dict[str, Any]:
+        """Return the ID of the newest entry of each stream ("0-0" if empty)."""
+        pipeline = self.redis.pipeline(transaction=False)
+        for stream in streams:
+            pipeline.xrevrange(stream, count=1)
+        newest = await self._call(pipeline.execute)
+        return {
+            stream: entries[0][0] if entries else "0-0"
+            for stream, entries in zip(streams, newest)
+        }
+
+    async def ack_job(self, stream: str, xid: str) -> bool:
         """
         Acknowledge a processed job, removing it from the pending list.
         """
         if not self.redis:
             raise RuntimeError("Redis not connected")
-        stream = self.data_stream
+        key = (stream, xid)
         try:
-            acked = await self.redis.xack(stream, self.group, xid)
-            if acked:
-                print(f"[RedisBridge] 🧾 Acknowledged {xid} on '{stream}'")
-            return bool(acked)
+            acked = await self._call(lambda: self.redis.xack(stream, self.group, xid))
         except Exception as exc:
+            # Keep ownership so the entry is not reclaimed and re-run; the
+            # acknowledgement is retried once the connection recovers.
+            self.unacked.add(key)
             print(f"[RedisBridge] ⚠️ Ack error on '{stream}' ({xid}): {exc}")
             return False
+        self.claimed.discard(key)
+        self.started.discard(key)
+        self.unacked.discard(key)
+        if acked:
+            print(f"[RedisBridge] 🧾 Acknowledged {xid} on '{stream}'")
+        return bool(acked)
+
+    def release_job(self, stream: str, xid: str) -> None:
+        """
+        Give up ownership of an entry without acknowledging it.
+
+        The entry stays in the pending list and becomes eligible for
+        reclaim by any consumer once it has been idle long enough.
+        """
+        self.claimed.discard((stream, xid))
+        self.started.discard((stream, xid))
+
+    async def start_job(self, stream: str, xid: str) -> bool:
+        """
+        Mark an owned entry as running and refresh its idle time.
+
+        Entries that waited for a slot are not refreshed, so another worker
+        may have reclaimed them meanwhile; returns False (and forgets the
+        entry) when this consumer no longer owns it.
+        """
+        key = (stream, xid)
+        if key not in self.claimed or not self.redis:
+            return False
+        owned = await self._call(
+            lambda: self.redis.xpending_range(
+                stream, self.group, xid, xid, 1, consumername=self.consumer
+            )
+        )
+        if not owned:
+            self.claimed.discard(key)
+            print(f"[RedisBridge] ↪️ Entry {xid} on '{stream}' was reclaimed elsewhere")
+            return False
+        await self._call(
+            lambda: self.redis.xclaim(
+                stream, self.group, self.consumer, 0, [xid], justid=True
+            )
+        )
+        self.started.add(key)
+        return True
+
+    async def requeue_job(self, entry: Dict[str, Any]) -> None:
+        """
+        Put a claimed entry back at the tail of its stream.
+
+        Used for entries this worker has no room for: unlike a release,
+        which leaves the entry pending here until the reclaim threshold,
+        the copy is immediately available to every worker. Adding the copy
+        and acknowledging the original happen in one transaction.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        stream, xid = entry["stream"], entry["xid"]
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.xadd(
+            stream,
+            fields=entry["fields"],
+            minid=self.trim_minid.get(stream),
+            approximate=True,
+        )
+        pipeline.xack(stream, self.group, xid)
+        await self._call(pipeline.execute)
+        self.release_job(stream, xid)
+
+    def stop_claiming(self) -> int:
+        """
+        Stop taking on new entries and give back the locally buffered ones.
+
+        Entries already handed out stay owned (and refreshed) until they are
+        acknowledged or released. Returns the number of entries given back.
+        """
+        self.claiming = False
+        released = 0
+        for entry in self.local_queue.drain():
+            self.release_job(entry["stream"], entry["xid"])
+            released += 1
+        return released
+
+    # ------------------------------------------------------------------
+    # Pending-entry reclaim
+    # ------------------------------------------------------------------
+
+    async def _reclaim_loop(self) -> None:
+        """Periodically refresh owned entries and prune stale consumers."""
+        while True:
+            await asyncio.sleep(self.reclaim.interval_seconds)
+            for stream in self.managed_streams:
+                try:
+                    await self._refresh_claimed(stream)
+                    summary = await self._call(
+                        lambda: self.redis.xpending(stream, self.group)
+                    )
+                    self._metrics_set(
+                        "worker_stream_pending_entries",
+                        stream,
+                        summary.get("pending", 0) if summary else 0,
+                    )
+                    await self._prune_consumers(stream)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    print(f"[RedisBridge] ⚠️ Reclaim error on '{stream}': {exc}")
+
+    async def _reclaim_streams(self, limit: int) -> int:
+        """Reclaim up to ``limit`` abandoned entries across the lanes."""
+        self.next_reclaim = time.monotonic() + self.reclaim.interval_seconds
+        reclaimed = 0
+        for stream in self.managed_streams:
+            if reclaimed >= limit:
+                break
+            try:
+                reclaimed += await self.reclaim_pending(stream, limit - reclaimed)
+            except Exception as exc:
+                print(f"[RedisBridge] ⚠️ Reclaim error on '{stream}': {exc}")
+        return reclaimed
+
+    async def _refresh_claimed(self, stream: str) -> None:
+        """
+        Reset the idle time of entries this consumer is running.
+
+        Long renders legitimately keep an entry pending for longer than the
+        reclaim threshold; re-claiming them with JUSTID (which does not bump
+        the delivery counter) keeps them from being stolen by other workers.
+        Buffered entries are left to age so that idle workers can take them.
+        """
+        if not self.redis:
+            return
+        owned = [xid for owner, xid in self.started if owner == stream]
+        if owned:
+            await self._call(
+                lambda: self.redis.xclaim(
+                    stream, self.group, self.consumer, 0, owned, justid=True
+                )
+            )
+
+    async def _prune_consumers(self, stream: str) -> None:
+        """
+        Delete consumers left behind by stopped replicas.
+
+        Names are unique per process, so every restart leaves a consumer in
+        the group; once it owns nothing and has been idle past the reclaim
+        threshold it is safe to remove.
+        """
+        if not self.redis:
+            return
+        consumers = await self._call(
+            lambda: self.redis.xinfo_consumers(stream, self.group)
+        )
+        for consumer in consumers or []:
+            name = consumer["name"]
+            name = name.decode() if isinstance(name, bytes) else name
+            if (
+                name != self.consumer
+                and not consumer.get("pending")
+                and consumer.get("idle", 0) > self.reclaim.min_idle_ms
+            ):
+                await self._call(
+                    lambda: self.redis.xgroup_delconsumer(stream, self.group, name)
+                )
+                print(f"[RedisBridge] 🧹 Removed stale consumer '{name}'")
+
+    async def reclaim_pending(self, stream: str, limit: int) -> int:
+        """
+        Move up to ``limit`` entries idle for longer than ``min_idle_ms`` to
+        this consumer.
+
+        Candidates are listed with XPENDING first, so entries this worker
+        still holds (buffered or waiting for a slot) are never claimed and
+        their delivery count is left alone. Reclaimed entries are queued
+        ahead of new work and carry their delivery count; entries delivered
+        more than ``max_deliveries`` times are treated as poison and
+        dead-lettered without processing (they do not count against
+        ``limit``).
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+
+        idle = await self._call(
+            lambda: self.redis.xpending_range(
+                stream,
+                self.group,
+                "-",
+                "+",
+                self.reclaim.count,
+                idle=self.reclaim.min_idle_ms,
+            )
+        )
+        deliveries: Dict[str, int] = {}
+        wanted: List[str] = []
+        for item in idle or []:
+            xid = item["message_id"]
+            xid = xid.decode() if isinstance(xid, bytes) else xid
+            if (stream, xid) in self.claimed:
+                continue
+            # XCLAIM counts as one more delivery.
+            deliveries[xid] = int(item["times_delivered"]) + 1
+            if deliveries[xid] > self.reclaim.max_deliveries or len(wanted) < limit:
+                wanted.append(xid)
+        if not wanted:
+            return 0
+
+        response = await self._call(
+            lambda: self.redis.xclaim(
+                stream, self.group, self.consumer, self.reclaim.min_idle_ms, wanted
+            )
+        )
+        entries = [
+            self._decode_entry(stream, xid, fields)
+            for xid, fields in response or []
+            if xid is not None and fields is not None
+        ]
+        reclaimed = 0
+        for entry in reversed(entries):
+            entry["deliveries"] = deliveries.get(entry["xid"], 1)
+            if entry["deliveries"] > self.reclaim.max_deliveries:
+                try:
+                    await self._drop_poison_entry(stream, entry)
+                except Exception as exc:
+                    # Left pending and owned here; the next pass retries it.
+                    print(
+                        f"[RedisBridge] ⚠️ Could not drop poison entry "
+                        f"{entry['xid']} on '{stream}': {exc}"
+                    )
+                continue
+            self.claimed.add((stream, entry["xid"]))
+            self.local_queue.push(entry, front=True)
+            reclaimed += 1
+
+        if reclaimed:
+            self._metrics_inc_counter(
+                "worker_reclaimed_entries_total",
+                stream,
+                label="stream",
+                amount=reclaimed,
+            )
+            print(f"[RedisBridge] ♻️ Reclaimed {reclaimed} entries on '{stream}'")
+        return reclaimed
+
+    async def _drop_poison_entry(self, stream: str, entry: Dict[str, Any]) -> None:
+        """Dead-letter an entry that keeps failing so it stops cycling."""
+        print(
+            f"[RedisBridge] ☠️ Dropping {entry['xid']} on '{stream}' after "
+            f"{entry['deliveries']} deliveries (job {entry['fields'].get('jobId')})"
+        )
+        await self.dead_letter(
+            entry,
+            "poison",
+            f"Exceeded {self.reclaim.max_deliveries} deliveries",
+        )
+        await self._call(lambda: self.redis.xack(stream, self.group, entry["xid"]))
+        self._metrics_inc_counter("worker_reclaim_poison_total", stream, label="stream")
+        job_id = entry["fields"].get("jobId")
+        if job_id:
+            await self.publish_status(job_id, JobStatus.failed)
+
+    # ------------------------------------------------------------------
+    # Retries & dead letters
+    # ------------------------------------------------------------------
+
+    async def schedule_retry(
+        self,
+        job_id: str,
+        graph: Any,
+        delay: float,
+        attempt: int,
+        stream: Optional[str] = None,
+    ) -> None:
+        """
+        Re-enqueue a job on its lane once ``delay`` seconds have passed.
+
+        The graph keeps the outputs of completed nodes, so a retry resumes
+        from the failed node instead of starting over. Without ``stream``
+        the job goes back to the base data stream.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        graph_str = graph if isinstance(graph, str) else json_dumps_safe(graph)
+        due = int((time.time() + delay) * 1000)
+        retry = {"jobId": job_id, "graph": graph_str, "attempt": attempt, "due": due}
+        if stream and stream != self.data_stream:
+            retry["stream"] = stream
+        member = json_dumps_safe(retry)
+        await self._call(lambda: self.redis.zadd(self.retry_key, {member: due}))
+        self._metrics_inc("worker_retry_scheduled_total")
+
+    async def _retry_loop(self) -> None:
+        """Move delayed retries that are due back onto the data stream."""
+        while True:
+            await asyncio.sleep(self.retry.interval_seconds)
+            if not self.available.is_set():
+                continue
+            try:
+                moved = await self._call(
+                    lambda: self.retry_script(
+                        keys=[self.retry_key, *self.managed_streams],
+                        args=[int(time.time() * 1000), 100],
+                    )
+                )
+                if moved:
+                    print(f"[RedisBridge] 🔁 Re-enqueued {moved} delayed retries")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"[RedisBridge] ⚠️ Retry scheduler error: {exc}")
+
+    async def dead_letter(
+        self,
+        entry: Dict[str, Any],
+        reason: str,
+        error: Any,
+        graph: Any = None,
+    ) -> None:
+        """
+        Record a failed entry on the dead-letter stream with its context.
+
+        ``graph`` overrides the entry payload, e.g. with the partially
+        executed graph holding per-node errors.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        fields = entry.get("fields") or {}
+        payload = fields.get("graph", "") if graph is None else graph
+        if not isinstance(payload, str):
+            payload = json_dumps_safe(payload)
+        record = {
+            "jobId": fields.get("jobId") or "",
+            "stream": entry.get("stream") or self.data_stream,
+            "xid": entry.get("xid") or "",
+            "reason": reason,
+            "error": error if isinstance(error, str) else json_dumps_safe(error),
+            "deliveries": str(entry.get("deliveries") or 1),
+            "failed": _current_timestamp_ms(),
+            "graph": payload,
+        }
+        # Nobody consumes this stream through a group, so a plain length cap
+        # is enough to bound it.
+        await self._call(
+            lambda: self.redis.xadd(
+                self.dead_letter_stream,
+                fields=record,
+                maxlen=self.retention.max_len or None,
+                approximate=True,
+            )
+        )
+        self._metrics_inc_counter("worker_dead_letter_total", reason, label="reason")
+        print(
+            f"[RedisBridge] 🪦 Dead-lettered {record['xid']} "
+            f"(job {record['jobId']}, {reason})"
+        )
+
+    # ------------------------------------------------------------------
+    # Stream retention
+    # ------------------------------------------------------------------
+
+    async def _trim_loop(self) -> None:
+        """Periodically trim acknowledged entries from the retained streams."""
+        while True:
+            await asyncio.sleep(self.retention.interval_seconds)
+            for stream in self.retained_streams:
+                try:
+                    await self.trim_stream(stream)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    print(f"[RedisBridge] ⚠️ Trim error on '{stream}': {exc}")
+
+    async def _safe_trim_floor(self, stream: str) -> Optional[Tuple[int, int]]:
+        """
+        Return the lowest stream ID that some consumer group still needs.
+
+        For every group this is its oldest pending entry or, when nothing is
+        pending, the entry right after its last delivered one. Streams
+        without groups have no safe floor and are never trimmed.
+        """
+        groups = await self._call(lambda: self.redis.xinfo_groups(stream))
+        floor: Optional[Tuple[int, int]] = None
+        for group in groups or []:
+            name = group["name"]
+            if group.get("pending"):
+                summary = await self._call(lambda: self.redis.xpending(stream, name))
+                candidate = _parse_stream_id(summary["min"])
+            else:
+                ms, seq = _parse_stream_id(group["last-delivered-id"])
+                candidate = (ms, seq + 1)
+            floor = candidate if floor is None else min(floor, candidate)
+        return floor
+
+    async def trim_stream(self, stream: str) -> int:
+        """
+        Apply the retention policy to ``stream`` without losing un-acked work.
+
+        Entries older than ``max_age_seconds`` are trimmed with an
+        approximate MINID capped at the safe floor, so pending and
+        undelivered entries always survive. The ``max_len`` cap is only
+        applied once every group has consumed and acknowledged the stream.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+
+        try:
+            info = await self._call(lambda: self.redis.xinfo_stream(stream))
+        except ResponseError:
+            # Stream not created yet; nothing to trim.
+            return 0
+        floor = await self._safe_trim_floor(stream)
+        trimmed = 0
+        if floor is not None:
+            minid = floor
+            if self.retention.max_age_seconds:
+                age_cutoff = (
+                    int((time.time() - self.retention.max_age_seconds) * 1000),
+                    0,
+                )
+                minid = min(age_cutoff, floor)
+            minid_str = f"{minid[0]}-{minid[1]}"
+            if self.retention.max_age_seconds:
+                trimmed += await self._call(
+                    lambda: self.redis.xtrim(stream, minid=minid_str, approximate=True)
+                )
+                self.trim_minid[stream] = minid_str
+            last_id = _parse_stream_id(info.get("last-generated-id") or "0-0")
+            if self.retention.max_len and floor > last_id:
+                trimmed += await self._call(
+                    lambda: self.redis.xtrim(
+                        stream, maxlen=self.retention.max_len, approximate=True
+                    )
+                )
+
+        length = await self._call(lambda: self.redis.xlen(stream))
+        self._metrics_set("worker_stream_length", stream, length)
+        try:
+            memory = await self._call(lambda: self.redis.memory_usage(stream))
+        except ResponseError:
+            memory = None
+        if memory is not None:
+            self._metrics_set("worker_stream_memory_bytes", stream, memory)
+        if trimmed:
+            self._metrics_inc_counter(
+                "worker_stream_trimmed_entries_total",
+                stream,
+                label="stream",
+                amount=trimmed,
+            )
+        return trimmed
 
     # ------------------------------------------------------------------
     # Job persistence helpers
@@ -168,7 +1223,25 @@ class RedisBridge:
             },
         )
         pipeline.expire(key, self.job_ttl)
-        await pipeline.execute()
+        await self._call(pipeline.execute)
+
+    async def set_node_state(
+        self, job_id: str, node_id: str, state: Dict[str, Any]
+    ) -> None:
+        """
+        Persist a single node's state as a delta next to the job hash.
+
+        Only the changed node is serialized and written, so the cost of a
+        node update does not grow with the graph; the executor rewrites the
+        full graph in the job hash at a bounded rate.
+        """
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        key = f"job:{job_id}:nodes"
+        pipeline = self.redis.pipeline()
+        pipeline.hset(key, node_id, json_dumps_safe(state))
+        pipeline.expire(key, self.job_ttl)
+        await self._call(pipeline.execute)
 
     async def enqueue_control_job(self, job_id: str, graph: Any) -> None:
         """Send a graph back to the control-plane stream."""
@@ -177,40 +1250,274 @@ class RedisBridge:
 
         graph_str = graph if isinstance(graph, str) else json_dumps_safe(graph)
         created = _current_timestamp_ms()
-        await self.redis.xadd(
-            self.control_stream,
-            fields={"jobId": job_id, "created": created, "graph": graph_str},
+        # Piggy-back the last safe MINID so the stream is also trimmed on write.
+        minid = self.trim_minid.get(self.control_stream)
+        await self._call(
+            lambda: self.redis.xadd(
+                self.control_stream,
+                fields={"jobId": job_id, "created": created, "graph": graph_str},
+                minid=minid,
+                approximate=True,
+            )
+        )
+
+    async def request_cancel(self, job_id: str, reason: str = "cancelled") -> None:
+        """Broadcast a cancel command for ``job_id`` to all workers."""
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        await self._call(
+            lambda: self.redis.xadd(
+                self.cancel_stream,
+                fields={
+                    "jobId": job_id,
+                    "reason": reason,
+                    "created": _current_timestamp_ms(),
+                },
+                maxlen=1000,
+                approximate=True,
+            )
         )
 
+    async def read_cancellations(
+        self, last_id: str, block: int
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Read cancel commands newer than ``last_id``.
+
+        Returns the id to resume from together with the decoded commands.
+        """
+        if not self.reader:
+            raise RuntimeError("Redis not connected")
+        entries = await self._call(
+            lambda: self.reader.xread({self.cancel_stream: last_id}, block=block)
+        )
+        commands: List[Dict[str, Any]] = []
+        for stream_name, messages in entries or []:
+            for xid, fields in messages:
+                command = self._decode_entry(stream_name, xid, fields)
+                commands.append(command)
+                last_id = command["xid"]
+        return last_id, commands
+
+    # ------------------------------------------------------------------
+    # Presence registry
+    # ------------------------------------------------------------------
+
+    async def publish_presence(self, state: Dict[str, Any], ttl: int) -> None:
+        """Refresh this worker's presence entry and drop expired members."""
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        now = int(time.time() * 1000)
+        mapping = {
+            key: value if isinstance(value, str) else json_dumps_safe(value)
+            for key, value in state.items()
+        }
+        mapping.update({"consumer": self.consumer, "heartbeat": str(now)})
+        pipeline = self.redis.pipeline()
+        pipeline.hset(self.presence_key, mapping=mapping)
+        pipeline.expire(self.presence_key, ttl)
+        pipeline.zadd(_PRESENCE_SET, {self.consumer: now})
+        pipeline.zremrangebyscore(_PRESENCE_SET, 0, now - ttl * 1000)
+        await self._call(pipeline.execute)
+
+    async def clear_presence(self) -> None:
+        """Remove this worker from the presence registry."""
+        if not self.redis:
+            raise RuntimeError("Redis not connected")
+        pipeline = self.redis.pipeline()
+        pipeline.delete(self.presence_key)
+        pipeline.zrem(_PRESENCE_SET, self.consumer)
+        await self._call(pipeline.execute)
+
     # ------------------------------------------------------------------
     # Pub/Sub helpers
     # ------------------------------------------------------------------
 
-    async def _publish(self, channel: str, payload: str) -> None:
-        """Publish a JSON payload to a channel."""
+    def _enqueue_publish(self, jobId: str, item: PendingPublish) -> None:
+        """
+        Buffer a message for ``jobId`` preserving per-job order.
+
+        Consecutive progress updates collapse into the most recent one per
+        node; status and data messages are always kept and never reordered.
+        """
         if not self.redis:
             raise RuntimeError("Redis not connected")
 
-        try:
-            await self.redis.publish(channel, payload)
-        except Exception as exc:
-            print(f"[RedisBridge] ⚠️ Publish error on '{channel}': {exc}")
+        buffer = self.publish_buffers.setdefault(jobId, [])
+        if item.kind == "progress" and self._coalesce_progress(buffer, item):
+            self._metrics_inc("worker_publish_coalesced_total")
+        else:
+            buffer.append(item)
+        self.publish_pending.set()
+        if item.kind == "status":
+            self.publish_urgent.set()
+
+    @staticmethod
+    def _coalesce_progress(
+        pending: Sequence[PendingPublish], item: PendingPublish
+    ) -> bool:
+        """
+        Fold a progress update into a pending one for the same node.
+
+        Only the trailing run of progress updates is searched, so nothing
+        moves across a status or data message. Absolute values replace the
+        pending one; steps accumulate onto it.
+        """
+        for queued in reversed(pending):
+            if queued.kind != "progress":
+                return False
+            if queued.node == item.node:
+                if item.stepping:
+                    queued.progress += item.progress
+                else:
+                    queued.progress, queued.stepping = item.progress, False
+                return True
+            if queued.node is None or item.node is None:
+                # Job-level values do not commute with node shares.
+                return False
+        return False
+
+    async def _publish_loop(self) -> None:
+        """Flush buffered messages once per window, or at once for status changes."""
+        while True:
+            await self.publish_pending.wait()
+            if not self.publish_urgent.is_set():
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self.publish_urgent.wait(), self.publish_window
+                    )
+            await self.flush_publishes()
+
+    async def flush_publishes(self) -> None:
+        """
+        Send every buffered message through one non-transactional pipeline.
+
+        Messages left over from a failed flush (the outbox) go first so the
+        per-job order is preserved when they are replayed.
+        """
+        async with self.publish_lock:
+            self.publish_pending.clear()
+            self.publish_urgent.clear()
+            if not self.redis or not (self.publish_buffers or self.outbox):
+                return
+
+            replay = list(self.outbox)
+            self.outbox.clear()
+            batch = [
+                (jobId, item)
+                for jobId, items in self.publish_buffers.items()
+                for item in items
+            ]
+            self.publish_buffers = {}
+            pipeline = self.redis.pipeline(transaction=False)
+            created = datetime.now(timezone.utc).isoformat()
+            for jobId, item in replay + batch:
+                if item.kind == "progress":
+                    # EVALSHA directly: queuing the Script object would make
+                    # every flush check the script cache (SCRIPT EXISTS) first.
+                    pipeline.evalsha(
+                        self.progress_script.sha,
+                        4,
+                        *self._progress_script_args(jobId, item, created),
+                    )
+                else:
+                    pipeline.publish(item.channel, item.message.model_dump_json())
+
+            try:
+                results = await self._call(
+                    lambda: pipeline.execute(raise_on_error=False)
+                )
+                # A Redis restart that went unnoticed empties the script
+                # cache; the Script call loads it on NOSCRIPT, after the rest
+                # of the batch went out.
+                for (jobId, item), result in zip(replay + batch, results):
+                    if isinstance(result, NoScriptError):
+                        args = self._progress_script_args(jobId, item, created)
+                        await self._call(
+                            lambda: self.progress_script(keys=args[:4], args=args[4:])
+                        )
+                    elif isinstance(result, Exception):
+                        print(f"[RedisBridge] ⚠️ Publish error ({jobId}): {result}")
+            except Exception as exc:
+                print(f"[RedisBridge] ⚠️ Publish flush error: {exc}")
+                self._stash_outbox(replay + batch)
+                return
+
+            self._metrics_inc("worker_publish_flushes_total")
+            for _, item in replay + batch:
+                self._metrics_inc_counter("worker_publish_messages_total", item.kind)
+
+    def _progress_script_args(
+        self, jobId: str, item: PendingPublish, created: str
+    ) -> List[Any]:
+        """Keys followed by arguments of the progress script for one update."""
+        return [
+            f"job:{jobId}:progress",
+            f"job:{jobId}:status",
+            f"job:{jobId}:state",
+            f"job:{jobId}:progress:nodes",
+            item.progress,
+            "1" if item.stepping else "0",
+            self.job_ttl,
+            item.channel,
+            jobId,
+            created,
+            item.node or "",
+        ]
+
+    def _stash_outbox(self, items: List[Tuple[str, PendingPublish]]) -> None:
+        """
+        Retain undelivered messages for replay after reconnect.
+
+        Progress is kept as well: steps are not repeated, and a node's final
+        share may be its last report. Only the latest progress per job and
+        node is retained. When the outbox is full the oldest progress update
+        is discarded first, then the oldest data message, then the oldest
+        status message, so status transitions survive the longest.
+        """
+        for jobId, item in items:
+            if item.kind == "progress" and self._coalesce_progress(
+                [queued for queued_job, queued in self.outbox if queued_job == jobId],
+                item,
+            ):
+                continue
+            self.outbox.append((jobId, item))
+        while len(self.outbox) > self.connection.outbox_size:
+            victim = next(
+                (entry for entry in self.outbox if entry[1].kind == "progress"),
+                None,
+            ) or next(
+                (entry for entry in self.outbox if entry[1].kind != "status"),
+                self.outbox[0],
+            )
+            self.outbox.remove(victim)
+            self._metrics_inc_counter(
+                "worker_publish_outbox_dropped_total", victim[1].kind
+            )
 
     async def publish_progress(
-        self, jobId: str, progress: float, stepping: bool = False
+        self,
+        jobId: str,
+        progress: float,
+        stepping: bool = False,
+        node: Optional[str] = None,
     ) -> None:
-        if not self.redis:
-            raise RuntimeError("Redis not connected")
+        """
+        Report job progress, either as an absolute value or as a step added
+        to the stored one. With ``node`` the value is that node's absolute
+        share of the job. Accumulation and clamping to [0, 1] happen
+        atomically in Redis when the buffer is flushed.
+        """
         channel = f"{self.channels.progress}:{jobId}"
-        updVal = progress
-        if stepping:
-            curVal = float(await self.redis.get(f"job:{jobId}:progress"))
-            updVal += curVal
-        await self._publish(
-            channel,
-            ProgressUpdate(
-                jobId=jobId, progress=updVal, created=datetime.now(timezone.utc)
-            ).model_dump_json(),
+        self._enqueue_publish(
+            jobId,
+            PendingPublish(
+                "progress",
+                channel,
+                progress=float(progress),
+                stepping=stepping and node is None,
+                node=node,
+            ),
         )
 
     async def publish_data(self, jobId: str, data: Any) -> None:
@@ -218,11 +1525,32 @@ class RedisBridge:
         pubPayload = DataUpdate(
             jobId=jobId, data=data, created=datetime.now(timezone.utc)
         )
-        await self._publish(channel, pubPayload.model_dump_json())
+        self._enqueue_publish(jobId, PendingPublish("data", channel, pubPayload))
 
     async def publish_status(self, jobId: str, status: Any) -> None:
         channel = f"{self.channels.status}:{jobId}"
         pubPayload = StatusUpdate(
             jobId=jobId, status=status, created=datetime.now(timezone.utc)
         )
-        await self._publish(channel, pubPayload.model_dump_json())
+        self._enqueue_publish(jobId, PendingPublish("status", channel, pubPayload))
+
+    # ------------------------------------------------------------------
+    # Metrics helpers
+    # ------------------------------------------------------------------
+
+    def _metrics_inc(self, name: str) -> None:
+        metric = self.metrics.get(name)
+        if metric:
+            metric.inc()
+
+    def _metrics_inc_counter(
+        self, name: str, value: str, label: str = "kind", amount: float = 1
+    ) -> None:
+        metric = self.metrics.get(name)
+        if metric:
+            metric.labels(**{label: value}).inc(amount)
+
+    def _metrics_set(self, name: str, stream: str, value: float) -> None:
+        metric = self.metrics.get(name)
+        if metric:
+            metric.labels(stream=stream).set(value)
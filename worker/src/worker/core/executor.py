@@ -1,24 +1,63 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
-from enum import Enum
+import time
 from contextlib import suppress
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional
-
-from pydantic import ValidationError
+from collections import ChainMap, OrderedDict, deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pydantic import TypeAdapter, ValidationError
 
 from .bridge import RedisBridge
 from ..models.jobs.job_messaging_schema import JobStatus
 from ..models.langgraph.graph_schema import LanggraphWorkflow, NodeStatus, Plane
-from ..services.tasks import WorkerTask
+from ..models.worker.config_schema import CheckpointConfig
+from ..services.checkpoints import clear_job, node_scope
+from ..services.registry import TaskRegistry
 from ..infra.metrics import MetricType, get_or_create_metric
+from ..utils.misc import json_dumps_safe
+from .resilience import backoff_delay
+from .scheduler import GraphPlan
+from ..utils.cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    cancellation_scope,
+)
+
+# Node fields updated by the worker; everything else is fixed at submission.
+_NODE_STATE_FIELDS = ("status", "output", "error", "retries")
+
+# Resource classes from heaviest to lightest; a job takes a slot in the
+# heaviest class any of its remaining nodes needs.
+_CLASS_WEIGHT = ("gpu", "cpu", "io")
+_DEFAULT_CLASS = "cpu"
+_LIGHTEST_CLASS = "io"
+
+# Graphs are validated straight from the stream payload; the parsed model is
+# discarded and execution runs on the plain JSON structure.
+_GRAPH_ADAPTER = TypeAdapter(LanggraphWorkflow)
+# Digests of payloads known to be valid (validated here or written by us).
+_VALIDATED_CACHE_SIZE = 1024
 
 
 @dataclass(slots=True)
 class ExecutorResult:
     job_id: str
+    stream: str
     entry_id: str
     graph: Dict[str, Any]
     status: str
@@ -27,8 +66,9 @@ class ExecutorResult:
 class ExecutorJobError(Exception):
     """Raised when a job cannot be processed (invalid payload, missing fields, etc.)."""
 
-    def __init__(self, message: str, entry_id: str, job_id: Optional[str]):
+    def __init__(self, message: str, stream: str, entry_id: str, job_id: Optional[str]):
         super().__init__(message)
+        self.stream = stream
         self.entry_id = entry_id
         self.job_id = job_id
 
@@ -44,17 +84,64 @@ class Executor:
     def __init__(
         self,
         bridge: RedisBridge,
-        task_registry: Mapping[str, WorkerTask],
+        task_registry: TaskRegistry,
         *,
         batch_size: int = 1,
-        poll_interval: float = 0.5,
-        block_ms: int = 200,
+        block_ms: int = 5000,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30.0,
+        max_attempts: int = 3,
+        retry_backoff_initial: float = 10.0,
+        retry_backoff_max: float = 600.0,
+        concurrency: Optional[Mapping[str, int]] = None,
+        slots: Optional[Mapping[str, int]] = None,
+        service_classes: Optional[Mapping[str, str]] = None,
+        max_waiting: int = 1,
+        graph_sync_seconds: float = 2.0,
+        timeouts: Optional[Mapping[str, float]] = None,
+        warm_models: Optional[Callable[[], Sequence[str]]] = None,
+        checkpoints: Optional[CheckpointConfig] = None,
     ):
         self.bridge = bridge
         self.task_registry = task_registry
         self.batch_size = batch_size
-        self.poll_interval = poll_interval
         self.block_ms = block_ms
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.backoff_attempt = 0
+        self.max_attempts = max_attempts
+        self.retry_backoff_initial = retry_backoff_initial
+        self.retry_backoff_max = retry_backoff_max
+        # Per-service invocation limits (capabilities runtime.concurrency).
+        self.concurrency = dict(concurrency or {})
+        self.task_limits: Dict[str, asyncio.Semaphore] = {}
+        # Job slots per resource class and the class each service runs in.
+        self.slots = dict(slots or {_DEFAULT_CLASS: 1})
+        self.slot_usage: Dict[str, int] = {kind: 0 for kind in self.slots}
+        self.service_classes = dict(service_classes or {})
+        self.max_waiting = max_waiting
+        self.waiting: Deque[Tuple[Dict[str, Any], str]] = deque()
+        self.running: Set[asyncio.Task] = set()
+        self.slot_freed = asyncio.Event()
+        # Per-service node deadlines (capabilities runtime.timeoutSeconds),
+        # cancellation tokens of running jobs and recently cancelled job ids.
+        self.timeouts = {
+            service: timeout
+            for service, timeout in (timeouts or {}).items()
+            if timeout and timeout > 0
+        }
+        self.job_tokens: Dict[str, CancellationToken] = {}
+        # Pending and last full-graph writes of running jobs, by job id.
+        self.graph_sync_seconds = graph_sync_seconds
+        self.graph_syncs: Dict[str, asyncio.Task] = {}
+        self.graph_synced: Dict[str, float] = {}
+        # Services whose models are resident; their streams are claimed first.
+        self.warm_models = warm_models or (lambda: ())
+        self.cancelled_jobs: Deque[str] = deque(maxlen=1000)
+        # Node checkpoints, dropped once a job can no longer be retried.
+        self.checkpoints = checkpoints
+        self.cancel_listener: Optional[asyncio.Task] = None
+        self.validated_graphs: OrderedDict[str, None] = OrderedDict()
         self.metrics = {
             "worker_active_tasks": get_or_create_metric(
                 "worker_active_tasks",
@@ -79,9 +166,32 @@ class Executor:
                 MetricType.COUNTER,
                 "Number of polling loop iterations",
             ),
+            "worker_job_pickup_latency_seconds": get_or_create_metric(
+                "worker_job_pickup_latency_seconds",
+                MetricType.HISTOGRAM,
+                "Delay between a stream entry being created and the worker starting it",
+                buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float("inf")),
+            ),
+            "worker_poll_errors_total": get_or_create_metric(
+                "worker_poll_errors_total",
+                MetricType.COUNTER,
+                "Number of failed stream reads",
+            ),
+            "worker_graph_validations_total": get_or_create_metric(
+                "worker_graph_validations_total",
+                MetricType.COUNTER,
+                "Graph payload validations, by cache outcome (hit/miss)",
+                labelnames=["type"],
+            ),
         }
+        # Jobs currently being executed, by job id (entry id as value).
+        self.active_jobs: Dict[str, str] = {}
         self.stop_event = asyncio.Event()
         self.runner: Optional[asyncio.Task] = None
+        # Drain: claiming stops and in-flight jobs get until the deadline.
+        self.drainer: Optional[asyncio.Task] = None
+        self.drain_started: Optional[float] = None
+        self.drain_deadline: Optional[float] = None
         self.handler_arity: Dict[str, int] = {}
 
     # ------------------------------------------------------------------
@@ -93,15 +203,158 @@ class Executor:
             return
         self.stop_event.clear()
         self.runner = asyncio.create_task(self._run_loop(), name="executor-loop")
+        self.cancel_listener = asyncio.create_task(
+            self._cancel_loop(), name="executor-cancel-listener"
+        )
 
     async def stop(self) -> None:
-        if not self.runner:
-            return
+        """Stop immediately; in-flight jobs are interrupted (see ``drain``)."""
+        await self.drain(0)
+        if self.cancel_listener:
+            self.cancel_listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.cancel_listener
+            self.cancel_listener = None
+
+    def begin_drain(self, timeout: float) -> asyncio.Task:
+        """Start draining (idempotent) and return the task tracking it."""
+        if not self.drainer:
+            self.drainer = asyncio.create_task(
+                self._drain(timeout), name="executor-drain"
+            )
+        return self.drainer
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop claiming work and let in-flight jobs finish within ``timeout``.
+
+        Returns ``True`` if every job finished. Jobs still running at the
+        deadline are interrupted and left pending, so another worker
+        reclaims them.
+        """
+        return await asyncio.shield(self.begin_drain(timeout))
+
+    async def _drain(self, timeout: float) -> bool:
+        self.drain_started = time.time()
+        self.drain_deadline = self.drain_started + timeout
         self.stop_event.set()
-        self.runner.cancel()
-        with suppress(asyncio.CancelledError):
-            await self.runner
-        self.runner = None
+        if self.runner:
+            self.runner.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.runner
+            self.runner = None
+        # Buffered and waiting entries were never started; give them back.
+        released = self.bridge.stop_claiming()
+        while self.waiting:
+            job, _ = self.waiting.popleft()
+            self.bridge.release_job(job["stream"], job["xid"])
+            released += 1
+        print(
+            f"[Executor] 🚰 Draining {len(self.running)} job(s) "
+            f"(deadline {timeout:g}s, released {released})"
+        )
+
+        pending: Set[asyncio.Task] = set()
+        if self.running:
+            _, pending = await asyncio.wait(set(self.running), timeout=timeout)
+        if pending:
+            print(
+                f"[Executor] ⚠️ Drain deadline reached; interrupting "
+                f"{len(pending)} job(s), their entries stay pending."
+            )
+            for task in pending:
+                task.cancel()
+            # Threads cannot be interrupted; make them stop at a checkpoint.
+            for token in self.job_tokens.values():
+                token.cancel("shutdown")
+            await asyncio.gather(*pending, return_exceptions=True)
+        print("[Executor] ✅ Drain complete.")
+        return not pending
+
+    def drain_state(self) -> Dict[str, Any]:
+        """Drain progress reported by the health endpoint."""
+        if not self.drainer:
+            return {"state": "running", "in_flight": len(self.active_jobs)}
+        return {
+            "state": "drained" if self.drainer.done() else "draining",
+            "in_flight": len(self.active_jobs),
+            "in_flight_jobs": list(self.active_jobs),
+            "elapsed_seconds": round(time.time() - (self.drain_started or 0), 1),
+            "remaining_seconds": round(
+                max(0.0, (self.drain_deadline or 0) - time.time()), 1
+            ),
+        }
+
+    def presence_state(self) -> Dict[str, Any]:
+        """Load snapshot advertised through the presence registry."""
+        return {
+            "slots": sum(self.slots.values()),
+            "free_slots": self._free_slots(),
+            "slot_usage": dict(self.slot_usage),
+            "active_jobs": list(self.active_jobs),
+            "draining": self.drainer is not None,
+        }
+
+    # ------------------------------------------------------------------
+    # Slot admission
+    # ------------------------------------------------------------------
+
+    def _job_class(self, job: Dict[str, Any]) -> str:
+        """
+        Resource class a job needs a slot in: the heaviest class among its
+        python-plane nodes that still have to run.
+        """
+        payload = job["fields"].get("graph")
+        try:
+            graph = json.loads(payload) if isinstance(payload, str) else payload
+            nodes = graph.get("nodes") or []
+        except (TypeError, ValueError, AttributeError):
+            # Unparsable payloads fail fast in _process_job.
+            return _LIGHTEST_CLASS
+        job["graph"] = graph
+        classes = {
+            self.service_classes.get(node.get("service"), _DEFAULT_CLASS)
+            for node in nodes
+            if node.get("plane") == Plane.python.value
+            and node.get("status") != NodeStatus.completed.value
+        }
+        for kind in _CLASS_WEIGHT:
+            if kind in classes:
+                return kind
+        return next(iter(classes), _LIGHTEST_CLASS)
+
+    def _has_free_slot(self, kind: str) -> bool:
+        return self.slot_usage.get(kind, 0) < self.slots.get(kind, 1)
+
+    def _free_slots(self) -> int:
+        return sum(
+            max(0, size - self.slot_usage.get(kind, 0))
+            for kind, size in self.slots.items()
+        )
+
+    def _can_claim(self) -> bool:
+        """Claim while a slot of any class is free."""
+        return any(self._has_free_slot(kind) for kind in self.slots)
+
+    def _waiting_count(self, kind: str) -> int:
+        return sum(1 for _, waiting_kind in self.waiting if waiting_kind == kind)
+
+    def _admit_waiting(self) -> None:
+        for _ in range(len(self.waiting)):
+            job, kind = self.waiting.popleft()
+            if self._has_free_slot(kind):
+                self._start_job(job, kind)
+            else:
+                self.waiting.append((job, kind))
+
+    def _start_job(self, job: Dict[str, Any], kind: str) -> None:
+        self._observe_pickup_latency(job)
+        self.slot_usage[kind] = self.slot_usage.get(kind, 0) + 1
+        task = asyncio.create_task(
+            self._run_job(job, kind), name=f"executor-job-{job['xid']}"
+        )
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
 
     # ------------------------------------------------------------------
     # Main polling loop
@@ -116,72 +369,157 @@ class Executor:
             if loop_metric:
                 loop_metric.inc()
 
-            job = await self.bridge.poll_job(timeout=self.block_ms)
-            if job is None:
-                await asyncio.sleep(self.poll_interval)
+            self.slot_freed.clear()
+            self._admit_waiting()
+            if not self._can_claim():
+                await self.slot_freed.wait()
                 continue
 
+            # Block until work arrives; an empty result only means the block
+            # window elapsed, so poll again straight away. Claim no more than
+            # can start, so entries do not sit owned here while other workers
+            # are free.
             try:
-                result = await self._process_job(job)
-                status = result.status
-
-                if status == "completed":
-                    await self.bridge.ack_job(result.entry_id)
-                    await self.bridge.publish_status(result.job_id, JobStatus.completed)
-                elif status == "handoff":
-                    await self.bridge.ack_job(result.entry_id)
-                    await self.bridge.enqueue_control_job(
-                        result.job_id, self._serialize_graph(result.graph)
-                    )
-                elif status == "failed":
-                    await self.bridge.ack_job(result.entry_id)
-                    await self.bridge.publish_status(result.job_id, JobStatus.failed)
-                else:
-                    print(
-                        f"[Executor] ⚠️ Unknown execution status '{status}' "
-                        f"for job {result.job_id}; leaving entry pending."
-                    )
-            except ExecutorJobError as exc:
-                await self.bridge.ack_job(exc.entry_id)
-                if exc.job_id:
-                    await self.bridge.publish_status(result.job_id, JobStatus.failed)
-                print(f"[Executor] ❌ Job error ({exc.job_id}): {exc}")
+                job = await self.bridge.poll_job(
+                    timeout=self.block_ms,
+                    count=min(self.batch_size, self._free_slots()),
+                    warm=self.warm_models(),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._metrics_inc("worker_poll_errors_total")
+                await self._backoff()
+                continue
+            self.backoff_attempt = 0
+
+            if job is None:
+                continue
+
+            if job["fields"].get("jobId") in self.cancelled_jobs:
+                await self._finish_cancelled(job)
+                continue
+            kind = self._job_class(job)
+            if self._has_free_slot(kind):
+                self._start_job(job, kind)
+            elif self._waiting_count(kind) < self.max_waiting:
+                self.waiting.append((job, kind))
+            else:
+                await self._requeue(job, kind)
 
         print("[Executor] 💤 Executor loop stopped.")
 
+    async def _requeue(self, job: Dict[str, Any], kind: str) -> None:
+        """
+        Hand back a job whose class has no slot and no room to wait.
+
+        Other classes keep claiming; the short pause keeps a stream full of
+        jobs for the busy class from being cycled through in a tight loop.
+        """
+        try:
+            await self.bridge.requeue_job(job)
+        except Exception as exc:
+            self.bridge.release_job(job["stream"], job["xid"])
+            print(f"[Executor] ⚠️ Failed to requeue {job['xid']}: {exc}")
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.slot_freed.wait(), self.backoff_initial)
+
+    async def _run_job(self, job: Dict[str, Any], kind: str) -> None:
+        job_id = job["fields"].get("jobId") or job["xid"]
+        self.active_jobs[job_id] = job["xid"]
+        self.job_tokens[job_id] = CancellationToken()
+
+        try:
+            # Waiting entries are not kept claimed and may have moved on.
+            if not await self.bridge.start_job(job["stream"], job["xid"]):
+                return
+            result = await self._process_job(job)
+            status = result.status
+
+            if status == "completed":
+                await self.bridge.ack_job(result.stream, result.entry_id)
+                await self.bridge.publish_status(result.job_id, JobStatus.completed)
+            elif status == "handoff":
+                await self.bridge.enqueue_control_job(
+                    result.job_id, self._serialize_graph(result.graph)
+                )
+                await self.bridge.ack_job(result.stream, result.entry_id)
+            elif status == "retry":
+                await self._schedule_retry(result)
+                await self.bridge.ack_job(result.stream, result.entry_id)
+            elif status == "cancelled":
+                await self.bridge.ack_job(result.stream, result.entry_id)
+                await self.bridge.publish_status(result.job_id, JobStatus.failed)
+                await self._clear_checkpoints(result.job_id)
+                print(f"[Executor] 🛑 Job {result.job_id} cancelled.")
+            elif status == "failed":
+                if await self._dead_letter(
+                    job,
+                    self._failure_reason(result.graph),
+                    self._failure_context(result.graph),
+                    self._serialize_graph(result.graph),
+                ):
+                    await self.bridge.ack_job(result.stream, result.entry_id)
+                    await self.bridge.publish_status(result.job_id, JobStatus.failed)
+                    await self._clear_checkpoints(result.job_id)
+            else:
+                self.bridge.release_job(result.stream, result.entry_id)
+                print(
+                    f"[Executor] ⚠️ Unknown execution status '{status}' "
+                    f"for job {result.job_id}; leaving entry pending."
+                )
+        except ExecutorJobError as exc:
+            # Malformed or invalid payloads never succeed on a retry.
+            if await self._dead_letter(job, "invalid", str(exc)):
+                await self.bridge.ack_job(exc.stream, exc.entry_id)
+                if exc.job_id:
+                    await self.bridge.publish_status(exc.job_id, JobStatus.failed)
+                    await self._clear_checkpoints(exc.job_id)
+            print(f"[Executor] ❌ Job error ({exc.job_id}): {exc}")
+        except Exception as exc:
+            # Typically Redis went away mid-job: leave the entry pending so
+            # it is reclaimed once connectivity (or another worker) is back.
+            self.bridge.release_job(job["stream"], job["xid"])
+            print(
+                f"[Executor] ⚠️ Job {job['fields'].get('jobId')} interrupted; "
+                f"entry {job['xid']} left pending: {exc}"
+            )
+        finally:
+            self._cancel_graph_sync(job_id)
+            self.active_jobs.pop(job_id, None)
+            self.job_tokens.pop(job_id, None)
+            self.slot_usage[kind] -= 1
+            self.slot_freed.set()
+
     # ------------------------------------------------------------------
     # Job processing
     # ------------------------------------------------------------------
 
     async def _process_job(self, entry: Dict[str, Any]) -> ExecutorResult:
+        stream = entry["stream"]
         entry_id = entry["xid"]
         fields = entry["fields"]
         job_id = fields.get("jobId")
-        payload = fields.get("graph")
+        payload = entry.get("graph") or fields.get("graph")
 
         if not job_id or not payload:
-            raise ExecutorJobError("Missing jobId or payload", entry_id, job_id)
-
-        if isinstance(payload, str):
-            try:
-                raw_graph = json.loads(payload)
-            except json.JSONDecodeError as exc:
-                raise ExecutorJobError(
-                    f"Invalid graph payload: {exc}", entry_id, job_id
-                ) from exc
-        else:
-            raw_graph = payload
+            raise ExecutorJobError("Missing jobId or payload", stream, entry_id, job_id)
 
         try:
-            workflow = LanggraphWorkflow.model_validate(raw_graph)
+            graph = self._load_graph(fields.get("graph") or payload, entry.get("graph"))
         except ValidationError as exc:
-            raise ExecutorJobError(f"Graph validation failed: {exc}", entry_id, job_id)
-
-        graph = workflow.model_dump(mode="python", by_alias=True)
+            raise ExecutorJobError(
+                f"Graph validation failed: {exc}", stream, entry_id, job_id
+            )
+        except (TypeError, ValueError) as exc:
+            raise ExecutorJobError(
+                f"Invalid graph payload: {exc}", stream, entry_id, job_id
+            ) from exc
 
         if graph["workflowId"] != job_id:
             raise ExecutorJobError(
                 f"Invalid job: graph workflow id ({graph["workflowId"]}) does not match job id ({job_id}).",
+                stream,
                 entry_id,
                 job_id,
             )
@@ -190,117 +528,404 @@ class Executor:
 
         try:
             status = await self.execute_graph(graph)
+            # Node states were persisted as deltas while running; write the
+            # full graph once more so readers of the job hash see the result.
+            self._cancel_graph_sync(job_id)
             await self.bridge.set_job_payload(job_id, self._serialize_graph(graph))
         except RuntimeError as err:
-            raise ExecutorJobError(f"Failed to process graph: {err}", entry_id, job_id)
+            raise ExecutorJobError(
+                f"Failed to process graph: {err}", stream, entry_id, job_id
+            )
 
-        return ExecutorResult(job_id, entry_id, graph, status)
+        return ExecutorResult(job_id, stream, entry_id, graph, status)
+
+    def _load_graph(
+        self, payload: Any, parsed: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Validate a graph payload and return it as plain JSON data.
+
+        Payloads are validated from their raw text, once per content digest;
+        redeliveries, reclaims and retries written by this worker skip
+        validation. The returned structure keeps enum fields as their string
+        values, so it serializes back without a conversion pass.
+        """
+        if not isinstance(payload, (str, bytes)):
+            payload = json.dumps(payload)
+        if parsed is None:
+            parsed = json.loads(payload)
+        digest = self._graph_digest(payload)
+        if digest in self.validated_graphs:
+            self.validated_graphs.move_to_end(digest)
+            self._metrics_inc_counter("worker_graph_validations_total", "hit")
+        else:
+            _GRAPH_ADAPTER.validate_json(payload)
+            self._remember_valid(digest)
+            self._metrics_inc_counter("worker_graph_validations_total", "miss")
+        return parsed
+
+    @staticmethod
+    def _graph_digest(payload: str | bytes) -> str:
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _remember_valid(self, digest: str) -> None:
+        self.validated_graphs[digest] = None
+        self.validated_graphs.move_to_end(digest)
+        while len(self.validated_graphs) > _VALIDATED_CACHE_SIZE:
+            self.validated_graphs.popitem(last=False)
 
     async def execute_graph(self, graph: Dict[str, Any]) -> str:
-        ready_nodes = self._get_ready_nodes(graph)
+        plan = GraphPlan(graph)
+        running: Dict[asyncio.Task, Dict[str, Any]] = {}
+        token = self.job_tokens.get(graph["workflowId"])
 
-        while ready_nodes:
-            for node in ready_nodes:
-                await self._execute_node(graph, node)
-            ready_nodes = self._get_ready_nodes(graph)
+        try:
+            while True:
+                if token and token.cancelled:
+                    # Let running nodes wind down, but start nothing new.
+                    plan.pop_ready()
+                # Ready nodes have no pending dependencies on each other, so
+                # they run concurrently within their service's limit; each
+                # completion immediately releases its own dependents.
+                for node in plan.pop_ready():
+                    node["input"] = plan.inputs(node)
+                    task = asyncio.create_task(self._execute_node_limited(graph, node))
+                    running[task] = node
+                if not running:
+                    break
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node = running.pop(task)
+                    task.result()
+                    if node.get("status") == NodeStatus.completed.value:
+                        plan.complete(node)
+        finally:
+            for task in running:
+                task.cancel()
+
+        if token and token.cancelled:
+            return "cancelled"
 
         is_graph_completed = all(
-            node.get("status") == NodeStatus.completed
+            node.get("status") == NodeStatus.completed.value
             for node in graph.get("nodes", [])
         )
 
         is_graph_failed = any(
-            node.get("status") == NodeStatus.failed for node in graph.get("nodes", [])
+            node.get("status") == NodeStatus.failed.value
+            for node in graph.get("nodes", [])
         )
 
         if is_graph_failed:
+            failed_nodes = [
+                node
+                for node in graph.get("nodes", [])
+                if node.get("status") == NodeStatus.failed.value
+            ]
+            if all(self._can_retry(node) for node in failed_nodes):
+                return "retry"
             return "failed"
         elif is_graph_completed:
             return "handoff"
 
         return "handoff"
 
+    async def _execute_node_limited(
+        self, graph: Dict[str, Any], node: Dict[str, Any]
+    ) -> None:
+        service = node.get("service", "")
+        limit = self.task_limits.get(service)
+        if limit is None:
+            limit = asyncio.Semaphore(max(1, int(self.concurrency.get(service, 1))))
+            self.task_limits[service] = limit
+        async with limit:
+            await self._execute_node(graph, node)
+
     async def _execute_node(self, graph: Dict[str, Any], node: Dict[str, Any]) -> None:
         task_name: str = node.get("service", "")
-        handler = self.task_registry.get(task_name)
-        node["status"] = NodeStatus.running
+        node["status"] = NodeStatus.running.value
         self._metrics_inc("worker_active_tasks")
         self._metrics_inc_counter("worker_jobs_total", task_name)
         timer = self._metrics_timer("worker_job_duration_seconds", task_name)
         job_id = graph["workflowId"]
+        retries = node.get("retries") or {}
+        node["retries"] = {
+            "attempt": (retries.get("attempt") or 0) + 1,
+            "maxAttempts": retries.get("maxAttempts") or self.max_attempts,
+        }
+        job_token = self.job_tokens.get(job_id)
+        token = job_token.child() if job_token else CancellationToken()
+        timeout = self.timeouts.get(task_name)
+        # Only this deadline expiring is a node timeout; a TimeoutError raised
+        # by the handler itself is an ordinary task error.
+        deadline = asyncio.timeout(timeout or None)
+        handler = None
         try:
+            # Handlers are imported on first lookup; an unknown service or a
+            # handler that fails to import fails the node as missing_handler.
+            handler = await self.task_registry.load(task_name)
             if not handler:
                 raise RuntimeError(f"No handler registered for task '{task_name}'")
-            node["output"] = await handler(
-                {
-                    **(node.get("params") or {}),
-                    "progress_weight": node.get("progressWeight") or 0,
-                    "publish_progress_cb": lambda step: self.bridge.publish_progress(
-                        job_id, step, False
-                    ),
-                    "publish_data_cb": lambda data: self.bridge.publish_data(
-                        job_id, data
-                    ),
-                },
-                {**(node.get("input") or {})},
-            )
-            node["status"] = NodeStatus.completed
+            with cancellation_scope(token), node_scope(job_id, node["id"]):
+                invocation = handler(
+                    {
+                        **(node.get("params") or {}),
+                        "progress_weight": node.get("progressWeight") or 0,
+                        "publish_progress_cb": lambda share: self.bridge.publish_progress(
+                            job_id, share, node=node["id"]
+                        ),
+                        "publish_data_cb": lambda data: self.bridge.publish_data(
+                            job_id, data
+                        ),
+                        "cancel_token": token,
+                    },
+                    # Writable layer over the merged inputs; upstream outputs
+                    # stay untouched.
+                    ChainMap({}, node.get("input") or {}),
+                )
+                async with deadline:
+                    node["output"] = await invocation
+            node["status"] = NodeStatus.completed.value
+            node["error"] = None
         except Exception as exc:
-            node["status"] = NodeStatus.failed
-            node["error"] = {"message": str(exc)}
-            print(f"[Executor] ❌ Node {task_name} failed for job {job_id}: {exc}")
+            node["status"] = NodeStatus.failed.value
+            if isinstance(exc, TimeoutError) and deadline.expired():
+                # The awaiting side is gone; make threaded work stop at its
+                # next checkpoint instead of holding the GPU until it finishes.
+                token.cancel("timeout")
+                node["error"] = {
+                    "message": f"Node exceeded its {timeout}s timeout",
+                    "code": "timeout",
+                }
+                print(f"[Executor] ⏱️ Node {task_name} timed out for job {job_id}")
+            else:
+                if isinstance(exc, OperationCancelled) or token.cancelled:
+                    code = token.cancel_reason() or "cancelled"
+                else:
+                    code = "task_error" if handler else "missing_handler"
+                node["error"] = {"message": str(exc), "code": code}
+                print(f"[Executor] ❌ Node {task_name} failed for job {job_id}: {exc}")
         finally:
             if timer:
                 timer.__exit__(None, None, None)
             self._metrics_dec("worker_active_tasks")
+            await self.bridge.set_node_state(
+                job_id, node["id"], self._serialize_node_state(node)
+            )
+            self._schedule_graph_sync(graph)
+
+    def _schedule_graph_sync(self, graph: Dict[str, Any]) -> None:
+        """
+        Rewrite the job hash with the full graph, at most once per
+        ``graph_sync_seconds``, so its readers follow node states during a
+        run while a node update itself stays a single-node delta.
+        """
+        job_id = graph["workflowId"]
+        if job_id in self.graph_syncs:
+            return
+        delay = (
+            self.graph_synced.get(job_id, 0.0)
+            + self.graph_sync_seconds
+            - time.monotonic()
+        )
+        self.graph_syncs[job_id] = asyncio.create_task(
+            self._sync_graph(graph, max(delay, 0.0)),
+            name=f"executor-graph-sync-{job_id}",
+        )
+
+    async def _sync_graph(self, graph: Dict[str, Any], delay: float) -> None:
+        job_id = graph["workflowId"]
+        await asyncio.sleep(delay)
+        # Updates from here on schedule the next write.
+        self.graph_syncs.pop(job_id, None)
+        self.graph_synced[job_id] = time.monotonic()
+        try:
             await self.bridge.set_job_payload(job_id, self._serialize_graph(graph))
+        except Exception as exc:
+            print(f"[Executor] ⚠️ Failed to persist graph of job {job_id}: {exc}")
+
+    def _cancel_graph_sync(self, job_id: str) -> None:
+        sync = self.graph_syncs.pop(job_id, None)
+        if sync:
+            sync.cancel()
+        self.graph_synced.pop(job_id, None)
 
     # ------------------------------------------------------------------
-    # Helpers
+    # Cancellation
     # ------------------------------------------------------------------
 
-    def _get_ready_nodes(self, graph: Dict[str, Any]) -> List[Dict[str, Any]]:
-        nodes = graph.get("nodes", [])
-        nodes_by_id = {node["id"]: node for node in nodes if "id" in node}
-        incoming: Dict[str, List[str]] = {}
-        for edge in graph.get("edges", []):
-            src = edge.get("from") or edge.get("from_")
-            dst = edge.get("to")
-            if not src or not dst:
+    async def _cancel_loop(self) -> None:
+        """Follow cancel commands broadcast to every worker."""
+        last_id = f"{int(time.time() * 1000)}-0"
+        while True:
+            try:
+                last_id, commands = await self.bridge.read_cancellations(
+                    last_id, self.block_ms
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(self.backoff_initial)
                 continue
-            incoming.setdefault(dst, []).append(src)
+            for command in commands:
+                job_id = command["fields"].get("jobId")
+                if job_id:
+                    await self.cancel_job(
+                        job_id, command["fields"].get("reason") or "cancelled"
+                    )
 
-        ready_nodes = []
-        for node in nodes:
-            if node.get("plane") != Plane.python:
-                continue
-            if node.get("status") in {
-                NodeStatus.completed,
-                NodeStatus.running,
-                NodeStatus.failed,
-                NodeStatus.skipped,
-            }:
-                continue
-            deps = incoming.get(node.get("id"), [])
-            if all(
-                nodes_by_id.get(dep, {}).get("status") == NodeStatus.completed
-                for dep in deps
-            ):
-                ready_nodes.append(node)
-
-        for node in ready_nodes:
-            for depId in incoming.get(node.get("id"), []):
-                node["input"] = {
-                    **(node.get("input") or {}),
-                    **(nodes_by_id[depId].get("output") or {}),
-                }
+    async def cancel_job(self, job_id: str, reason: str = "cancelled") -> bool:
+        """
+        Cancel a job running or waiting on this worker.
+
+        Running nodes stop at their next cancellation checkpoint; a job that
+        is only claimed (or claimed later) is dropped without being run.
+        Returns ``True`` when the job was found on this worker.
+        """
+        if job_id not in self.cancelled_jobs:
+            self.cancelled_jobs.append(job_id)
+        token = self.job_tokens.get(job_id)
+        if token:
+            token.cancel(reason)
+            print(f"[Executor] 🛑 Cancelling job {job_id} ({reason})")
+            return True
+        for job, kind in list(self.waiting):
+            if job["fields"].get("jobId") == job_id:
+                self.waiting.remove((job, kind))
+                await self._finish_cancelled(job)
+                self.slot_freed.set()
+                return True
+        return False
+
+    async def _finish_cancelled(self, job: Dict[str, Any]) -> None:
+        job_id = job["fields"].get("jobId")
+        try:
+            await self.bridge.ack_job(job["stream"], job["xid"])
+            if job_id:
+                await self.bridge.publish_status(job_id, JobStatus.failed)
+                await self._clear_checkpoints(job_id)
+        except Exception as exc:
+            print(f"[Executor] ⚠️ Failed to drop cancelled job {job_id}: {exc}")
+        print(f"[Executor] 🛑 Dropped cancelled job {job_id} before it started.")
 
-        return ready_nodes
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _can_retry(self, node: Dict[str, Any]) -> bool:
+        """Whether a failed node is transient and still has attempts left."""
+        error = node.get("error") or {}
+        retries = node.get("retries") or {}
+        return error.get("code") == "task_error" and (retries.get("attempt") or 0) < (
+            retries.get("maxAttempts") or self.max_attempts
+        )
+
+    async def _schedule_retry(self, result: ExecutorResult) -> None:
+        """Reset retryable nodes and re-enqueue the graph after a back-off."""
+        attempt = 1
+        for node in result.graph.get("nodes", []):
+            if node.get("status") == NodeStatus.failed.value:
+                node["status"] = NodeStatus.pending.value
+                attempt = max(attempt, node["retries"]["attempt"])
+        delay = backoff_delay(
+            attempt - 1, self.retry_backoff_initial, self.retry_backoff_max
+        )
+        await self.bridge.schedule_retry(
+            result.job_id,
+            self._serialize_graph(result.graph),
+            delay,
+            attempt + 1,
+            result.stream,
+        )
+        print(
+            f"[Executor] 🔁 Job {result.job_id} failed attempt {attempt}; "
+            f"retrying in {delay:.1f}s"
+        )
+
+    async def _dead_letter(
+        self, entry: Dict[str, Any], reason: str, error: Any, graph: Any = None
+    ) -> bool:
+        """
+        Move an entry to the dead-letter stream; ``False`` if that failed.
+
+        An entry that could not be dead-lettered is left pending rather than
+        acknowledged, so it is not lost and will come back through reclaim.
+        """
+        try:
+            await self.bridge.dead_letter(entry, reason, error, graph)
+            return True
+        except Exception as exc:
+            self.bridge.release_job(entry["stream"], entry["xid"])
+            print(f"[Executor] ⚠️ Failed to dead-letter {entry['xid']}: {exc}")
+            return False
+
+    async def _clear_checkpoints(self, job_id: str) -> None:
+        """Drop the checkpoints of a job that ended without completing."""
+        if self.checkpoints and self.checkpoints.enabled:
+            await asyncio.to_thread(clear_job, job_id, self.checkpoints)
+
+    def _failure_reason(self, graph: Dict[str, Any]) -> str:
+        """Dead-letter reason of a failed graph: its first failed node's code."""
+        for node in graph.get("nodes", []):
+            if node.get("status") == NodeStatus.failed.value:
+                code = (node.get("error") or {}).get("code") or "failed"
+                # Task errors only fail the job once their retries ran out.
+                return "exhausted" if code == "task_error" else code
+        return "failed"
+
+    def _failure_context(self, graph: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": node.get("id"),
+                "service": node.get("service"),
+                "error": node.get("error"),
+                "retries": node.get("retries"),
+            }
+            for node in graph.get("nodes", [])
+            if node.get("status") == NodeStatus.failed.value
+        ]
+
+    async def _backoff(self) -> None:
+        """
+        Exponential back-off used only after failed reads; reset on success.
+
+        The wait ends early as soon as the bridge reports Redis reachable
+        again, so a recovered connection is used straight away.
+        """
+        delay = backoff_delay(
+            self.backoff_attempt, self.backoff_initial, self.backoff_max
+        )
+        self.backoff_attempt += 1
+        print(f"[Executor] ⏳ Stream read failed; retrying in {delay:.2f}s")
+        if self.bridge.available.is_set():
+            await asyncio.sleep(delay)
+            return
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.bridge.available.wait(), delay)
 
     # ------------------------------------------------------------------
     # Metrics helpers
     # ------------------------------------------------------------------
 
+    def _observe_pickup_latency(self, entry: Dict[str, Any]) -> None:
+        """Record the time from entry creation to the start of processing."""
+        metric = self.metrics.get("worker_job_pickup_latency_seconds")
+        if not metric:
+            return
+        created = (entry.get("fields") or {}).get("created")
+        if not created:
+            # Stream IDs are prefixed with the server-side creation time in ms.
+            created = str(entry.get("xid", "")).split("-", 1)[0]
+        try:
+            latency = time.time() - int(created) / 1000
+        except (TypeError, ValueError):
+            return
+        metric.observe(max(latency, 0.0))
+
     def _metrics_inc(self, name: str) -> None:
         metric = self.metrics.get(name)
         if metric:
@@ -328,16 +953,19 @@ class Executor:
     # Graph serialization helpers
     # ------------------------------------------------------------------
 
-    def _serialize_graph(self, graph: Dict[str, Any]) -> Dict[str, Any]:
-        """Return a JSON-serializable copy of the graph."""
+    def _serialize_graph(self, graph: Dict[str, Any]) -> str:
+        """
+        Encode the graph for Redis in a single pass.
+
+        The worker only changes node state fields, so the result is still a
+        valid graph and its digest is remembered to skip re-validation when
+        it comes back (retries, reclaims).
+        """
+        payload = json_dumps_safe(graph)
+        self._remember_valid(self._graph_digest(payload))
+        return payload
 
-        return self._convert_value(graph)
+    def _serialize_node_state(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the mutable part of a node."""
 
-    def _convert_value(self, value: Any) -> Any:
-        if isinstance(value, Enum):
-            return value.value
-        if isinstance(value, dict):
-            return {k: self._convert_value(v) for k, v in value.items()}
-        if isinstance(value, list):
-            return [self._convert_value(item) for item in value]
-        return value
+        return {key: node[key] for key in _NODE_STATE_FIELDS if key in node}
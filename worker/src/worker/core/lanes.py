@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Collection, Deque, Dict, Iterator, List, Mapping, Optional
+
+
+class LaneScheduler:
+    """
+    Claim and dispatch order over several priority lanes.
+
+    With the ``weighted`` policy lanes are interleaved by smooth weighted
+    round-robin: over any window each non-empty lane gets a share of
+    dispatches proportional to its weight, without bursts from the heavy
+    lane starving the light ones. With ``strict`` the heaviest non-empty
+    lane always goes first.
+
+    ``next_lane`` picks the lane to claim from; claiming is what decides
+    the share each lane gets across rounds. ``pop`` then orders the few
+    entries claimed in one round, with separate credit so that reordering
+    a round does not skew the claim shares.
+    """
+
+    def __init__(self, weights: Mapping[str, int], policy: str = "weighted"):
+        self.weights = dict(weights)
+        self.strict = policy == "strict"
+        self.queues: Dict[str, Deque[Dict[str, Any]]] = {
+            stream: deque() for stream in self.weights
+        }
+        self.credit: Dict[str, int] = {stream: 0 for stream in self.weights}
+        self.claim_credit: Dict[str, int] = {stream: 0 for stream in self.weights}
+        # Strict order: heaviest first, configuration order between equals.
+        self.order = sorted(self.weights, key=lambda stream: -self.weights[stream])
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def push(self, entry: Dict[str, Any], front: bool = False) -> None:
+        queue = self.queues[entry["stream"]]
+        if front:
+            queue.appendleft(entry)
+        else:
+            queue.append(entry)
+
+    def next_lane(self, candidates: Collection[str]) -> Optional[str]:
+        """Lane to claim the next entry from, among lanes that may have work."""
+        ready = [stream for stream in self.order if stream in candidates]
+        return self._choose(ready, self.claim_credit)
+
+    def pop(self) -> Optional[Dict[str, Any]]:
+        ready = [stream for stream in self.order if self.queues[stream]]
+        chosen = self._choose(ready, self.credit)
+        return self.queues[chosen].popleft() if chosen else None
+
+    def _choose(self, ready: List[str], credit: Dict[str, int]) -> Optional[str]:
+        if not ready:
+            return None
+        if self.strict or len(ready) == 1:
+            return ready[0]
+        total = 0
+        for stream in ready:
+            credit[stream] += self.weights[stream]
+            total += self.weights[stream]
+        chosen = max(ready, key=lambda stream: credit[stream])
+        credit[chosen] -= total
+        return chosen
+
+    def drain(self) -> Iterator[Dict[str, Any]]:
+        """Remove and yield every buffered entry."""
+        for queue in self.queues.values():
+            while queue:
+                yield queue.popleft()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
+
+from ..infra.metrics import MetricType, get_or_create_metric
+
+
+class PoolExhaustedError(RedisError):
+    """
+    Raised when no pooled connection frees up within the pool timeout.
+
+    This is backpressure from our own side, not a sign that Redis is down,
+    so it is kept apart from connection errors.
+    """
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """
+    Bounded connection pool that reports utilization and checkout wait time.
+
+    Callers wait (up to ``timeout``) for a free connection instead of the
+    pool growing without limit, which makes saturation visible in the
+    ``worker_redis_pool_*`` metrics rather than as extra sockets on Redis.
+    """
+
+    def instrument(self, name: str) -> InstrumentedConnectionPool:
+        self.name = name
+        self.wait_metric = get_or_create_metric(
+            "worker_redis_pool_wait_seconds",
+            MetricType.HISTOGRAM,
+            "Time spent waiting to check out a Redis connection",
+            labelnames=["pool"],
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, float("inf")),
+        )
+        get_or_create_metric(
+            "worker_redis_pool_in_use",
+            MetricType.GAUGE,
+            "Redis connections currently checked out",
+            labelnames=["pool"],
+        ).labels(pool=name).set_function(
+            lambda: len(getattr(self, "_in_use_connections", ()))
+        )
+        get_or_create_metric(
+            "worker_redis_pool_max",
+            MetricType.GAUGE,
+            "Upper bound of the Redis connection pool",
+            labelnames=["pool"],
+        ).labels(pool=name).set(self.max_connections)
+        self.exhausted_metric = get_or_create_metric(
+            "worker_redis_pool_exhausted_total",
+            MetricType.COUNTER,
+            "Connection checkouts that timed out waiting for a free connection",
+            labelnames=["pool"],
+        )
+        return self
+
+    async def get_connection(self, *args: Any, **kwargs: Any):
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError as exc:
+            # The wait for a free connection timed out (the pool reports it as
+            # a ConnectionError); connect failures do not stem from a timeout.
+            if not isinstance(exc.__cause__, TimeoutError):
+                raise
+            metric = getattr(self, "exhausted_metric", None)
+            if metric:
+                metric.labels(pool=self.name).inc()
+            raise PoolExhaustedError(
+                f"No {getattr(self, 'name', 'redis')} connection available "
+                f"within {self.timeout}s"
+            ) from exc
+        metric = getattr(self, "wait_metric", None)
+        if metric:
+            metric.labels(pool=self.name).observe(time.perf_counter() - started)
+        return connection
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+from contextlib import suppress
+from typing import Any, Callable, Dict, List, Optional
+
+from .bridge import RedisBridge
+
+
+class PresenceRegistry:
+    """
+    Heartbeat that advertises this worker in Redis.
+
+    Every ``heartbeat_seconds`` the worker refreshes a hash with its
+    identity, capabilities, free slots and warm models (expiring after
+    ``ttl_seconds``) and bumps its score in the shared presence set, so the
+    control plane sees new replicas join and dead ones drop out.
+    """
+
+    def __init__(
+        self,
+        bridge: RedisBridge,
+        capabilities: List[str],
+        state_provider: Callable[[], Dict[str, Any]],
+        *,
+        heartbeat_seconds: float = 5.0,
+        ttl_seconds: int = 15,
+    ):
+        self.bridge = bridge
+        self.capabilities = capabilities
+        self.state_provider = state_provider
+        self.heartbeat_seconds = heartbeat_seconds
+        self.ttl_seconds = ttl_seconds
+        self.identity = {
+            "host": socket.gethostname(),
+            "pid": str(os.getpid()),
+            "group": bridge.group,
+            "started": str(int(time.time() * 1000)),
+            "capabilities": capabilities,
+        }
+        self.runner: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.runner:
+            return
+        self.runner = asyncio.create_task(
+            self._heartbeat_loop(), name="presence-heartbeat"
+        )
+        print(f"[Presence] 📡 Registered worker '{self.bridge.consumer}'")
+
+    async def stop(self) -> None:
+        if not self.runner:
+            return
+        self.runner.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.runner
+        self.runner = None
+        try:
+            await self.bridge.clear_presence()
+        except Exception as exc:
+            print(f"[Presence] ⚠️ Failed to deregister worker: {exc}")
+
+    async def beat(self) -> None:
+        await self.bridge.publish_presence(
+            {**self.identity, **self.state_provider()}, self.ttl_seconds
+        )
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            if self.bridge.available.is_set():
+                try:
+                    await self.beat()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    print(f"[Presence] ⚠️ Heartbeat failed: {exc}")
+            await asyncio.sleep(self.heartbeat_seconds)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import random
+import time
+from enum import Enum
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a call is short-circuited because the backend is considered down."""
+
+
+class CircuitState(Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Minimal consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds; afterwards a single
+    probe is let through (half-open) and its outcome closes or re-opens it.
+    Other calls are rejected until that outcome is recorded, or the probe is
+    released because its result says nothing about the backend.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.closed
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self) -> bool:
+        if self.state is CircuitState.open:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.half_open
+        if self.state is CircuitState.half_open:
+            if self.probing:
+                return False
+            self.probing = True
+        return True
+
+    def release(self) -> None:
+        """Let another probe through; the last one ended without a verdict."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.closed
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if (
+            self.state is CircuitState.half_open
+            or self.failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.open
+            self.opened_at = time.monotonic()
+
+
+def backoff_delay(
+    attempt: int, initial: float, maximum: float, jitter: float = 0.2
+) -> float:
+    """Exponential back-off for ``attempt`` (0-based) with proportional jitter."""
+    base = min(maximum, initial * (2**attempt))
+    return base * (1 - jitter) + random.random() * base * jitter
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import ChainMap, deque
+from typing import Any, Deque, Dict, List, Mapping
+
+from ..models.langgraph.graph_schema import NodeStatus, Plane
+
+# Nodes in these states are never scheduled again within the same run.
+_SETTLED = {
+    NodeStatus.completed.value,
+    NodeStatus.running.value,
+    NodeStatus.failed.value,
+    NodeStatus.skipped.value,
+}
+
+
+class GraphPlan:
+    """
+    Dependency plan compiled once per job.
+
+    Edges are turned into per-node counts of unmet dependencies plus a
+    dependents list, so completing a node only touches its direct
+    successors and the ready queue never has to be recomputed from the
+    whole graph.
+    """
+
+    def __init__(self, graph: Dict[str, Any]):
+        nodes = graph.get("nodes", [])
+        self.nodes_by_id: Dict[str, Dict[str, Any]] = {
+            node["id"]: node for node in nodes if "id" in node
+        }
+        self.dependencies: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        for edge in graph.get("edges", []):
+            src = edge.get("from") or edge.get("from_")
+            dst = edge.get("to")
+            if not src or not dst:
+                continue
+            self.dependencies.setdefault(dst, []).append(src)
+            self.dependents.setdefault(src, []).append(dst)
+
+        self.unmet: Dict[str, int] = {}
+        self.ready: Deque[Dict[str, Any]] = deque()
+        for node in nodes:
+            node_id = node.get("id")
+            self.unmet[node_id] = sum(
+                1
+                for dep in self.dependencies.get(node_id, [])
+                if self.nodes_by_id.get(dep, {}).get("status")
+                != NodeStatus.completed.value
+            )
+            self._enqueue_if_ready(node)
+
+    def _enqueue_if_ready(self, node: Dict[str, Any]) -> None:
+        if (
+            node.get("plane") == Plane.python.value
+            and node.get("status") not in _SETTLED
+            and not self.unmet.get(node.get("id"))
+        ):
+            self.ready.append(node)
+
+    def pop_ready(self) -> List[Dict[str, Any]]:
+        """Drain and return the nodes that can run now."""
+        ready = list(self.ready)
+        self.ready.clear()
+        return ready
+
+    def complete(self, node: Dict[str, Any]) -> None:
+        """Release the dependents of a node that finished successfully."""
+        for dependent_id in self.dependents.get(node.get("id"), []):
+            self.unmet[dependent_id] -= 1
+            dependent = self.nodes_by_id.get(dependent_id)
+            if dependent is not None and self.unmet[dependent_id] == 0:
+                self._enqueue_if_ready(dependent)
+
+    def inputs(self, node: Dict[str, Any]) -> Mapping[str, Any]:
+        """
+        Merged view of a node's own input and its dependencies' outputs.
+
+        Later dependencies take precedence over earlier ones, and every
+        dependency output over the node's own input; nothing is copied.
+        """
+        maps = []
+        for dep in reversed(self.dependencies.get(node.get("id"), [])):
+            output = self.nodes_by_id[dep].get("output")
+            if isinstance(output, Mapping):
+                maps.append(output)
+        node_input = node.get("input")
+        if isinstance(node_input, Mapping):
+            maps.append(node_input)
+        return ChainMap(*maps)
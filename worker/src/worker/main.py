@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from .core.bridge import RedisBridge
 from .core.executor import Executor
-from .services.tasks import get_task_registry
-from .config import get_config
+from .core.presence import PresenceRegistry
+from .services.presets import get_preset_catalog
+from .services.registry import get_task_registry
+from .services.tasks import get_loaded_models
+from .config import get_capabilities, get_config
 from .api.router import router as api_router
 
 worker_config = get_config()
@@ -20,25 +24,95 @@ async def lifespan(_: FastAPI):
     app.state.bridge = RedisBridge(
         worker_config.bridge,
         worker_config.streams.group,
+        publish_window_ms=worker_config.publisher.window_ms,
+        reclaim=worker_config.streams.reclaim,
+        retention=worker_config.streams.retention,
+        retry=worker_config.streams.retry,
+        lanes=worker_config.streams.lanes,
+        affinity=worker_config.streams.affinity,
+        connection=worker_config.connection,
+        consumer=worker_config.presence.consumer,
     )
     bridge: RedisBridge = app.state.bridge
     await bridge.connect()
 
+    # Validate every workflow preset up front: a bad preset fails startup,
+    # not the first job that selects it.
+    get_preset_catalog()
+    task_registry = get_task_registry()
+    prewarm = None
+    if worker_config.executor.prewarm_tasks:
+        # Import task handlers in the background; a job arriving earlier
+        # imports its own handler on first use.
+        prewarm = asyncio.create_task(task_registry.prewarm())
+
     app.state.executor = Executor(
         bridge=bridge,
-        task_registry=get_task_registry(),
-        poll_interval=0.5,
+        task_registry=task_registry,
+        batch_size=worker_config.streams.batch_size,
+        block_ms=worker_config.executor.block_ms,
+        backoff_initial=worker_config.executor.backoff_initial,
+        backoff_max=worker_config.executor.backoff_max,
+        max_attempts=worker_config.streams.retry.default_max_attempts,
+        retry_backoff_initial=worker_config.streams.retry.backoff_initial,
+        retry_backoff_max=worker_config.streams.retry.backoff_max,
+        concurrency={
+            capability.id: int(capability.runtime.concurrency)
+            for capability in get_capabilities().capabilities
+        },
+        slots=worker_config.executor.slots,
+        service_classes={
+            **{
+                capability.id: capability.runtime.kind.value
+                for capability in get_capabilities().capabilities
+            },
+            **worker_config.executor.service_classes,
+        },
+        max_waiting=worker_config.executor.max_waiting,
+        graph_sync_seconds=worker_config.executor.graph_sync_seconds,
+        timeouts={
+            capability.id: float(capability.runtime.timeoutSeconds)
+            for capability in get_capabilities().capabilities
+        },
+        warm_models=lambda: get_loaded_models(
+            worker_config.streams.affinity.warm_limit
+        ),
+        checkpoints=worker_config.checkpoints,
     )
     executor: Executor = app.state.executor
     await executor.start()
 
+    presence = None
+    if worker_config.presence.enabled:
+        presence = PresenceRegistry(
+            bridge,
+            [capability.id for capability in get_capabilities().capabilities],
+            lambda: {
+                **executor.presence_state(),
+                "models": get_loaded_models(),
+                "warm_models": executor.warm_models(),
+            },
+            heartbeat_seconds=worker_config.presence.heartbeat_seconds,
+            ttl_seconds=worker_config.presence.ttl_seconds,
+        )
+        await presence.start()
+
     try:
         yield
     finally:
+        # SIGTERM lands here through uvicorn's shutdown: finish in-flight
+        # work first (presence keeps advertising the draining state), then
+        # deregister and flush pending publishes while closing the bridge.
+        if executor:
+            await executor.drain(worker_config.executor.drain_timeout_seconds)
+        if presence:
+            await presence.stop()
         if executor:
             await executor.stop()
         if bridge:
             await bridge.close()
+        if prewarm and not prewarm.done():
+            prewarm.cancel()
 
 
 app.router.lifespan_context = lifespan
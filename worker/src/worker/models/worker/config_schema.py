@@ -1,14 +1,306 @@
 from __future__ import annotations
 
+from typing import Any, Literal, Optional
+
 from pydantic import BaseModel, ConfigDict, Field, constr
 from ..redis.redis_config_schema import RedisConfiguration
 
 
+class ReclaimConfig(BaseModel):
+    enabled: bool = Field(
+        True, description="Reclaim pending entries abandoned by other consumers"
+    )
+    interval_seconds: float = Field(
+        30.0,
+        gt=0.0,
+        description="Seconds between reclaim sweeps (also refreshes ownership of in-flight entries)",
+    )
+    min_idle_ms: int = Field(
+        300000,
+        gt=0,
+        description="Idle time (ms) after which a pending entry is considered abandoned",
+    )
+    count: int = Field(
+        10,
+        gt=0,
+        description="Maximum number of idle pending entries inspected per stream and sweep; at most the free slots are claimed",
+    )
+    max_deliveries: int = Field(
+        5,
+        ge=1,
+        description="Delivery count after which a reclaimed entry is treated as poison",
+    )
+
+
+class RetentionConfig(BaseModel):
+    enabled: bool = Field(
+        True, description="Trim acknowledged entries from the data/control streams"
+    )
+    interval_seconds: float = Field(
+        60.0, gt=0.0, description="Seconds between trim sweeps"
+    )
+    max_age_seconds: int = Field(
+        43200,
+        ge=0,
+        description="Age after which acknowledged entries are trimmed (MINID); 0 disables",
+    )
+    max_len: int = Field(
+        10000,
+        ge=0,
+        description="Approximate upper bound on stream length (MAXLEN) once every entry is acknowledged; 0 disables",
+    )
+
+
+class RetryConfig(BaseModel):
+    default_max_attempts: int = Field(
+        3,
+        ge=1,
+        description="Attempts per node when the graph does not set retries.maxAttempts",
+    )
+    backoff_initial: float = Field(
+        10.0, gt=0.0, description="Delay (seconds) before the first retry of a job"
+    )
+    backoff_max: float = Field(
+        600.0,
+        gt=0.0,
+        description="Upper bound (seconds) for the exponential retry delay",
+    )
+    interval_seconds: float = Field(
+        1.0,
+        gt=0.0,
+        description="Seconds between checks for delayed retries that are due",
+    )
+
+
+class LaneConfig(BaseModel):
+    name: str = Field(..., description="Lane name, e.g. 'interactive'")
+    stream: Optional[str] = Field(
+        None,
+        description="Stream backing the lane; defaults to '<data stream>:<name>'",
+    )
+    weight: int = Field(
+        1,
+        ge=1,
+        description="Share of dispatches (weighted) or rank (strict) of the lane",
+    )
+
+
+class LanesConfig(BaseModel):
+    policy: Literal["weighted", "strict"] = Field(
+        "weighted",
+        description="'weighted' interleaves lanes by weight; 'strict' always serves the heaviest non-empty lane first",
+    )
+    default_weight: int = Field(
+        1, ge=1, description="Weight of the base data stream lane"
+    )
+    lanes: list[LaneConfig] = Field(
+        default_factory=list,
+        description="Priority lanes consumed next to the base data stream",
+    )
+
+
+class AffinityConfig(BaseModel):
+    services: list[str] = Field(
+        default_factory=list,
+        description="Model-backed services with their own stream ('<data stream>:cap:<service>')",
+    )
+    cold_wait_ms: int = Field(
+        2000,
+        ge=0,
+        description="Milliseconds spent waiting for warm work before claiming from cold capability streams",
+    )
+    warm_limit: int = Field(
+        1,
+        ge=1,
+        description="Most recently used services whose models are treated as warm",
+    )
+
+
 class StreamsConfig(BaseModel):
     group: str = Field(..., description="Group name of redis stream consumers")
     batch_size: int = Field(
         ..., description="Number of stream messages to poll in batch"
     )
+    reclaim: ReclaimConfig = Field(
+        default_factory=ReclaimConfig,
+        description="Pending-entry reclaim (XPENDING/XCLAIM) configuration",
+    )
+    retention: RetentionConfig = Field(
+        default_factory=RetentionConfig,
+        description="Stream retention (XTRIM MINID/MAXLEN) configuration",
+    )
+    retry: RetryConfig = Field(
+        default_factory=RetryConfig,
+        description="Delayed retry and dead-letter configuration for failed jobs",
+    )
+    lanes: LanesConfig = Field(
+        default_factory=LanesConfig,
+        description="Priority lanes (additional data streams) and how they are interleaved",
+    )
+    affinity: AffinityConfig = Field(
+        default_factory=AffinityConfig,
+        description="Per-capability streams claimed warm-models-first",
+    )
+
+
+class ExecutorConfig(BaseModel):
+    block_ms: int = Field(
+        5000,
+        gt=0,
+        description="Milliseconds a single XREADGROUP call blocks waiting for new entries",
+    )
+    backoff_initial: float = Field(
+        0.5, gt=0.0, description="Initial delay (seconds) after a failed stream read"
+    )
+    backoff_max: float = Field(
+        30.0,
+        gt=0.0,
+        description="Upper bound (seconds) for the exponential back-off on repeated read failures",
+    )
+    slots: dict[str, int] = Field(
+        default_factory=lambda: {"gpu": 1, "cpu": 2, "io": 4},
+        description="Concurrent jobs per resource class (gpu/cpu/io)",
+    )
+    service_classes: dict[str, str] = Field(
+        default_factory=dict,
+        description="Resource class overrides per service id; defaults to the capability runtime.kind",
+    )
+    max_waiting: int = Field(
+        1,
+        ge=1,
+        description="Claimed jobs per resource class allowed to wait for a busy slot; further jobs of that class go back to their stream",
+    )
+    graph_sync_seconds: float = Field(
+        2.0,
+        ge=0.0,
+        description="Minimum seconds between writes of the full graph to the job hash while a job runs; node states are persisted as deltas in between",
+    )
+    drain_timeout_seconds: float = Field(
+        600.0,
+        ge=0.0,
+        description="Seconds in-flight jobs get to finish on shutdown or an admin drain; keep below the orchestrator's termination grace period",
+    )
+    prewarm_tasks: bool = Field(
+        True,
+        description="Import the task handlers named in the capability manifest in the background at startup",
+    )
+
+
+class ConnectionConfig(BaseModel):
+    backoff_initial: float = Field(
+        0.5, gt=0.0, description="Initial reconnect delay (seconds)"
+    )
+    backoff_max: float = Field(
+        10.0, gt=0.0, description="Upper bound (seconds) for the reconnect back-off"
+    )
+    jitter: float = Field(
+        0.2,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of each back-off delay that is randomized",
+    )
+    failure_threshold: int = Field(
+        3,
+        ge=1,
+        description="Consecutive connection failures before the circuit breaker opens",
+    )
+    reset_timeout_seconds: float = Field(
+        5.0,
+        gt=0.0,
+        description="Seconds the circuit stays open before a probe call is allowed",
+    )
+    outbox_size: int = Field(
+        1000,
+        ge=1,
+        description="Maximum messages retained for replay while Redis is unreachable",
+    )
+    reader_pool_size: int = Field(
+        2,
+        ge=1,
+        description="Connections reserved for blocking stream reads (job polling and the cancel listener)",
+    )
+    writer_pool_size: int = Field(
+        16,
+        ge=1,
+        description="Connections for publishes, acks and job persistence",
+    )
+    pool_timeout_seconds: float = Field(
+        5.0,
+        gt=0.0,
+        description="Seconds to wait for a free pooled connection before failing",
+    )
+
+
+class PublisherConfig(BaseModel):
+    window_ms: int = Field(
+        250,
+        ge=0,
+        description="Coalescing window (ms) for progress/data updates before a pipelined flush",
+    )
+    progress_interval_ms: int = Field(
+        250,
+        ge=0,
+        description="Minimum interval (ms) between progress publishes of one node",
+    )
+
+
+class PresenceConfig(BaseModel):
+    enabled: bool = Field(
+        True, description="Advertise this worker in the Redis presence registry"
+    )
+    consumer: str | None = Field(
+        None,
+        description="Stream consumer name; defaults to <host>-<pid>-<instance> (env WORKER_CONSUMER_ID)",
+    )
+    heartbeat_seconds: float = Field(
+        5.0, gt=0.0, description="Seconds between presence heartbeats"
+    )
+    ttl_seconds: int = Field(
+        15,
+        ge=1,
+        description="Seconds after the last heartbeat before a worker is considered gone",
+    )
+
+
+class CheckpointConfig(BaseModel):
+    enabled: bool = Field(
+        True, description="Checkpoint completed work units of long-running nodes"
+    )
+    scratch_dir: str = Field(
+        "/tmp/checkpoints", description="Local directory holding checkpoint files"
+    )
+    bucket: str = Field(
+        "staged", description="Object storage bucket checkpoints are mirrored to"
+    )
+    prefix: str = Field(
+        "checkpoints",
+        description="Key prefix of checkpoints ('<prefix>/<job>/<node>/<unit>')",
+    )
+
+
+class EnginePoolConfig(BaseModel):
+    enabled: bool = Field(
+        True, description="Keep configured workflow engines resident between jobs"
+    )
+    idle_ttl_seconds: float = Field(
+        900.0, description="Seconds an unused engine stays resident before eviction"
+    )
+    max_idle: int = Field(
+        2,
+        description="Resident idle engines kept at most; least recently used go first",
+    )
+
+
+class ModelRegistryConfig(BaseModel):
+    enabled: bool = Field(
+        True, description="Keep loaded model weights between runs and workflows"
+    )
+    host_budget_gb: float = Field(
+        48.0, description="Host memory (GiB) unused weights may occupy"
+    )
+    device_budget_gb: float = Field(
+        20.0, description="Accelerator memory (GiB) unused weights may occupy"
+    )
 
 
 class ServerConfig(BaseModel):
@@ -41,6 +333,34 @@ class WorkerConfiguration(BaseModel):
     streams: StreamsConfig = Field(
         ..., description="Application-specific redis streams configuration."
     )
+    executor: ExecutorConfig = Field(
+        default_factory=ExecutorConfig,
+        description="Dispatch loop configuration (blocking reads and error back-off).",
+    )
+    connection: ConnectionConfig = Field(
+        default_factory=ConnectionConfig,
+        description="Redis reconnect, circuit breaker and outbox configuration.",
+    )
+    publisher: PublisherConfig = Field(
+        default_factory=PublisherConfig,
+        description="Pub/sub publishing configuration (coalescing and batching).",
+    )
+    presence: PresenceConfig = Field(
+        default_factory=PresenceConfig,
+        description="Consumer identity and heartbeat presence registry.",
+    )
+    checkpoints: CheckpointConfig = Field(
+        default_factory=CheckpointConfig,
+        description="Per-node checkpoints that let retried jobs resume.",
+    )
+    engines: EnginePoolConfig = Field(
+        default_factory=EnginePoolConfig,
+        description="Pool of resident workflow engines.",
+    )
+    model_registry: ModelRegistryConfig = Field(
+        default_factory=ModelRegistryConfig,
+        description="Process-wide registry of loaded model weights.",
+    )
     server: ServerConfig = Field(..., description="Unicorn server configuration")
 
     comfy: ComfyConfig = Field(..., description="ComfyUI configuration")
@@ -52,3 +372,30 @@ class WorkerConfiguration(BaseModel):
         ...,
         description="Configuration of redis bridge, contains parameterization for redis streams and pub/sub.",
     )
+
+
+class WorkflowPresets(BaseModel):
+    model: str = Field(
+        ..., description="Name of the workflow parameters model in workflows_schema"
+    )
+    default: str = Field(..., description="Preset used when a job does not pick one")
+    base: dict[str, Any] = Field(
+        ..., description="Parameters shared by every preset of the workflow"
+    )
+    presets: dict[str, dict[str, Any]] = Field(
+        ..., description="Named presets as overrides of the base parameters"
+    )
+    overridable: list[str] = Field(
+        default_factory=list,
+        description="Fields a job may override through its node params; fields that change the loaded weights must not be listed",
+    )
+
+
+class PresetsConfiguration(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    workflows: dict[str, WorkflowPresets] = Field(
+        default_factory=dict,
+        description="Parameter presets per service id, selectable per job through the 'preset' node param",
+    )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from typing import Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TextToSpeechParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field(..., description="TextToSpeech model name")
     device: Literal["cuda", "cpu"] = Field(
         ..., description="Device to run the pipeline (PyTorch terminology)"
@@ -38,20 +40,22 @@ class TextToSpeechParams(BaseModel):
         ...,
         description="Classifier-Free Guidance strength. Controls how strictly the model adheres to the text/reference (typical value around 2.0)",
     )
-    narrator_voice: str = Field(
-        ...,
-        description="File path to the reference audio file (wav/mp3) used to clone the voice",
+    narrator_voice: Optional[str] = Field(
+        None,
+        description="Per job: file path to the reference audio file (wav/mp3) used to clone the voice",
     )
     seed: int = Field(
         ..., description="Random seed for reproducibility of the diffusion process"
     )
-    ref_text: str = Field(
-        ...,
-        description="The transcript corresponding specifically to the narrator_voice audio clip",
+    ref_text: Optional[str] = Field(
+        None,
+        description="Per job: the transcript corresponding specifically to the narrator_voice audio clip",
     )
 
 
 class InfiniteTalkParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     # Model Loading
     infinitetalk_model: str = Field(
         ...,
@@ -230,6 +234,8 @@ class InfiniteTalkParams(BaseModel):
 
 
 class AIUpscalerParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     model_name_0: str = Field(
         ...,
         description="Name of the upscale model to load (e.g., '4x_NMKD-Siax_200k.pth'). Used by the 'Load Upscale Model' node.",
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+import shutil
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from ..config import get_config
+from ..models.worker.config_schema import CheckpointConfig
+
+# (job id, node id) of the node running in the current context; set by the
+# executor and inherited by worker threads started with asyncio.to_thread.
+_CURRENT_NODE: ContextVar[Optional[Tuple[str, str]]] = ContextVar(
+    "checkpoint_node", default=None
+)
+
+
+@contextmanager
+def node_scope(job_id: str, node_id: str):
+    """Attribute checkpoints written within the block to this node."""
+    reset = _CURRENT_NODE.set((job_id, node_id))
+    try:
+        yield
+    finally:
+        _CURRENT_NODE.reset(reset)
+
+
+class CheckpointStore:
+    """
+    Completed work units (chunks, windows, stage outputs) of one node.
+
+    Units are kept in local scratch and mirrored to object storage, so a
+    retry on the same worker resumes from disk and one on another worker
+    (after a crash or reclaim) downloads what was already done. Mirroring is
+    best effort: a storage outage only costs the ability to resume.
+    """
+
+    def __init__(self, job_id: str, node_id: str, config: CheckpointConfig):
+        self.bucket = config.bucket
+        self.prefix = f"{config.prefix}/{job_id}/{node_id}/"
+        self.local_dir = os.path.join(config.scratch_dir, job_id, node_id)
+        # Whether storage holds units of this node; looked up on the first
+        # local miss so a fresh run does not query storage for every unit.
+        self.mirrored: Optional[bool] = None
+
+    def path(self, unit: str) -> str:
+        return os.path.join(self.local_dir, unit)
+
+    def restore(self, unit: str) -> Optional[str]:
+        """Return the local path of a completed unit, or ``None``."""
+        from .storage import download_file, has_prefix
+
+        local_path = self.path(unit)
+        if os.path.exists(local_path):
+            return local_path
+        if self.mirrored is None:
+            try:
+                self.mirrored = has_prefix(self.bucket, self.prefix)
+            except Exception as exc:
+                print(f"[Checkpoint] ⚠️ Failed to look up {self.prefix}: {exc}")
+                self.mirrored = False
+        if not self.mirrored:
+            return None
+        os.makedirs(self.local_dir, exist_ok=True)
+        try:
+            if download_file(self.bucket, self.prefix + unit, local_path):
+                print(f"[Checkpoint] ♻️ Restored {self.prefix}{unit}")
+                return local_path
+        except Exception as exc:
+            print(f"[Checkpoint] ⚠️ Failed to restore {self.prefix}{unit}: {exc}")
+        return None
+
+    def save(self, unit: str, file_path: str) -> str:
+        """Record ``file_path`` as completed unit ``unit``; returns its local path."""
+        from .storage import upload_file
+
+        os.makedirs(self.local_dir, exist_ok=True)
+        local_path = self.path(unit)
+        if os.path.abspath(file_path) != os.path.abspath(local_path):
+            # Copy then rename, so a crash never leaves a partial unit behind.
+            shutil.copyfile(file_path, local_path + ".tmp")
+            os.replace(local_path + ".tmp", local_path)
+        try:
+            upload_file(self.bucket, self.prefix + unit, local_path)
+        except Exception as exc:
+            print(f"[Checkpoint] ⚠️ Failed to mirror {self.prefix}{unit}: {exc}")
+        return local_path
+
+    def clear(self) -> None:
+        """Drop every unit of the node once its result is final."""
+        from .storage import remove_prefix
+
+        shutil.rmtree(self.local_dir, ignore_errors=True)
+        try:
+            remove_prefix(self.bucket, self.prefix)
+        except Exception as exc:
+            print(f"[Checkpoint] ⚠️ Failed to remove {self.prefix}: {exc}")
+
+
+def clear_job(job_id: str, config: CheckpointConfig) -> None:
+    """Drop the units of every node of a job that will not run again."""
+    from .storage import remove_prefix
+
+    shutil.rmtree(os.path.join(config.scratch_dir, job_id), ignore_errors=True)
+    prefix = f"{config.prefix}/{job_id}/"
+    try:
+        remove_prefix(config.bucket, prefix)
+    except Exception as exc:
+        print(f"[Checkpoint] ⚠️ Failed to remove {prefix}: {exc}")
+
+
+def current_checkpoints() -> Optional[CheckpointStore]:
+    """Checkpoint store of the running node (``None`` outside a node or if disabled)."""
+    config = get_config().checkpoints
+    node = _CURRENT_NODE.get()
+    if not config.enabled or node is None:
+        return None
+    return CheckpointStore(*node, config)
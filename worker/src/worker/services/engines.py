@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from ..config import get_config
+from ..infra.metrics import MetricType, get_or_create_metric
+from ..models.worker.config_schema import EnginePoolConfig
+from ..utils.cancellation import OperationCancelled
+
+EngineKey = Tuple[str, Hashable]
+
+
+class EnginePool:
+    """
+    Resident workflow engines keyed by kind and configuration (a preset).
+
+    A job leases an engine for the duration of its run: an idle engine of
+    the same key is handed out as is, with its node instances, otherwise a
+    new one is built. Released engines stay resident until they
+    have been idle for ``idle_ttl_seconds`` or are the least recently used
+    beyond ``max_idle``. Engines are only ever used by one job at a time.
+    """
+
+    def __init__(self, config: Optional[EnginePoolConfig] = None):
+        self.config = config or get_config().engines
+        self.idle: OrderedDict[EngineKey, Tuple[Any, float]] = OrderedDict()
+        self.metrics = {
+            "leases": get_or_create_metric(
+                "worker_engine_leases_total",
+                MetricType.COUNTER,
+                "Engine leases by kind and whether a resident engine was reused",
+                labelnames=["kind", "outcome"],
+            ),
+            "evictions": get_or_create_metric(
+                "worker_engine_evictions_total",
+                MetricType.COUNTER,
+                "Resident engines dropped from the pool, by reason",
+                labelnames=["reason"],
+            ),
+        }
+
+    @contextmanager
+    def lease(self, kind: str, config: Hashable, build: Callable[[], Any]):
+        """Yield an engine of ``kind`` built for ``config``."""
+        key = (kind, config)
+        self.evict_expired()
+        entry = self.idle.pop(key, None)
+        if entry:
+            engine = entry[0]
+            self.metrics["leases"].labels(kind=kind, outcome="hit").inc()
+            print(f"[Engines] ♻️ Reusing resident {kind} engine.")
+        else:
+            engine = build()
+            self.metrics["leases"].labels(kind=kind, outcome="miss").inc()
+        try:
+            yield engine
+        except OperationCancelled:
+            self._release(key, engine)
+            raise
+        except BaseException:
+            # A failed run may leave the engine in an unknown state, and an
+            # interrupted await (timeout) may still be running it in a
+            # worker thread, so it is never handed out again.
+            self._dispose([(engine, "failed")])
+            raise
+        else:
+            self._release(key, engine)
+
+    def _release(self, key: EngineKey, engine: Any) -> None:
+        if not self.config.enabled:
+            self._dispose([(engine, "disabled")])
+            return
+        dropped = []
+        previous = self.idle.pop(key, None)
+        if previous:
+            dropped.append((previous[0], "replaced"))
+        self.idle[key] = (engine, time.monotonic())
+        while len(self.idle) > self.config.max_idle:
+            _, (evicted, _) = self.idle.popitem(last=False)
+            dropped.append((evicted, "lru"))
+        self._dispose(dropped)
+        try:
+            asyncio.get_running_loop().call_later(
+                self.config.idle_ttl_seconds, self.evict_expired
+            )
+        except RuntimeError:
+            pass
+
+    def evict_expired(self) -> None:
+        deadline = time.monotonic() - self.config.idle_ttl_seconds
+        expired = [key for key, (_, used) in self.idle.items() if used <= deadline]
+        self._dispose([(self.idle.pop(key)[0], "idle") for key in expired])
+
+    def clear(self) -> None:
+        dropped = []
+        while self.idle:
+            _, (engine, _) = self.idle.popitem()
+            dropped.append((engine, "shutdown"))
+        self._dispose(dropped)
+
+    def _dispose(self, dropped: List[Tuple[Any, str]]) -> None:
+        """Drop engines, then collect garbage once for all of them."""
+        if not dropped:
+            return
+        for engine, reason in dropped:
+            self.metrics["evictions"].labels(reason=reason).inc()
+            print(f"[Engines] 🧹 Dropped {type(engine).__name__} engine ({reason}).")
+        dropped.clear()
+        del engine
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ..config import get_presets
+from ..models.worker import workflows_schema
+from ..models.worker.config_schema import PresetsConfiguration
+
+
+class PresetCatalog:
+    """
+    Workflow parameters validated once per named preset.
+
+    Every preset is validated into a frozen parameters model when the
+    catalog is built, so a configuration error fails worker startup rather
+    than a job. Resolving a job's parameters then only validates the fields
+    the job overrides, on a copy of the preset. Jobs may only override the
+    fields a workflow declares ``overridable``: engines and weights are
+    shared by preset, so a per-job model path, precision or device would run
+    against weights loaded for another configuration.
+    """
+
+    def __init__(self, config: PresetsConfiguration):
+        self.presets: Dict[str, Dict[str, BaseModel]] = {}
+        self.defaults: Dict[str, str] = {}
+        self.overridable: Dict[str, FrozenSet[str]] = {}
+        for service, workflow in config.workflows.items():
+            model = getattr(workflows_schema, workflow.model, None)
+            if not (isinstance(model, type) and issubclass(model, BaseModel)):
+                raise ValueError(
+                    f"Unknown parameters model '{workflow.model}' for '{service}'"
+                )
+            if workflow.default not in workflow.presets:
+                raise ValueError(
+                    f"Default preset '{workflow.default}' of '{service}' is not defined"
+                )
+            self.presets[service] = {
+                name: model.model_validate({**workflow.base, **overrides})
+                for name, overrides in workflow.presets.items()
+            }
+            unknown = set(workflow.overridable) - set(model.model_fields)
+            if unknown:
+                raise ValueError(
+                    f"Overridable fields {sorted(unknown)} of '{service}' are not "
+                    f"fields of '{workflow.model}'"
+                )
+            self.defaults[service] = workflow.default
+            self.overridable[service] = frozenset(workflow.overridable)
+
+    def resolve(
+        self,
+        service: str,
+        preset: Optional[str] = None,
+        overrides: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[str, BaseModel]:
+        """
+        Return the preset name and parameters for one job of ``service``.
+
+        ``overrides`` may hold any mapping (e.g. the node params); only keys
+        that are overridable fields of the workflow are applied.
+        """
+        if service not in self.presets:
+            raise ValueError(f"No presets configured for '{service}'")
+        name = preset or self.defaults[service]
+        params = self.presets[service].get(name)
+        if params is None:
+            raise ValueError(f"Unknown preset '{name}' for '{service}'")
+        fields = self.overridable[service]
+        updates = {
+            key: value
+            for key, value in (overrides or {}).items()
+            if key in fields and value is not None
+        }
+        ignored = (set(overrides or {}) & set(type(params).model_fields)) - fields
+        if ignored:
+            print(
+                f"[Presets] ⚠️ Ignoring non-overridable fields {sorted(ignored)} "
+                f"for '{service}'"
+            )
+        if not updates:
+            return name, params
+        params = params.model_copy()
+        validator = type(params).__pydantic_validator__
+        for key, value in updates.items():
+            validator.validate_assignment(params, key, value)
+        return name, params
+
+
+_CATALOG: Optional[PresetCatalog] = None
+
+
+def get_preset_catalog() -> PresetCatalog:
+    """Return the process-wide catalog built from the presets configuration."""
+    global _CATALOG
+    if _CATALOG is None:
+        _CATALOG = PresetCatalog(get_presets())
+    return _CATALOG
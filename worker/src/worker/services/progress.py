@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config import get_config
+
+# Reporter of the node running in the current context; worker threads
+# started with asyncio.to_thread inherit it, so concurrent nodes never see
+# each other's progress.
+_CURRENT_REPORTER: ContextVar[Optional["ProgressReporter"]] = ContextVar(
+    "progress_reporter", default=None
+)
+
+
+class ProgressReporter:
+    """
+    Maps the work units of one node onto its slice of the job progress.
+
+    Workflows call ``advance`` explicitly as units complete, from any
+    thread. Publishing is rate limited: at most one publish is scheduled on
+    the event loop at a time and no more often than ``min_interval``
+    seconds, so the cost of reporting does not depend on how often
+    ``advance`` is called. Each publish carries the node's absolute share
+    so far (0 up to its weight); Redis adds the change since the node's
+    previous report, so concurrent nodes add up, and a lost, replayed or
+    restarted report (retries, resumed checkpoints) never counts twice.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[float], Awaitable[None]],
+        *,
+        start: float = 0.0,
+        weight: float = 0.0,
+        total_units: float = 1,
+        min_interval: float = 0.25,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.publish = publish
+        self.start = start
+        self.end = min(start + weight, 1.0)
+        self.total_units = max(total_units, 1)
+        self.min_interval = min_interval
+        self.loop = loop or asyncio.get_running_loop()
+        self.done_units = 0.0
+        self.reported = 0.0
+        self.last_published = 0.0
+        self.scheduled = False
+        self.counting_steps = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_task(
+        cls, params: Dict[str, Any], node_input: Dict[str, Any], total_units=1
+    ) -> ProgressReporter:
+        """Reporter for a task, from the executor params and node input."""
+        return cls(
+            params["publish_progress_cb"],
+            start=node_input["currentProgress"],
+            weight=params.get("progress_weight", 0),
+            total_units=total_units,
+            min_interval=get_config().publisher.progress_interval_ms / 1000,
+        )
+
+    @property
+    def value(self) -> float:
+        fraction = min(self.done_units / self.total_units, 1.0)
+        return self.start + (self.end - self.start) * fraction
+
+    def set_total(self, units: float) -> None:
+        with self._lock:
+            self.total_units = max(units, 1)
+
+    def advance(self, units: float = 1) -> None:
+        """Mark ``units`` more work as done (thread-safe)."""
+        with self._lock:
+            self.done_units += units
+            if self.scheduled:
+                return
+            self.scheduled = True
+            delay = self.min_interval - (time.monotonic() - self.last_published)
+        # Units completed before the publish runs are folded into it.
+        self.loop.call_soon_threadsafe(
+            self.loop.call_later, max(delay, 0.0), self._flush
+        )
+
+    def _flush(self) -> None:
+        with self._lock:
+            self.scheduled = False
+            self.last_published = time.monotonic()
+            share = self._take_share(self.value)
+        if share is not None:
+            self.loop.create_task(self.publish(share))
+
+    def _take_share(self, value: float) -> Optional[float]:
+        """This node's share of the job progress, if it grew (lock held)."""
+        share = value - self.start
+        if share <= self.reported:
+            return None
+        self.reported = share
+        return share
+
+    @contextmanager
+    def comfy_steps(self):
+        """Count every ComfyUI progress-bar step reported within the block."""
+        self.counting_steps = True
+        try:
+            yield self
+        finally:
+            self.counting_steps = False
+
+    async def finish(self) -> float:
+        """Publish the end of this node's slice and return it."""
+        with self._lock:
+            self.done_units = self.total_units
+            share = self._take_share(self.end)
+        if share is not None:
+            await self.publish(share)
+        return self.end
+
+
+@contextmanager
+def progress_scope(reporter: ProgressReporter):
+    """Make ``reporter`` the current reporter for code run within the block."""
+    token = _CURRENT_REPORTER.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _CURRENT_REPORTER.reset(token)
+
+
+def report_comfy_step() -> None:
+    """Progress-bar hook target: advance the current reporter if it counts steps."""
+    reporter = _CURRENT_REPORTER.get()
+    if reporter and reporter.counting_steps:
+        reporter.advance()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import time
+from collections.abc import Mapping
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..config import get_capabilities
+from ..infra.metrics import MetricType, get_or_create_metric
+from ..models.capabilities.capability_schema import Capability, Plane
+
+WorkerTask = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+
+class TaskRegistry(Mapping):
+    """
+    Worker tasks bound from the capability manifest.
+
+    Each python-plane capability names the module and method implementing
+    it (``handler.module``/``handler.method``). Handlers are imported on
+    first lookup, or ahead of time by ``prewarm``, so startup never pays for
+    modules a worker does not use and new capabilities only need a manifest
+    entry. Lookups of unknown services behave like a missing key; a handler
+    that fails to import raises on every lookup until it imports.
+
+    Item access imports in the calling thread; code on the event loop uses
+    ``load``, which imports in a worker thread.
+    """
+
+    def __init__(self, capabilities: Iterable[Capability]):
+        self.bindings: Dict[str, Tuple[str, str]] = {
+            capability.id: (capability.handler.module, capability.handler.method)
+            for capability in capabilities
+            if capability.plane == Plane.python
+        }
+        self.handlers: Dict[str, WorkerTask] = {}
+        self.import_seconds: Dict[str, float] = {}
+        # One import at a time per handler, shared by lookups and prewarming.
+        self._import_locks: Dict[str, asyncio.Lock] = {}
+        self.metrics = {
+            "import": get_or_create_metric(
+                "worker_task_import_seconds",
+                MetricType.GAUGE,
+                "Seconds taken to import the handler of a task",
+                labelnames=["task"],
+            ),
+        }
+
+    def __getitem__(self, name: str) -> WorkerTask:
+        handler = self.handlers.get(name)
+        if handler is not None:
+            return handler
+        module_name, method = self.bindings[name]
+        started = time.perf_counter()
+        try:
+            handler = getattr(importlib.import_module(module_name), method)
+        except (ImportError, AttributeError) as exc:
+            raise RuntimeError(
+                f"Cannot import handler '{module_name}.{method}' for task '{name}': {exc}"
+            ) from exc
+        elapsed = time.perf_counter() - started
+        self.handlers[name] = handler
+        self.import_seconds[name] = elapsed
+        self.metrics["import"].labels(task=name).set(elapsed)
+        print(
+            f"[Tasks] 📦 Imported {module_name}.{method} for '{name}' in {elapsed:.3f}s"
+        )
+        return handler
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.bindings)
+
+    def __len__(self) -> int:
+        return len(self.bindings)
+
+    async def load(self, name: str) -> Optional[WorkerTask]:
+        """
+        Return the handler of ``name`` (``None`` for unknown services).
+
+        The import runs in a worker thread so the event loop keeps serving
+        other jobs; concurrent loads of one handler wait for the first.
+        """
+        handler = self.handlers.get(name)
+        if handler is not None or name not in self.bindings:
+            return handler
+        async with self._import_locks.setdefault(name, asyncio.Lock()):
+            handler = self.handlers.get(name)
+            if handler is not None:
+                return handler
+            return await asyncio.to_thread(self.__getitem__, name)
+
+    async def prewarm(self, names: Optional[Iterable[str]] = None) -> None:
+        """Import handlers in a worker thread, without blocking the event loop."""
+        for name in list(names if names is not None else self.bindings):
+            try:
+                if name not in self.bindings:
+                    raise KeyError(name)
+                await self.load(name)
+            except (KeyError, RuntimeError) as exc:
+                print(f"[Tasks] ⚠️ Failed to prewarm '{name}': {exc}")
+
+
+_REGISTRY: Optional[TaskRegistry] = None
+
+
+def get_task_registry() -> TaskRegistry:
+    """Return the task registry bound from the worker's capability manifest."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = TaskRegistry(get_capabilities().capabilities)
+    return _REGISTRY
@@ -99,3 +99,51 @@ def upload_bytes(
         return ArtifactUploadResult(ok=True, meta=meta)
     except S3Error as exc:  # pragma: no cover - network error path
         raise RuntimeError(f"Failed to upload {name}: {exc}") from exc
+
+
+def upload_file(bucket: str, name: str, file_path: str) -> None:
+    """Upload a local file to MinIO."""
+    if not is_bucket_valid(bucket):
+        raise RuntimeError(f"Invalid bucket name: {bucket}")
+    client = _connect_minio()
+    try:
+        client.fput_object(bucket, name, file_path)
+    except S3Error as exc:  # pragma: no cover - network error path
+        raise RuntimeError(f"Failed to upload {name}: {exc}") from exc
+
+
+def download_file(bucket: str, name: str, file_path: str) -> bool:
+    """Download an object to ``file_path``; ``False`` if it does not exist."""
+    client = _connect_minio()
+    try:
+        client.fget_object(bucket, name, file_path)
+    except S3Error as exc:
+        if exc.code in ("NoSuchKey", "NoSuchBucket"):
+            return False
+        raise RuntimeError(f"Failed to download {name}: {exc}") from exc
+    return True
+
+
+def has_prefix(bucket: str, prefix: str) -> bool:
+    """Whether any object exists under ``prefix``."""
+    client = _connect_minio()
+    try:
+        objects = client.list_objects(bucket, prefix=prefix, recursive=True)
+        return next(iter(objects), None) is not None
+    except S3Error as exc:
+        if exc.code == "NoSuchBucket":
+            return False
+        raise RuntimeError(f"Failed to list {prefix}: {exc}") from exc
+
+
+def remove_prefix(bucket: str, prefix: str) -> None:
+    """Delete every object under ``prefix``."""
+    from minio.deleteobjects import DeleteObject
+
+    client = _connect_minio()
+    objects = client.list_objects(bucket, prefix=prefix, recursive=True)
+    errors = client.remove_objects(
+        bucket, (DeleteObject(item.object_name) for item in objects)
+    )
+    for error in errors:
+        raise RuntimeError(f"Failed to delete {error.name}: {error.message}")
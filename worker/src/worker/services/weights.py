@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import gc
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from ..config import get_config
+from ..infra.metrics import MetricType, get_or_create_metric
+from ..models.worker.config_schema import ModelRegistryConfig
+
+_GIB = 1024**3
+
+
+class ModelKey(NamedTuple):
+    """Identity of loaded weights; ``variant`` tells apart loader options
+    that change the result (e.g. merged LoRAs)."""
+
+    file: str
+    precision: str
+    device: str
+    variant: str = ""
+
+
+@dataclass
+class _Entry:
+    value: Any
+    host_bytes: int
+    device_bytes: int
+    refs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    # Workflows that used the weights, for reporting which ones are warm.
+    owners: Set[str] = field(default_factory=set)
+
+
+def _footprint(value: Any, max_depth: int = 4) -> Tuple[int, int]:
+    """
+    Estimate the (host, device) bytes held by a loader result.
+
+    Tensors and module parameters/buffers are counted once each, following
+    containers and plain object attributes (ComfyUI wraps models in
+    patchers) up to ``max_depth`` levels.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return 0, 0
+    seen = set()
+    sizes = [0, 0]
+
+    def count(tensor):
+        if id(tensor) in seen:
+            return
+        seen.add(id(tensor))
+        sizes[tensor.device.type != "cpu"] += tensor.nelement() * tensor.element_size()
+
+    def walk(obj, depth):
+        if depth > max_depth or id(obj) in seen:
+            return
+        if isinstance(obj, torch.Tensor):
+            count(obj)
+            return
+        seen.add(id(obj))
+        if isinstance(obj, torch.nn.Module):
+            for tensor in obj.parameters():
+                count(tensor)
+            for tensor in obj.buffers():
+                count(tensor)
+            return
+        if isinstance(obj, (list, tuple, set)):
+            children = obj
+        elif isinstance(obj, dict):
+            children = obj.values()
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            children = vars(obj).values()
+        else:
+            return
+        for child in children:
+            walk(child, depth + 1)
+
+    walk(value, 0)
+    return sizes[0], sizes[1]
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded model weights shared by all workflows.
+
+    Weights are keyed by ``ModelKey`` and reference counted while a run uses
+    them. Unreferenced weights stay loaded until the host or device memory
+    budget is exceeded, at which point the least recently used ones are
+    released, so weight I/O is paid once per worker lifetime as long as the
+    working set fits.
+    """
+
+    def __init__(self, config: Optional[ModelRegistryConfig] = None):
+        self.config = config or get_config().model_registry
+        self.entries: OrderedDict[ModelKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self.metrics = {
+            "lookups": get_or_create_metric(
+                "worker_model_registry_lookups_total",
+                MetricType.COUNTER,
+                "Model registry lookups by whether the weights were already loaded",
+                labelnames=["outcome"],
+            ),
+            "evictions": get_or_create_metric(
+                "worker_model_registry_evictions_total",
+                MetricType.COUNTER,
+                "Weights released from the model registry",
+            ),
+            "resident": get_or_create_metric(
+                "worker_model_registry_resident_bytes",
+                MetricType.GAUGE,
+                "Estimated bytes of registered weights by memory kind",
+                labelnames=["memory"],
+            ),
+        }
+
+    def acquire(self, key: ModelKey, load: Callable[[], Any], owner: str = "") -> Any:
+        """Return the weights for ``key``, loading them once; pair with ``release``."""
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+        # Concurrent lookups of the same key wait for a single load.
+        with loading:
+            with self._lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    if owner:
+                        entry.owners.add(owner)
+                    entry.refs += 1
+                    entry.last_used = time.monotonic()
+                    self.entries.move_to_end(key)
+                    self.metrics["lookups"].labels(outcome="hit").inc()
+                    return entry.value
+            self.metrics["lookups"].labels(outcome="miss").inc()
+            value = load()
+            host_bytes, device_bytes = _footprint(value)
+            with self._lock:
+                self.entries[key] = _Entry(
+                    value,
+                    host_bytes,
+                    device_bytes,
+                    refs=1,
+                    owners={owner} if owner else set(),
+                )
+                print(
+                    f"[Models] 📦 Loaded {key.file} ({key.precision}, {key.device}): "
+                    f"{host_bytes / _GIB:.2f} GiB host, {device_bytes / _GIB:.2f} GiB device"
+                )
+                evicted = self._evict()
+                host, device = self._totals()
+                if self.config.enabled and (
+                    host > self.config.host_budget_gb * _GIB
+                    or device > self.config.device_budget_gb * _GIB
+                ):
+                    # Whatever is left over budget is in use by running jobs.
+                    print("[Models] ⚠️ Weights in use exceed the memory budget.")
+        self._free(evicted)
+        return value
+
+    def release(self, key: ModelKey) -> None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        # Loaders may defer loading to first use and runs may offload weights,
+        # so the footprint is measured again after every use.
+        host_bytes, device_bytes = _footprint(entry.value)
+        with self._lock:
+            entry.host_bytes, entry.device_bytes = host_bytes, device_bytes
+            entry.refs = max(entry.refs - 1, 0)
+            entry.last_used = time.monotonic()
+            evicted = self._evict()
+        self._free(evicted)
+
+    @contextmanager
+    def session(self, owner: str = ""):
+        """Scope of one run: weights acquired through it are released on exit."""
+        session = ModelSession(self, owner)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def resident_bytes(self) -> Tuple[int, int]:
+        """Estimated (host, device) bytes of the registered weights."""
+        with self._lock:
+            return self._totals()
+
+    def resident_owners(self) -> Dict[str, float]:
+        """Workflows with weights still registered, by their most recent use."""
+        owners: Dict[str, float] = {}
+        with self._lock:
+            for entry in self.entries.values():
+                for owner in entry.owners:
+                    owners[owner] = max(owners.get(owner, 0.0), entry.last_used)
+        return owners
+
+    def _totals(self) -> Tuple[int, int]:
+        return (
+            sum(entry.host_bytes for entry in self.entries.values()),
+            sum(entry.device_bytes for entry in self.entries.values()),
+        )
+
+    def _evict(self) -> List[_Entry]:
+        """Drop unreferenced LRU entries while over budget (lock held)."""
+        host_budget = self.config.host_budget_gb * _GIB
+        device_budget = self.config.device_budget_gb * _GIB
+        host, device = self._totals()
+        evicted = []
+        for key in list(self.entries):
+            over_budget = host > host_budget or device > device_budget
+            if self.config.enabled and not over_budget:
+                break
+            entry = self.entries[key]
+            if entry.refs:
+                continue
+            del self.entries[key]
+            host -= entry.host_bytes
+            device -= entry.device_bytes
+            evicted.append(entry)
+            print(f"[Models] 🧹 Released {key.file} ({key.precision}, {key.device})")
+        self.metrics["resident"].labels(memory="host").set(host)
+        self.metrics["resident"].labels(memory="device").set(device)
+        return evicted
+
+    def _free(self, evicted: List[_Entry]) -> None:
+        if not evicted:
+            return
+        self.metrics["evictions"].inc(len(evicted))
+        evicted.clear()
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+class ModelSession:
+    """Weights acquired by one run of a workflow."""
+
+    def __init__(self, registry: ModelRegistry, owner: str = ""):
+        self.registry = registry
+        self.owner = owner
+        self.keys: List[ModelKey] = []
+
+    def load(
+        self,
+        file: str,
+        precision: str,
+        device: str,
+        load: Callable[[], Any],
+        variant: str = "",
+    ) -> Any:
+        key = ModelKey(file, precision, device, variant)
+        value = self.registry.acquire(key, load, self.owner)
+        self.keys.append(key)
+        return value
+
+    def close(self) -> None:
+        while self.keys:
+            self.registry.release(self.keys.pop())
+
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ModelRegistry()
+        return _REGISTRY
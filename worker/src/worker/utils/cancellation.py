@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class OperationCancelled(Exception):
+    """Raised at a cancellation checkpoint once the running work was cancelled."""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared between the event loop and workers.
+
+    Tokens can be chained: a child is cancelled when either it or its parent
+    is, so cancelling a job stops all of its nodes while a node timeout only
+    stops that node.
+    """
+
+    def __init__(self, parent: Optional[CancellationToken] = None):
+        self.parent = parent
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def child(self) -> CancellationToken:
+        return CancellationToken(self)
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or bool(self.parent and self.parent.cancelled)
+
+    def cancel_reason(self) -> Optional[str]:
+        if self._event.is_set():
+            return self.reason
+        return self.parent.cancel_reason() if self.parent else None
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise OperationCancelled(self.cancel_reason() or "cancelled")
+
+
+# Token of the node running in the current context; asyncio.to_thread copies
+# the context, so workflow code running in a worker thread sees it as well.
+_CURRENT_TOKEN: ContextVar[Optional[CancellationToken]] = ContextVar(
+    "cancellation_token", default=None
+)
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken):
+    """Make ``token`` the current token for code run within the block."""
+    reset = _CURRENT_TOKEN.set(token)
+    try:
+        yield token
+    finally:
+        _CURRENT_TOKEN.reset(reset)
+
+
+def check_cancelled() -> None:
+    """Cancellation checkpoint for long-running work (no-op outside a scope)."""
+    token = _CURRENT_TOKEN.get()
+    if token:
+        token.raise_if_cancelled()
@@ -1,6 +1,8 @@
 import asyncio
 import json
 import signal
+from collections.abc import Mapping
+from enum import Enum
 from typing import Any
 
 
@@ -18,9 +20,19 @@ def setup_graceful_shutdown(stop_event: asyncio.Event):
             pass
 
 
+def _json_default(obj: Any) -> Any:
+    # Mapping views (e.g. ChainMap node inputs) and enums are encoded in
+    # place instead of being converted into a copy up front.
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
 def json_dumps_safe(obj: Any) -> str:
     """Serialize to JSON safely, falling back to string conversion."""
     try:
-        return json.dumps(obj, ensure_ascii=False, default=str)
+        return json.dumps(obj, ensure_ascii=False, default=_json_default)
     except Exception:
         return json.dumps(str(obj))
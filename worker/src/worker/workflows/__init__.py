@@ -44,6 +44,19 @@ def initialize_comfy_environment():
         folder_paths.input_directory = "/tmp/input"
         folder_paths.temp_directory = "/tmp"
 
+        import comfy.utils
+        from ..services.progress import report_comfy_step
+        from ..utils.cancellation import check_cancelled
+
+        # ComfyUI reports every sampling step through this hook, so it doubles
+        # as a cancellation checkpoint inside long-running node calls and
+        # feeds the progress of nodes that count steps.
+        def on_progress_step(*args, **kwargs):
+            check_cancelled()
+            report_comfy_step()
+
+        comfy.utils.set_progress_bar_global_hook(on_progress_step)
+
         import server
 
         if not hasattr(server.PromptServer, "instance"):
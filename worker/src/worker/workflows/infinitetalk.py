@@ -1,5 +1,6 @@
 import os
 import uuid
+from typing import Optional
 from ..models.worker.workflows_schema import InfiniteTalkParams
 
 _DEPS = dict()
@@ -44,9 +45,9 @@ def _ensure_initialized():
 
 
 class InfiniteTalk:
-    def __init__(self, **kwargs):
+    def __init__(self, params: Optional[InfiniteTalkParams] = None, **kwargs):
         _ensure_initialized()
-        self.params = InfiniteTalkParams(**kwargs)
+        self.params = params if params is not None else InfiniteTalkParams(**kwargs)
         self.audio_crop = _DEPS["AudioCrop"]()
         self.audio_separation = _DEPS["AudioSeparation"]()
         self.audio_duration_mtb = _DEPS["Audio Duration (mtb)"]()
@@ -82,11 +83,15 @@ class InfiniteTalk:
         audio_duration_sec = math.ceil(waveform.shape[1] / sample_rate)
         if audio_duration_sec > 60:
             audio_duration_sec = 60
-        steps = 8 + math.ceil(audio_duration_sec * fps / window_size) * 23
+        # Six pipeline stages plus every sampling step of every frame window.
+        windows = math.ceil(audio_duration_sec * fps / window_size)
+        steps = 6 + windows * self.params.sampling_steps
 
         return steps
 
-    def run(self, imageStorageRef: str, audioStorageRef: str):
+    def run(self, imageStorageRef: str, audioStorageRef: str, progress=None):
+        import contextlib
+        import math
         import folder_paths
         import torch
         from ..services.storage import (
@@ -94,10 +99,34 @@ class InfiniteTalk:
             fetch_torch_audio,
             fetch_torch_image,
         )
-
-        with torch.inference_mode():
-            multitalkmodelloader = self.multi_talk_model_loader.loadmodel(
-                model=self.params.infinitetalk_model
+        from ..services.checkpoints import current_checkpoints
+        from ..services.weights import get_model_registry
+        from ..utils.cancellation import check_cancelled
+
+        # Sampling dominates the render; its latents survive retries and
+        # reclaims of this node.
+        checkpoints = current_checkpoints()
+        sampled = None
+        restored = checkpoints.restore("sampler.pt") if checkpoints else None
+        if restored:
+            # Checkpoints may come from object storage: load tensors and
+            # plain containers only, never arbitrary pickled objects.
+            try:
+                sampled = torch.load(restored, weights_only=True)
+            except Exception as exc:
+                print(f"\t⚠️ Ignoring unreadable sampler checkpoint: {exc}")
+        advance = progress.advance if progress else lambda units=1: None
+
+        with torch.inference_mode(), get_model_registry().session(
+            "infinitetalk"
+        ) as weights:
+            multitalkmodelloader = weights.load(
+                self.params.infinitetalk_model,
+                "auto",
+                "auto",
+                lambda: self.multi_talk_model_loader.loadmodel(
+                    model=self.params.infinitetalk_model
+                ),
             )
 
             waveform, sample_rate = fetch_torch_audio(audioStorageRef)
@@ -108,10 +137,15 @@ class InfiniteTalk:
                 },
             )
 
-            wanvideovaeloader = self.wan_video_vae_loader.loadmodel(
-                model_name=self.params.vae_model,
-                precision="bf16",
-                use_cpu_cache=False,
+            wanvideovaeloader = weights.load(
+                self.params.vae_model,
+                "bf16",
+                "auto",
+                lambda: self.wan_video_vae_loader.loadmodel(
+                    model_name=self.params.vae_model,
+                    precision="bf16",
+                    use_cpu_cache=False,
+                ),
             )
 
             wanvideoblockswap = self.wan_video_block_swap.setargs(
@@ -124,19 +158,27 @@ class InfiniteTalk:
                 block_swap_debug=False,
             )
 
-            loadwanvideot5textencoder = self.load_wan_video_t5_text_encoder.loadmodel(
-                model_name=self.params.t5_text_encoder_model,
-                precision=self.params.t5_precision,
-                load_device="offload_device",
-                quantization="disabled",
+            loadwanvideot5textencoder = weights.load(
+                self.params.t5_text_encoder_model,
+                self.params.t5_precision,
+                "offload_device",
+                lambda: self.load_wan_video_t5_text_encoder.loadmodel(
+                    model_name=self.params.t5_text_encoder_model,
+                    precision=self.params.t5_precision,
+                    load_device="offload_device",
+                    quantization="disabled",
+                ),
             )
 
-            downloadandloadwav2vecmodel = (
-                self.download_and_load_wav2_vec_model.loadmodel(
+            downloadandloadwav2vecmodel = weights.load(
+                self.params.wav2vec_model,
+                self.params.wav2vec_precision,
+                self.params.wav2vec_load_device,
+                lambda: self.download_and_load_wav2_vec_model.loadmodel(
                     model=self.params.wav2vec_model,
                     base_precision=self.params.wav2vec_precision,
                     load_device=self.params.wav2vec_load_device,
-                )
+                ),
             )
 
             wanvideoloraselect = self.wan_video_lora_select.getlorapath(
@@ -147,8 +189,13 @@ class InfiniteTalk:
                 unique_id=1658967506290230382,
             )
 
-            clipvisionloader = self.clip_vision_loader.load_clip(
-                clip_name=self.params.clip_vision_model
+            clipvisionloader = weights.load(
+                self.params.clip_vision_model,
+                "auto",
+                "auto",
+                lambda: self.clip_vision_loader.load_clip(
+                    clip_name=self.params.clip_vision_model
+                ),
             )
 
             loadimage = fetch_torch_image(imageStorageRef)
@@ -190,18 +237,35 @@ class InfiniteTalk:
                 image=imageresizekjv2[0],
             )
 
-            wanvideomodelloader = self.wan_video_model_loader.loadmodel(
-                model=self.params.wan_video_model,
-                base_precision=self.params.wan_video_precision,
-                quantization=self.params.wan_video_quantization,
-                load_device=self.params.wan_video_load_device,
-                attention_mode="comfy",  # "sageattn", "flash_attn_2", "sdpa"
-                rms_norm_function="default",
-                compile_args=wanvideotorchcompilesettings[0],
-                block_swap_args=wanvideoblockswap[0],
-                lora=wanvideoloraselect[0],
-                multitalk_model=multitalkmodelloader[0],
-            )
+            advance()
+            check_cancelled()
+            if sampled is None:
+                wanvideomodelloader = weights.load(
+                    self.params.wan_video_model,
+                    self.params.wan_video_precision,
+                    self.params.wan_video_load_device,
+                    lambda: self.wan_video_model_loader.loadmodel(
+                        model=self.params.wan_video_model,
+                        base_precision=self.params.wan_video_precision,
+                        quantization=self.params.wan_video_quantization,
+                        load_device=self.params.wan_video_load_device,
+                        attention_mode="comfy",  # "sageattn", "flash_attn_2", "sdpa"
+                        rms_norm_function="default",
+                        compile_args=wanvideotorchcompilesettings[0],
+                        block_swap_args=wanvideoblockswap[0],
+                        lora=wanvideoloraselect[0],
+                        multitalk_model=multitalkmodelloader[0],
+                    ),
+                    # The merged LoRA, MultiTalk weights, block swap and compile
+                    # settings are baked into the loaded model.
+                    variant=(
+                        f"{self.params.wan_video_quantization};"
+                        f"multitalk={self.params.infinitetalk_model};"
+                        f"lora={self.params.lora_model}@{self.params.lora_strength};"
+                        f"swap={self.params.blocks_to_swap};"
+                        f"compile={self.params.compile_backend}/{self.params.compile_mode}"
+                    ),
+                )
 
             wanvideoclipvisionencode = self.wan_video_clip_vision_encode.process(
                 strength_1=self.params.clip_vision_strength_1,
@@ -232,6 +296,8 @@ class InfiniteTalk:
                 )
             )
 
+            advance()
+            check_cancelled()
             wanvideotextencode = self.wan_video_text_encode.process(
                 positive_prompt=self.params.positive_prompt,
                 negative_prompt=self.params.negative_prompt,
@@ -267,27 +333,51 @@ class InfiniteTalk:
                 audio_1=audioseparation[3],
             )
 
-            wanvideosampler = self.wan_video_sampler.process(
-                steps=self.params.sampling_steps,
-                cfg=self.params.sampling_cfg,
-                shift=self.params.sampling_shift,
-                seed=self.params.sampling_seed,
-                force_offload=self.params.sampling_force_offload,
-                scheduler=self.params.sampling_scheduler,
-                riflex_freq_index=self.params.riflex_freq_index,
-                denoise_strength=0.98,  # 1
-                batched_cfg=False,
-                rope_function="comfy",
-                start_step=0,
-                end_step=-1,
-                add_noise_to_samples=False,
-                model=wanvideomodelloader[0],
-                image_embeds=wanvideoimagetovideomultitalk[0],
-                text_embeds=wanvideotextencode[0],
-                samples=wanvideoencode[0],
-                multitalk_embeds=multitalkwav2vecembeds[0],
-            )
+            advance()
+            check_cancelled()
+            if sampled is None:
+                # The sampler reports each step through the progress bar hook.
+                counting = (
+                    progress.comfy_steps() if progress else contextlib.nullcontext()
+                )
+                with counting:
+                    wanvideosampler = self.wan_video_sampler.process(
+                        steps=self.params.sampling_steps,
+                        cfg=self.params.sampling_cfg,
+                        shift=self.params.sampling_shift,
+                        seed=self.params.sampling_seed,
+                        force_offload=self.params.sampling_force_offload,
+                        scheduler=self.params.sampling_scheduler,
+                        riflex_freq_index=self.params.riflex_freq_index,
+                        denoise_strength=0.98,  # 1
+                        batched_cfg=False,
+                        rope_function="comfy",
+                        start_step=0,
+                        end_step=-1,
+                        add_noise_to_samples=False,
+                        model=wanvideomodelloader[0],
+                        image_embeds=wanvideoimagetovideomultitalk[0],
+                        text_embeds=wanvideotextencode[0],
+                        samples=wanvideoencode[0],
+                        multitalk_embeds=multitalkwav2vecembeds[0],
+                    )
+                if checkpoints:
+                    sampled_path = checkpoints.path("sampler.pt")
+                    os.makedirs(os.path.dirname(sampled_path), exist_ok=True)
+                    torch.save(wanvideosampler[0], sampled_path)
+                    checkpoints.save("sampler.pt", sampled_path)
+            else:
+                print("\tSampled latents restored from checkpoint.")
+                wanvideosampler = (sampled,)
+                windows = math.ceil(
+                    (audiodurationmtb[0] / 1000)
+                    * self.params.fps
+                    / (self.params.frame_window_size - self.params.motion_frame)
+                )
+                advance(windows * self.params.sampling_steps)
 
+            advance()
+            check_cancelled()
             wanvideodecode = self.wan_video_decode.decode(
                 enable_vae_tiling=self.params.decode_vae_tiling,
                 tile_x=self.params.decode_tile_x,
@@ -299,6 +389,8 @@ class InfiniteTalk:
                 samples=wanvideosampler[0],
             )
 
+            advance()
+            check_cancelled()
             video_out = self.vhs_video_combine.combine_video(
                 frame_rate=self.params.fps,
                 loop_count=self.params.video_loop_count,
@@ -314,6 +406,8 @@ class InfiniteTalk:
                 audio=multitalkwav2vecembeds[1],
             )
 
+            advance()
+            check_cancelled()
             # Upload Video Output to MinIO
             gif_info = video_out["ui"]["gifs"][0]
             full_path = os.path.join(
@@ -331,4 +425,6 @@ class InfiniteTalk:
                 content=video_data,
                 content_type="video/mp4",
             )
+            if checkpoints:
+                checkpoints.clear()
             return artifact.meta.model_dump(mode="json")
@@ -1,5 +1,6 @@
 from io import BytesIO
 import uuid
+from typing import Optional
 from ..models.worker.workflows_schema import TextToSpeechParams
 
 _DEPS = dict()
@@ -33,52 +34,76 @@ def _ensure_initialized():
 
 
 class TextToSpeech:
-    def __init__(self, **kwargs):
+    def __init__(self, params: Optional[TextToSpeechParams] = None, **kwargs):
         _ensure_initialized()
-        self.params = TextToSpeechParams(**kwargs)
-        self.engine_instance = _DEPS["F5TTSNode"]()
-        setattr(self.engine_instance, "device", self.params.device)
+        self.params = params if params is not None else TextToSpeechParams(**kwargs)
+
+    def _create_engine(self):
+        # The node keeps the F5-TTS model it loads, so the instance itself is
+        # what the model registry holds on to.
+        engine_instance = _DEPS["F5TTSNode"]()
+        setattr(engine_instance, "device", self.params.device)
+        return engine_instance
 
     def estimate_progress_steps(self, text: str, tokens_per_iteration: int = 60):
+        # One unit per generated chunk plus fetch, post-processing and upload.
+        return 3 + self._estimate_chunks(text, tokens_per_iteration)
+
+    @staticmethod
+    def _estimate_chunks(text: str, tokens_per_iteration: int = 60) -> int:
         import math
 
-        steps = 14 + 3 * math.floor(len(text.split(" ")) / tokens_per_iteration)
-        return steps
+        return max(1, math.ceil(len(text.split(" ")) / tokens_per_iteration))
 
-    def run(self, text: str):
+    def run(self, text: str, progress=None):
         """Execute TTS generation using MinIO for inputs and outputs."""
         from ..services.storage import upload_bytes, fetch_torch_audio
+        from ..services.weights import get_model_registry
+        from ..utils.cancellation import check_cancelled
         import torchaudio.transforms as T
         import scipy.io.wavfile as wavfile
         import torch
 
+        if not self.params.narrator_voice:
+            raise ValueError("TextToSpeech requires a narrator_voice reference")
+
+        advance = progress.advance if progress else lambda units=1: None
+
         waveform, sample_rate = fetch_torch_audio(self.params.narrator_voice)
+        check_cancelled()
+        advance()
 
-        result = self.engine_instance.generate_speech(
-            reference_audio_file="none",
-            opt_reference_text=self.params.ref_text,
-            device=self.params.device,
-            model=self.params.model,
-            seed=self.params.seed,
-            text=text,
-            opt_reference_audio={
-                "waveform": waveform,
-                "sample_rate": sample_rate,
-            },
-            temperature=self.params.temperature,
-            speed=self.params.speed,
-            target_rms=self.params.target_rms,
-            cross_fade_duration=self.params.cross_fade_duration,
-            nfe_step=self.params.nfe_step,
-            cfg_strength=self.params.cfg_strength,
-            auto_phonemization=False,
-            enable_chunking=True,
-            max_chars_per_chunk=400,
-            chunk_combination_method="auto",
-            silence_between_chunks_ms=400,
-            enable_audio_cache=True,
-        )
+        with get_model_registry().session("tts") as weights:
+            engine_instance = weights.load(
+                self.params.model, "auto", self.params.device, self._create_engine
+            )
+            result = engine_instance.generate_speech(
+                reference_audio_file="none",
+                opt_reference_text=self.params.ref_text,
+                device=self.params.device,
+                model=self.params.model,
+                seed=self.params.seed,
+                text=text,
+                opt_reference_audio={
+                    "waveform": waveform,
+                    "sample_rate": sample_rate,
+                },
+                temperature=self.params.temperature,
+                speed=self.params.speed,
+                target_rms=self.params.target_rms,
+                cross_fade_duration=self.params.cross_fade_duration,
+                nfe_step=self.params.nfe_step,
+                cfg_strength=self.params.cfg_strength,
+                auto_phonemization=False,
+                enable_chunking=True,
+                max_chars_per_chunk=400,
+                chunk_combination_method="auto",
+                silence_between_chunks_ms=400,
+                enable_audio_cache=True,
+            )
 
+        check_cancelled()
+        advance(self._estimate_chunks(text))
         out_waveform, out_sample_rate = list(result[0].values())
 
         out_waveform = out_waveform.to(torch.float32)
@@ -105,6 +130,8 @@ class TextToSpeech:
         audio_tensor = torch.clamp(audio_tensor, -1.0, 1.0)
         audio_data = audio_tensor.mean(dim=0).numpy().astype("float32")
 
+        check_cancelled()
+        advance()
         output_buffer = BytesIO()
         wavfile.write(output_buffer, out_sample_rate, audio_data.T)
 
@@ -1,5 +1,6 @@
 import os
 import uuid
+from typing import Optional
 from ..models.worker.workflows_schema import AIUpscalerParams
 import tempfile
 import subprocess
@@ -103,9 +104,9 @@ def _ensure_initialized():
 
 
 class AIUpscaler:
-    def __init__(self, **kwargs):
+    def __init__(self, params: Optional[AIUpscalerParams] = None, **kwargs):
         _ensure_initialized()
-        self.params = AIUpscalerParams(**kwargs)
+        self.params = params if params is not None else AIUpscalerParams(**kwargs)
         self.upscale_model_loader = _DEPS["UpscaleModelLoader"]()
         self.image_upscale_with_model = _DEPS["ImageUpscaleWithModel"]()
         self.face_restore_model_loader = _DEPS["FaceRestoreModelLoader"]()
@@ -133,31 +134,50 @@ class AIUpscaler:
             format="AnimateDiff",
         )
 
-        # this derived empirically
-        steps = math.ceil(vhsloadvideo[1] / batch_size) * 11 + 10
+        # Upscale, face restore and save per batch, plus loading the video
+        # and combining the chunks.
+        steps = math.ceil(vhsloadvideo[1] / batch_size) * 3 + 2
         del vhsloadvideo
 
         return steps
 
-    def run(self, videoStorageRef: str):
+    def run(self, videoStorageRef: str, progress=None):
         import torch
         from ..services.storage import download_to_local_path, upload_bytes
+        from ..services.checkpoints import current_checkpoints
+        from ..services.weights import get_model_registry
+        from ..utils.cancellation import check_cancelled
         import folder_paths
         import math
         import gc
 
+        advance = progress.advance if progress else lambda units=1: None
         video_chunks = []
-
-        with torch.inference_mode():
-
-            upscalemodelloader = self.upscale_model_loader.EXECUTE_NORMALIZED(
-                model_name=self.params.model_name_0
+        # Upscaled chunks survive retries and reclaims of this node.
+        checkpoints = current_checkpoints()
+
+        with torch.inference_mode(), get_model_registry().session(
+            "upscaler"
+        ) as weights:
+
+            upscalemodelloader = weights.load(
+                self.params.model_name_0,
+                "auto",
+                "auto",
+                lambda: self.upscale_model_loader.EXECUTE_NORMALIZED(
+                    model_name=self.params.model_name_0
+                ),
             )
 
             print(f"\tUpscaler loaded. Using {self.params.model_name_0}")
 
-            facerestoremodelloader = self.face_restore_model_loader.load_model(
-                model_name=self.params.model_name_1
+            facerestoremodelloader = weights.load(
+                self.params.model_name_1,
+                "auto",
+                "auto",
+                lambda: self.face_restore_model_loader.load_model(
+                    model_name=self.params.model_name_1
+                ),
             )
 
             local_filename = os.path.basename(
@@ -181,6 +201,7 @@ class AIUpscaler:
                 f"\tAcquired video from object storage. Number of frames is {vhsloadvideo[1]}."
             )
 
+            advance()
             audio_file_path = tempfile.NamedTemporaryFile(
                 mode="w", delete=False, suffix=".mp3"
             )
@@ -197,6 +218,17 @@ class AIUpscaler:
             for i in range(
                 math.ceil(vhsloadvideo[0].shape[0] / self.params.batch_size)
             ):
+                check_cancelled()
+
+                chunk_unit = f"chunk-{i:05d}.mp4"
+                restored = checkpoints.restore(chunk_unit) if checkpoints else None
+                if restored:
+                    print(
+                        f"\tBatch {i+1}/{math.ceil(vhsloadvideo[0].shape[0] / self.params.batch_size)} restored from checkpoint."
+                    )
+                    video_chunks.append(restored)
+                    advance(3)
+                    continue
 
                 print(
                     f"\tBatch {i+1}/{math.ceil(vhsloadvideo[0].shape[0] / self.params.batch_size)} is being processed..."
@@ -215,6 +247,8 @@ class AIUpscaler:
                     )
                 )
 
+                advance()
+                check_cancelled()
                 sys.stdout.write("\t\tRestoring face...\r")
                 sys.stdout.flush()
                 facerestorecfwithmodel = self.face_restore_cf_with_model.restore_face(
@@ -223,6 +257,7 @@ class AIUpscaler:
                     facerestore_model=facerestoremodelloader[0],
                     image=imageupscalewithmodel[0],
                 )
+                advance()
                 sys.stdout.write("\t\tSaving chunk...\r")
                 sys.stdout.flush()
                 video_out = self.vhs_video_combine.combine_video(
@@ -238,12 +273,17 @@ class AIUpscaler:
                     save_output=True,
                     images=facerestorecfwithmodel[0],
                 )
-                video_chunks.append(video_out["ui"]["gifs"][0]["fullpath"])
+                chunk_path = video_out["ui"]["gifs"][0]["fullpath"]
+                if checkpoints:
+                    chunk_path = checkpoints.save(chunk_unit, chunk_path)
+                video_chunks.append(chunk_path)
+                advance()
                 del imageupscalewithmodel
                 del facerestorecfwithmodel
                 torch.cuda.empty_cache()
                 gc.collect()
 
+        check_cancelled()
         print("\tVideo is processed, combining chunks to object storage...")
         sys.stdout.flush()
 
@@ -265,4 +305,7 @@ class AIUpscaler:
             content=video_data,
             content_type="video/mp4",
         )
+        advance()
+        if checkpoints:
+            checkpoints.clear()
         return artifact.meta.model_dump(mode="json")